@@ -0,0 +1,61 @@
+# Benchmark of the standard-atmosphere lookup: table rebuilt on every call vs. process-wide cached table
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import timeit
+import numpy as np
+from gpkit               import ureg
+from standard_atmosphere import stdatmo, stdatmo_fast, isa_atmosphere, isa_atmosphere_fast, StandardAtmosphereTable
+
+num_pts         = 1000  # Points in the parameter sweep
+calls_per_model = 10    # stdatmo calls per model build (4 sizing-mission + 3 revenue + 3 deadhead flight segments)
+
+h = 0 * ureg.m
+
+def uncached_model_build():
+	for i in range(calls_per_model):
+		StandardAtmosphereTable(binary_file_path=None)(h)  # Equivalent to the original stdatmo: file read + 5 splines per call
+
+def cached_model_build():
+	for i in range(calls_per_model):
+		stdatmo(h)
+
+stdatmo(h)  # Loads the cache (and writes the binary table, if missing)
+
+t_uncached = min(timeit.repeat(uncached_model_build, number=1, repeat=20))
+t_cached   = min(timeit.repeat(cached_model_build,   number=1, repeat=20))
+
+print("Atmosphere cost per model build (%d stdatmo calls)" % calls_per_model)
+print("Uncached: %0.3f ms" % (1e3*t_uncached))
+print("Cached:   %0.3f ms" % (1e3*t_cached))
+print()
+print("%d-point sweep" % num_pts)
+print("Uncached: %0.2f s" % (num_pts*t_uncached))
+print("Cached:   %0.2f s" % (num_pts*t_cached))
+print("Savings:  %0.2f s (%0.0fx)" % (num_pts*(t_uncached - t_cached), t_uncached/t_cached))
+
+# Unit-stripped fast path
+h_m = np.random.uniform(0, 10000, 1000000)
+stdatmo_fast(h_m[:10])
+
+t_pint = min(timeit.repeat(lambda: stdatmo(h_m*ureg.m), number=1, repeat=3))
+t_fast = min(timeit.repeat(lambda: stdatmo_fast(h_m),   number=1, repeat=3))
+
+print()
+print("Lookup of %d altitudes (rho and a)" % np.size(h_m))
+print("stdatmo:      %0.3f s (%0.2e altitudes/s)" % (t_pint, np.size(h_m)/t_pint))
+print("stdatmo_fast: %0.3f s (%0.2e altitudes/s)" % (t_fast, np.size(h_m)/t_fast))
+
+# Analytic ISA vs. lookup table
+t_table_build  = min(timeit.repeat(lambda: StandardAtmosphereTable(binary_file_path=None).evaluate(0.), number=1, repeat=5))
+t_table_scalar = min(timeit.repeat(lambda: stdatmo(h),               number=100, repeat=5))/100
+t_isa_scalar   = min(timeit.repeat(lambda: isa_atmosphere(h),        number=100, repeat=5))/100
+t_isa_fast     = min(timeit.repeat(lambda: isa_atmosphere_fast(h_m), number=1,   repeat=3))
+
+print()
+print("Lookup table vs. analytic ISA")
+print("Table build (first call):    %0.3f ms (none for ISA)" % (1e3*t_table_build))
+print("Single altitude, with units: %0.3f ms (table); %0.3f ms (ISA)" % (1e3*t_table_scalar, 1e3*t_isa_scalar))
+print("%d altitudes, unit-stripped: %0.3f s (table); %0.3f s (ISA)" % (np.size(h_m), t_fast, t_isa_fast))
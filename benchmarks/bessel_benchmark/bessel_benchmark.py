@@ -0,0 +1,108 @@
+# Benchmark of the Bessel-function evaluation in rotational noise, over a blade-count x observer-angle grid: jv per harmonic, broadcast
+# jv (as in rotational_noise_batch), and two candidate evaluators for the integer harmonic orders m*B (defined here; noise_models keeps jv)
+
+import timeit
+import numpy as np
+from scipy.special import jv
+
+
+def bessel_jv(order, x, recurrence=False):
+
+	# Bessel function of the first kind J_order(x), broadcast over order and x. For integer orders (e.g. the harmonic orders m*B),
+	# each distinct (order, argument) pair is evaluated once: arguments that repeat across a grid (symmetric footprints, repeated
+	# observer angles) are not recomputed. With recurrence=True, every order is obtained from one downward recurrence over the
+	# distinct arguments, instead of one jv call per order. Non-integer orders are passed to jv directly.
+	order, x = np.broadcast_arrays(np.asarray(order, dtype=np.float64), np.asarray(x, dtype=np.float64))
+	n        = np.rint(order)
+	if not np.array_equal(n, order):
+		return jv(order, x)
+
+	pairs                  = np.stack([n.ravel(), x.ravel()], axis=-1)
+	unique_pairs, inverse  = np.unique(pairs, axis=0, return_inverse=True)
+	unique_n, unique_x     = unique_pairs[:, 0], unique_pairs[:, 1]
+
+	if recurrence:
+		values = bessel_jv_recurrence(unique_n.astype(np.intp), unique_x)
+	else:
+		values = jv(unique_n, unique_x)
+
+	return values[np.reshape(inverse, -1)].reshape(np.shape(x))
+
+
+def bessel_jv_recurrence(n, x):
+
+	# J_n(x) for integer orders n and arguments x (1-D arrays of equal size), by downward recurrence normalized with
+	# J_0 + 2*(J_2 + J_4 + ...) = 1 (Miller's algorithm). Negative orders and arguments use J_-n(x) = J_n(-x) = (-1)^n J_n(x).
+	sign = np.where((n < 0) & (n % 2 == 1), -1., 1.) * np.where((x < 0) & (n % 2 == 1), -1., 1.)
+	n    = np.abs(n)
+	x    = np.abs(x)
+
+	values = np.zeros(np.size(x))
+	small  = x < 1e-8  # Recurrence coefficients 2j/x would overflow
+	values[small] = jv(n[small], x[small])
+
+	recurrent = ~small
+	if np.any(recurrent):
+		n_r  = n[recurrent]
+		x_r  = x[recurrent]
+		tox  = 2. / x_r
+
+		# Start well above the largest order and argument, at an even order
+		n_start = int(max(np.max(n_r), np.ceil(np.max(x_r))))
+		n_start = 2*((n_start + int(np.sqrt(40.*n_start)) + 10)//2)
+
+		J_next  = np.zeros(np.size(x_r))  # J_(j+1), unnormalized
+		J       = np.ones(np.size(x_r))   # J_j, unnormalized
+		J_n     = np.zeros(np.size(x_r))
+		J_sum   = np.zeros(np.size(x_r))  # J_2 + J_4 + ..., unnormalized
+
+		for j in range(n_start, 0, -1):
+			J_next, J = J, j*tox*J - J_next  # J_(j-1)
+
+			# Rescale to keep the unnormalized values finite
+			scale = np.where(np.abs(J) > 1e10, 1./np.abs(J), 1.)
+			J      *= scale
+			J_next *= scale
+			J_n    *= scale
+			J_sum  *= scale
+
+			if (j - 1) % 2 == 0 and j > 1:
+				J_sum += J
+			J_n = np.where(n_r == j - 1, J, J_n)
+
+		values[recurrent] = J_n / (2*J_sum + J)
+
+	return sign*values
+
+
+
+# Bessel arguments m*B*M_eff*sin(theta), as in rotational_noise (effective tip Mach number M_eff = omega*R_eff/a)
+M_eff         = 0.45
+num_harmonics = 10
+
+for B_array, theta_array in [(np.arange(2, 9), np.linspace(91, 175, 20)), (np.arange(2, 9), np.linspace(91, 175, 2000)),
+	(np.arange(2, 13), np.linspace(1, 179, 20000))]:
+
+	m     = np.arange(1, num_harmonics+1)
+	order = (B_array[:, np.newaxis, np.newaxis]*m).astype(np.float64) * np.ones((1, np.size(theta_array), 1))
+	x     = order * M_eff * np.sin(np.radians(theta_array))[np.newaxis, :, np.newaxis]
+
+	def jv_loop():
+		# One jv call per blade count and harmonic (as in rotational_noise)
+		for i, B in enumerate(B_array):
+			for k in m:
+				jv(k*B, x[i, :, k-1])
+
+	t_loop       = min(timeit.repeat(jv_loop,                                      number=1, repeat=3))
+	t_jv         = min(timeit.repeat(lambda: jv(order, x),                         number=1, repeat=3))
+	t_distinct   = min(timeit.repeat(lambda: bessel_jv(order, x),                  number=1, repeat=3))
+	t_recurrence = min(timeit.repeat(lambda: bessel_jv(order, x, recurrence=True), number=1, repeat=3))
+
+	print("%d blade counts x %d angles x %d harmonics (%d values)" % (np.size(B_array), np.size(theta_array), num_harmonics, np.size(x)))
+	print("jv, per blade count and harmonic: %0.4f s" % t_loop)
+	print("jv, broadcast:                    %0.4f s" % t_jv)
+	print("bessel_jv (distinct pairs):       %0.4f s (%0.2fx)" % (t_distinct, t_jv/t_distinct))
+	print("bessel_jv, recurrence:            %0.4f s (%0.2fx)" % (t_recurrence, t_jv/t_recurrence))
+	with np.errstate(divide="ignore", invalid="ignore"):  # Values that underflow to zero
+		print("Max. relative error (recurrence): %0.1e" % np.nanmax(np.abs(bessel_jv(order, x, recurrence=True)/jv(order, x) - 1)))
+	print()
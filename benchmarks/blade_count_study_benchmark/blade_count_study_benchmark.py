@@ -0,0 +1,45 @@
+# Benchmark of the blade-count noise study: scalar rotational_noise in nested loops (as previously in number_of_blades) vs. one
+# broadcast call over the (config x B x theta x delta_S) grid
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import timeit
+import numpy as np
+from collections  import OrderedDict
+from gpkit        import ureg
+from noise_models import rotational_noise, blade_count_noise_study, NoiseInputs
+
+# Representative hover states (one per configuration)
+hover_states = OrderedDict()
+for config, T_perRotor, omega in [("Lift + cruise", 1500., 1100.), ("Compound heli", 4000., 600.), ("Tilt wing", 2500., 900.), ("Tilt rotor", 3500., 750.)]:
+	hover_states[config] = NoiseInputs(T_perRotor=T_perRotor*ureg.N, Q_perRotor=0.1*T_perRotor*ureg.N*ureg.m, T_A=15.*ureg.lbf/ureg.ft**2,
+		v_tip=170.*ureg.m/ureg.s, omega=omega*ureg.rpm, Cl_mean=0.9, R=1.5*ureg.m, s=0.1, N=8., B=5., c_avg=0.1*ureg.m, t_avg=1.2*ureg.cm,
+		rho=1.225*ureg.kg/ureg.m**3, a=340.29*ureg.m/ureg.s)
+
+def study_loop(B_array, theta_array, delta_S_array):
+	for inputs in hover_states.values():
+		for B in B_array:
+			for theta in theta_array:
+				for delta_S in delta_S_array:
+					rotational_noise(inputs.T_perRotor, inputs.Q_perRotor, inputs.R, inputs.omega, inputs.c_avg*inputs.B/B, inputs.t_avg*inputs.B/B,
+						inputs.N, B, inputs.rho, inputs.a, theta=theta, delta_S=delta_S, num_harmonics=10, weighting="A")
+
+for label, B_array, theta_array, delta_S_array in [
+	("Study grid",         np.arange(3, 7),      np.linspace(91, 175, 10)  * ureg.degree, np.array([500.])               * ureg.ft),
+	("10x finer grid",     np.arange(2, 12),     np.linspace(91, 175, 100) * ureg.degree, np.linspace(100, 3000, 10)     * ureg.ft),
+	("100x finer grid",    np.arange(2, 12),     np.linspace(91, 175, 400) * ureg.degree, np.linspace(100, 3000, 25)     * ureg.ft)]:
+
+	num_pts = len(hover_states) * np.size(B_array) * np.size(theta_array) * np.size(delta_S_array)
+	t_study = min(timeit.repeat(lambda: blade_count_noise_study(hover_states, B_array, theta_array, delta_S_array), number=1, repeat=3))
+
+	print("%s: %d configs x %d blade counts x %d angles x %d distances (%d points)" % (label, len(hover_states), np.size(B_array),
+		np.size(theta_array), np.size(delta_S_array), num_pts))
+	if num_pts <= 200:
+		t_loop = min(timeit.repeat(lambda: study_loop(B_array, theta_array, delta_S_array), number=1, repeat=3))
+		print("Nested loops:    %0.4f s" % t_loop)
+		print("Broadcast study: %0.4f s (%0.0fx)" % (t_study, t_loop/t_study))
+	else:
+		print("Broadcast study: %0.4f s (%0.0f points/s)" % (t_study, num_pts/t_study))
+	print()
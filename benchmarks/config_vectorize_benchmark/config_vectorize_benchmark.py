@@ -0,0 +1,41 @@
+# Benchmark of the config trade study: all configurations solved as one vectorized GP, against one solve per configuration.
+# The config count is scaled up by repeating the configurations (problem builds are not included in the times).
+# With cvxopt the vectorized solve is the slower of the two (0.13x at 16 configs), since the stacked program is solved densely.
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import time
+import numpy as np
+from problem_factory        import on_demand_problem, config_study
+from presolve               import PresolveSolver
+from standard_substitutions import configs
+
+outputs = {"cpt":"mission_cost.cpt"}
+solver  = PresolveSolver()
+
+for repeats in [1, 2, 4]:
+
+	config_list = list(configs)*repeats
+
+	on_demand_problem(config_list)  # Builds (and caches) the vectorized problem
+	for config in configs:
+		on_demand_problem(config)
+
+	times   = {}
+	results = {}
+	for mode in ["resolve", "vectorized"]:
+		start_time    = time.time()
+		results[mode] = config_study(config_list, outputs, mode=mode, solver=solver)
+		times[mode]   = time.time() - start_time
+
+	cpt_resolve    = getattr(results["resolve"]["cpt"], "magnitude", results["resolve"]["cpt"])
+	cpt_vectorized = getattr(results["vectorized"]["cpt"], "magnitude", results["vectorized"]["cpt"])
+
+	print("%d configs" % len(config_list))
+	print("One solve per config: %0.3f s" % times["resolve"])
+	print("Vectorized solve:     %0.3f s" % times["vectorized"])
+	print("Speedup:              %0.2fx" % (times["resolve"]/times["vectorized"]))
+	print("Max relative difference in cost per trip: %0.2e" % np.max(np.abs(cpt_vectorized/cpt_resolve - 1)))
+	print()
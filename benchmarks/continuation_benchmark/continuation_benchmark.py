@@ -0,0 +1,36 @@
+# Benchmark of continuation sweeps: battery energy-density sweep (as in vehicle_parameters/battery_energy_density), re-solved point by
+# point along the path, against the same points solved as one gpkit sweep (grid_sweep). The solver iterations of each point show whether
+# solving along the path reduces them (it does not: the points are not warm-started, see continuation.py).
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import time
+import numpy as np
+from gpkit                  import ureg
+from problem_factory        import on_demand_problem, grid_sweep
+from presolve               import PresolveSolver
+from continuation           import continuation_sweep
+
+config  = "Lift + cruise"
+e_array = np.linspace(290, 700, 8) * ureg.Wh/ureg.kg
+
+problem  = on_demand_problem(config)
+variable = problem.aircraft.battery.e
+outputs  = {"cptpp":problem.mission_cost.cptpp}
+
+print("Battery energy-density sweep (%d points), %s" % (np.size(e_array), config))
+
+start_time          = time.time()
+results, statistics = continuation_sweep(problem, variable, e_array, outputs, solver=PresolveSolver())
+continuation_time   = time.time() - start_time
+print("%-14s %0.3f s (%0.3f s total solve time)" % ("Continuation:", continuation_time, np.sum(statistics["soltime"])))
+print("Solver iterations per point (in the order of e): " + " ".join("%d" % n for n in statistics["iterations"]))
+
+start_time    = time.time()
+sweep_results = grid_sweep(problem, [(variable, e_array)], outputs, solver=PresolveSolver())
+sweep_time    = time.time() - start_time
+print("%-14s %0.3f s" % ("gpkit sweep:", sweep_time))
+
+print("Max relative difference in cost per trip per passenger: %0.2e" % np.max(np.abs(results["cptpp"]/sweep_results["cptpp"] - 1)))
@@ -0,0 +1,61 @@
+# Benchmark of the fast sizer: random candidate designs (battery specific energy, cruise L/D, disk loading, empty mass fraction) sized in
+# one NumPy pass, against one GP solve per candidate
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import time
+import numpy as np
+from gpkit                  import ureg
+from problem_factory        import on_demand_problem
+from presolve               import PresolveSolver
+from fast_sizing            import fast_sizing
+from standard_substitutions import configs
+
+num_gp_candidates = 5
+num_candidates    = 10**6
+
+random_state = np.random.RandomState(0)
+
+def candidates(num):
+
+	return {"e": random_state.uniform(250., 500., num)*ureg.Wh/ureg.kg,
+		"L_D_cruise":          random_state.uniform(5., 15., num),
+		"T_A_max":             random_state.uniform(4., 12., num)*ureg.lbf/ureg.ft**2,
+		"empty_mass_fraction": random_state.uniform(0.4, 0.6, num)}
+
+for config in configs:
+
+	problem   = on_demand_problem(config)
+	aircraft  = problem.aircraft
+	variables = {"e": aircraft.battery.e, "L_D_cruise": aircraft.L_D_cruise, "T_A_max": aircraft.rotors.T_A_max,
+		"empty_mass_fraction": aircraft.empty_mass_fraction}
+
+	gp_candidates = candidates(num_gp_candidates)
+	fast_results  = fast_sizing(problem, **gp_candidates)
+
+	cpt_gp     = np.zeros(num_gp_candidates)
+	start_time = time.time()
+	for i in range(num_gp_candidates):
+		substitutions = {variables[name]: values[i] for name, values in gp_candidates.items()}
+		try:
+			cpt_gp[i] = problem.solve(substitutions, solver=PresolveSolver())["cost"]
+		except Exception:
+			cpt_gp[i] = np.nan  # Infeasible candidate (should also be flagged by the fast sizer)
+	gp_time = (time.time() - start_time)/num_gp_candidates
+
+	gp_feasible = np.isfinite(cpt_gp)
+
+	start_time = time.time()
+	results    = fast_sizing(problem, **candidates(num_candidates))
+	numpy_time = time.time() - start_time
+
+	print(config)
+	print("GP solve:  %0.1f ms per candidate" % (1e3*gp_time))
+	print("NumPy, %d candidates: %0.2f s (%0.2f us per candidate, %0.1f%% feasible)" % (num_candidates, numpy_time,
+		1e6*numpy_time/num_candidates, 100.*np.mean(results["feasible"])))
+	print("Feasibility agrees with the GP: %d/%d candidates" % (np.sum(gp_feasible == fast_results["feasible"]), num_gp_candidates))
+	if np.any(gp_feasible):
+		print("Max relative difference in cost per trip (GP candidates): %0.2e" % np.max(np.abs(fast_results["cpt"][gp_feasible]/cpt_gp[gp_feasible] - 1)))
+	print()
@@ -0,0 +1,93 @@
+# Benchmark of the noise models: scalar functions in Python loops vs. batched (vectorized) functions
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import timeit
+import numpy as np
+from gpkit        import ureg
+from noise_models import vortex_noise, vortex_noise_batch, integrate_band_spectrum, A_weighting, A_weighting_fast, vortex_dBA_offset, exact_vortex_dBA_offset
+from noise_models import vortex_spectrum_fr, vortex_spectrum_offsets_dB
+
+# Representative hover state
+T_perRotor = 1500.  * ureg.N
+R          = 1.5    * ureg.m
+c_avg      = 0.1    * ureg.m
+t_avg      = 1.2    * ureg.cm
+N          = 8.
+s          = 0.1
+Cl_mean    = 0.9
+rho        = 1.225  * ureg.kg / ureg.m**3
+delta_S    = 500    * ureg.ft
+St         = 0.28
+
+# Vortex noise over a sweep (e.g. post-processing a gpkit sweep solution)
+num_pts      = 10000
+num_pts_loop = 200  # Scalar loop is timed on a subset, and scaled
+
+V_tip = np.random.uniform(120, 220, num_pts) * ureg.m / ureg.s
+T_A   = np.random.uniform(5, 20, num_pts)    * ureg.lbf / ureg.ft**2
+
+def vortex_loop():
+	for i in range(num_pts_loop):
+		vortex_noise(T_perRotor, T_A[i], V_tip[i], s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St, weighting="None")
+		vortex_noise(T_perRotor, T_A[i], V_tip[i], s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St, weighting="A")
+
+def vortex_batch():
+	vortex_noise_batch(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St)
+
+t_loop  = min(timeit.repeat(vortex_loop,  number=1, repeat=3)) * num_pts/num_pts_loop
+t_batch = min(timeit.repeat(vortex_batch, number=1, repeat=3))
+
+print("Vortex noise, %d-point sweep (unweighted and A-weighted)" % num_pts)
+print("Scalar loop: %0.3f s" % t_loop)
+print("Batched:     %0.4f s (%0.0fx)" % (t_batch, t_loop/t_batch))
+
+# A-weighted vortex band integration over a 100x100 peak-frequency grid
+f_peak_grid  = np.logspace(2, np.log10(40000), 10000).reshape(100, 100)
+SPL_spectrum = -vortex_spectrum_offsets_dB + A_weighting(f_peak_grid[..., np.newaxis]*vortex_spectrum_fr)
+
+def band_integral_loop():
+	# Per-design, per-band Python loop (as previously in vortex_noise and dBA_offsets.py)
+	output = np.zeros(np.shape(f_peak_grid))
+	for i in range(np.shape(f_peak_grid)[0]):
+		for j in range(np.shape(f_peak_grid)[1]):
+			weighted_p_ratio_squared = 0
+			for k in range(np.size(vortex_spectrum_fr)-1):
+				fr1  = vortex_spectrum_fr[k]
+				fr2  = vortex_spectrum_fr[k+1]
+				SPL1 = SPL_spectrum[i,j,k]
+				SPL2 = SPL_spectrum[i,j,k+1]
+
+				a = (SPL2-SPL1)/(np.log10(fr2)-np.log10(fr1))
+				b = SPL2 - a*np.log10(fr2)
+
+				weighted_p_ratio_squared += (10**(b/10))/((a/10) + 1)*(fr2**((a/10) + 1) - fr1**((a/10) + 1))
+			output[i,j] = 10*np.log10(weighted_p_ratio_squared)
+	return output
+
+def band_integral_vectorized():
+	return integrate_band_spectrum(vortex_spectrum_fr, SPL_spectrum)
+
+t_loop       = min(timeit.repeat(band_integral_loop,       number=1, repeat=3))
+t_vectorized = min(timeit.repeat(band_integral_vectorized, number=1, repeat=3))
+
+print()
+print("A-weighted vortex band integration, 100x100 peak-frequency grid")
+print("Python loop: %0.3f s" % t_loop)
+print("Vectorized:  %0.4f s (%0.0fx)" % (t_vectorized, t_loop/t_vectorized))
+
+# Tabulated A-weighting and vortex dBA offset
+f_array = np.random.uniform(50, 20000, 1000000)
+vortex_dBA_offset(f_array[:10])  # Loads (or builds and saves) the table
+
+t_A_exact      = min(timeit.repeat(lambda: A_weighting(f_array),             number=1, repeat=3))
+t_A_table      = min(timeit.repeat(lambda: A_weighting_fast(f_array),        number=1, repeat=3))
+t_offset_exact = min(timeit.repeat(lambda: exact_vortex_dBA_offset(f_array), number=1, repeat=3))
+t_offset_table = min(timeit.repeat(lambda: vortex_dBA_offset(f_array),       number=1, repeat=3))
+
+print()
+print("%d frequencies: exact vs. tabulated" % np.size(f_array))
+print("A-weighting:       %0.4f s vs. %0.4f s (%0.1fx)" % (t_A_exact, t_A_table, t_A_exact/t_A_table))
+print("Vortex dBA offset: %0.4f s vs. %0.4f s (%0.1fx)" % (t_offset_exact, t_offset_table, t_offset_exact/t_offset_table))
@@ -0,0 +1,44 @@
+# Benchmark of the ground noise footprint: A-weighted SPL on a 500x500 ground grid around a vertiport, vs. the scalar noise functions
+# evaluated cell by cell (as in config_tradeStudy_noise_analysis)
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import timeit
+import numpy as np
+from gpkit        import ureg
+from noise_models import rotational_noise, vortex_noise, noise_footprint, NoiseInputs
+
+# Representative hover state
+inputs = NoiseInputs(T_perRotor=1500.*ureg.N, Q_perRotor=150.*ureg.N*ureg.m, T_A=15.*ureg.lbf/ureg.ft**2, v_tip=170.*ureg.m/ureg.s,
+	omega=1100.*ureg.rpm, Cl_mean=0.9, R=1.5*ureg.m, s=0.1, N=8., B=5., c_avg=0.1*ureg.m, t_avg=1.2*ureg.cm, rho=1.225*ureg.kg/ureg.m**3,
+	a=340.29*ureg.m/ureg.s)
+
+h            = 500 * ureg.ft
+num_pts      = 500
+num_pts_loop = 200  # Scalar loop is timed on a subset of cells, and scaled
+x_array      = np.linspace(-2000, 2000, num_pts) * ureg.ft
+y_array      = np.linspace(-2000, 2000, num_pts) * ureg.ft
+
+def footprint_loop():
+	for x in x_array[:num_pts_loop]:
+		r       = np.sqrt(x**2 + y_array[0]**2)
+		theta   = 180*ureg.degree - (np.arctan(r/h)*ureg.radian).to(ureg.degree)
+		delta_S = np.sqrt(h**2 + r**2)
+
+		SPL_rotational = rotational_noise(inputs.T_perRotor, inputs.Q_perRotor, inputs.R, inputs.omega, inputs.c_avg, inputs.t_avg, inputs.N,
+			inputs.B, inputs.rho, inputs.a, theta=theta, delta_S=delta_S, num_harmonics=10, weighting="A")[1]
+		SPL_vortex = vortex_noise(inputs.T_perRotor, inputs.T_A, inputs.v_tip, inputs.s, inputs.Cl_mean, inputs.N, inputs.c_avg, inputs.t_avg,
+			inputs.rho, delta_S=delta_S, St=0.28, weighting="A")[1]
+		10*np.log10(10**(SPL_rotational/10) + 10**(SPL_vortex/10))
+
+num_cells = num_pts**2
+t_loop    = min(timeit.repeat(footprint_loop, number=1, repeat=3)) * num_cells/num_pts_loop
+
+print("Ground noise footprint, %dx%d grid (%d cells)" % (num_pts, num_pts, num_cells))
+print("Scalar loop: %8.0f cells/s" % (num_cells/t_loop))
+
+for chunk_size in [2**12, 2**15, 2**18]:
+	t_footprint = min(timeit.repeat(lambda: noise_footprint(inputs, x_array, y_array, h=h, chunk_size=chunk_size), number=1, repeat=3))
+	print("Footprint (chunks of %6d cells): %8.0f cells/s (%0.0fx)" % (chunk_size, num_cells/t_footprint, t_loop/t_footprint))
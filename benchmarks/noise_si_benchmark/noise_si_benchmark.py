@@ -0,0 +1,84 @@
+# Benchmark of the noise models: pint quantities throughout (as before the numeric core) vs. unit conversion at the boundary only
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import timeit
+import numpy as np
+from math          import pi
+from scipy.special import jv
+from gpkit         import ureg
+from noise_models  import rotational_noise, rotational_noise_si, vortex_noise, vortex_noise_si, noise_weighting
+
+# Representative hover state
+T_perRotor = 1500.  * ureg.N
+Q_perRotor = 150.   * ureg.N * ureg.m
+R          = 1.5    * ureg.m
+omega      = 1100.  * ureg.rpm
+c_avg      = 0.1    * ureg.m
+t_avg      = 1.2    * ureg.cm
+N          = 8.
+B          = 5.
+rho        = 1.225  * ureg.kg / ureg.m**3
+a          = 340.29 * ureg.m / ureg.s
+T_A        = 15.    * ureg.lbf / ureg.ft**2
+V_tip      = 170.   * ureg.m / ureg.s
+s          = 0.1
+Cl_mean    = 0.9
+theta      = 120.   * ureg.degree
+delta_S    = 500.   * ureg.ft
+
+SI_rotational = [T_perRotor.to(ureg.N).magnitude, Q_perRotor.to(ureg.N*ureg.m).magnitude, R.to(ureg.m).magnitude, omega.to(ureg.rad/ureg.s).magnitude,
+	c_avg.to(ureg.m).magnitude, t_avg.to(ureg.m).magnitude, N, B, rho.to(ureg.kg/ureg.m**3).magnitude, a.to(ureg.m/ureg.s).magnitude]
+SI_vortex     = [T_perRotor.to(ureg.N).magnitude, T_A.to(ureg.N/ureg.m**2).magnitude, V_tip.to(ureg.m/ureg.s).magnitude, s, Cl_mean, N,
+	c_avg.to(ureg.m).magnitude, t_avg.to(ureg.m).magnitude, rho.to(ureg.kg/ureg.m**3).magnitude]
+
+def rotational_noise_pint(T_perRotor, Q_perRotor, R, omega, c_avg, t_avg, N, B, rho, a, theta, delta_S, num_harmonics=10):
+
+	# Rotational noise (A-weighted) with pint arithmetic per harmonic, as previously implemented in rotational_noise
+	P_ref = 2e-5 * ureg.Pa
+	R_eff = 0.8  * R
+	omega = omega.to(ureg.radian / ureg.s)
+
+	f   = np.zeros(num_harmonics) * ureg.rad/ureg.s
+	SPL = np.zeros(num_harmonics)
+	for i, m in enumerate(range(1, num_harmonics+1)):
+		f[i] = m*B*omega
+
+		bessel_argument = ((m*B*omega/a) * R_eff * np.sin(theta)).to(ureg.dimensionless).magnitude
+		bessel_term     = jv(m*B, bessel_argument)
+
+		P_mL = ((m*B*omega)/(2*np.sqrt(2)*pi*a*delta_S)) * (T_perRotor*np.cos(theta) - (Q_perRotor*a)/(omega*R_eff**2)) * bessel_term
+		P_mT = ((-rho * ((m*B*omega)**2) * B)/(3*np.sqrt(2)*pi*delta_S)) * c_avg * t_avg * R_eff * bessel_term
+
+		SPL[i] = 10. * np.log10(N * ((P_mL/P_ref)**2 + (P_mT/P_ref)**2))
+
+	SPL = noise_weighting(f, SPL, weighting="A")
+	return 10*np.log10(np.sum(10**(SPL/10)))
+
+def vortex_noise_pint(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St=0.28):
+
+	# Vortex noise (unweighted overall SPL) with pint arithmetic, as previously implemented in vortex_noise
+	k2     = 1.206e-2 * ureg.s**3/ureg.ft**3
+	alpha  = Cl_mean / (2*pi)
+	t_proj = t_avg*np.cos(alpha) + c_avg*np.sin(alpha)
+	f_peak = ((St*0.7*V_tip/t_proj) * ureg.turn).to(ureg.rad/ureg.s)
+
+	p_ratio = k2 * (V_tip/(rho*delta_S))*np.sqrt((T_perRotor*N/s)*(T_A))
+	return f_peak, 20 * np.log10(p_ratio)
+
+num_calls = 200
+cases     = [
+	("Rotational noise, pint arithmetic",      lambda: rotational_noise_pint(T_perRotor, Q_perRotor, R, omega, c_avg, t_avg, N, B, rho, a, theta, delta_S)),
+	("Rotational noise, pint API (wrapper)",   lambda: rotational_noise(T_perRotor, Q_perRotor, R, omega, c_avg, t_avg, N, B, rho, a, theta, delta_S, weighting="A")),
+	("Rotational noise, numeric core (SI)",    lambda: rotational_noise_si(*SI_rotational, theta=theta.to(ureg.rad).magnitude, delta_S=152.4, weighting="A")),
+	("Vortex noise, pint arithmetic",          lambda: vortex_noise_pint(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S)),
+	("Vortex noise, pint API (wrapper)",       lambda: vortex_noise(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S, weighting="A")),
+	("Vortex noise, numeric core (SI)",        lambda: vortex_noise_si(*SI_vortex, delta_S=152.4)),
+]
+
+print("Per-call cost (%d calls)" % num_calls)
+for label, function in cases:
+	t = min(timeit.repeat(function, number=num_calls, repeat=3)) / num_calls
+	print("%-40s %8.1f us" % (label, t*1e6))
@@ -0,0 +1,49 @@
+# Benchmark of the off-design evaluation of a frozen design: a route network (distance x passenger count) evaluated in one NumPy pass,
+# against one GP re-solve per route with the sizing variables fixed
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import time
+import numpy as np
+from gpkit                  import Model, ureg
+from problem_factory        import on_demand_problem
+from presolve               import PresolveSolver
+from off_design             import off_design_missions, frozen_design_substitutions
+from standard_substitutions import configs
+
+num_gp_routes = 5
+
+for config in configs:
+
+	problem  = on_demand_problem(config)
+	solution = problem.solve(solver=PresolveSolver())
+
+	model = Model(problem.mission_cost.cpt, [problem.aircraft, problem.revenue_mission, problem.deadhead_mission, problem.mission_cost])
+	model.substitutions.update(frozen_design_substitutions(problem, solution))
+
+	d_gp       = np.linspace(5., 40., num_gp_routes)*ureg.nautical_mile
+	cpt_gp     = np.zeros(num_gp_routes)
+	start_time = time.time()
+	for i, d in enumerate(d_gp):
+		model.substitutions.update({problem.revenue_mission.cruise_segment.d_segment: d})
+		cpt_gp[i] = model.solve(verbosity=0, solver=PresolveSolver())["cost"]
+	gp_time = (time.time() - start_time)/num_gp_routes
+
+	cpt_numpy = off_design_missions(problem, solution, d_gp, d_deadhead=solution(problem.deadhead_mission.cruise_segment.d_segment))["cpt"]
+
+	print(config)
+	print("GP re-solve:  %0.1f ms per route" % (1e3*gp_time))
+	for num_routes in [10**3, 10**5]:
+		d = np.linspace(1., 60., num_routes//5).reshape(-1, 1)*ureg.nautical_mile
+		N = np.arange(1., 6.).reshape(1, -1)
+
+		start_time = time.time()
+		results    = off_design_missions(problem, solution, d, N)
+		numpy_time = time.time() - start_time
+
+		print("NumPy, %6d routes: %0.1f ms (%0.2f us per route, %0.0f%% feasible)" % (num_routes, 1e3*numpy_time, 1e6*numpy_time/num_routes,
+			100.*np.mean(results["feasible"])))
+	print("Max relative difference in cost per trip (GP routes): %0.2e" % np.max(np.abs(cpt_numpy/cpt_gp - 1)))
+	print()
@@ -0,0 +1,156 @@
+# Benchmark suite for the model phases, for every configuration in configs: model construction (aircraft; missions and cost),
+# standard substitutions, Model.solve, stdatmo and the noise models (rotational_noise, vortex_noise).
+# Each run is appended to a history file (one JSON record per line, with the git commit) and compared with the previous run,
+# so that regressions are visible. Runs offline: python phase_benchmark.py [--repeat N] [--history FILE] [--no-save] [--solver NAME]
+# Solves go through PresolveSolver, wrapping the given solver (default: gpkit's default solver).
+
+from __future__ import print_function
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+import timeit
+from collections            import OrderedDict
+from gpkit                  import Model, ureg
+from aircraft_models        import OnDemandAircraft
+from mission_models         import OnDemandSizingMission, OnDemandRevenueMission, OnDemandDeadheadMission
+from cost_models            import OnDemandMissionCost
+from standard_atmosphere    import stdatmo
+from noise_models           import rotational_noise, vortex_noise, noise_inputs
+from presolve               import PresolveSolver
+from standard_substitutions import generic_data, configs
+
+history_file_path    = os.path.abspath(os.path.dirname(__file__)) + "/phase_benchmark_history.jsonl"
+regression_threshold = 1.2  # Phases slower than the previous run by more than this factor are flagged
+
+phases = ["aircraft_construction", "aircraft_substitutions", "mission_cost_construction", "mission_cost_substitutions", "solve", "stdatmo",
+	"rotational_noise", "vortex_noise"]
+
+
+def build_problem(config, times):
+
+	# Builds the standard problem phase by phase (as in problem_factory), adding the time of each phase to times
+	t_start  = time.time()
+	aircraft = OnDemandAircraft()
+	times["aircraft_construction"] += time.time() - t_start
+
+	t_start  = time.time()
+	aircraft = aircraft.standard_substitutions(config=config, autonomousEnabled=generic_data["autonomousEnabled"])
+	times["aircraft_substitutions"] += time.time() - t_start
+
+	t_start          = time.time()
+	sizing_mission   = OnDemandSizingMission(aircraft=aircraft)
+	revenue_mission  = OnDemandRevenueMission(aircraft=aircraft)
+	deadhead_mission = OnDemandDeadheadMission(aircraft=aircraft)
+	mission_cost     = OnDemandMissionCost(aircraft=aircraft, revenue_mission=revenue_mission, deadhead_mission=deadhead_mission)
+	times["mission_cost_construction"] += time.time() - t_start
+
+	t_start          = time.time()
+	sizing_mission   = sizing_mission.standard_substitutions(piloted=generic_data["isSizingMissionPiloted"], reserve=generic_data["reserve"])
+	revenue_mission  = revenue_mission.standard_substitutions(piloted=generic_data["isRevenueMissionPiloted"])
+	deadhead_mission = deadhead_mission.standard_substitutions(piloted=generic_data["isDeadheadMissionPiloted"])
+	mission_cost     = mission_cost.standard_substitutions(isRevenueMissionPiloted=generic_data["isRevenueMissionPiloted"],
+		isDeadheadMissionPiloted=generic_data["isDeadheadMissionPiloted"])
+	times["mission_cost_substitutions"] += time.time() - t_start
+
+	return Model(mission_cost.cpt, [aircraft, sizing_mission, revenue_mission, deadhead_mission, mission_cost])
+
+
+def benchmark_config(config, repeat=3, noise_calls=100, solver=None):
+
+	# Minimum time (s) of each phase over the repeats
+	results = OrderedDict((phase, []) for phase in phases)
+
+	for i in range(repeat):
+		times   = dict((phase, 0.) for phase in phases)
+		problem = build_problem(config, times)
+
+		t_start  = time.time()
+		solution = problem.solve(verbosity=0, solver=PresolveSolver(solver))
+		times["solve"] = time.time() - t_start
+
+		for phase in ["aircraft_construction", "aircraft_substitutions", "mission_cost_construction", "mission_cost_substitutions", "solve"]:
+			results[phase].append(times[phase])
+
+	inputs = noise_inputs(solution)
+	h      = 0 * ureg.ft
+
+	results["stdatmo"] = timeit.repeat(lambda: stdatmo(h), number=noise_calls, repeat=repeat)
+	results["rotational_noise"] = timeit.repeat(lambda: rotational_noise(inputs.T_perRotor, inputs.Q_perRotor, inputs.R, inputs.omega, inputs.c_avg,
+		inputs.t_avg, inputs.N, inputs.B, inputs.rho, inputs.a, theta=175*ureg.degree, delta_S=generic_data["delta_S"], num_harmonics=10, weighting="A"),
+		number=noise_calls, repeat=repeat)
+	results["vortex_noise"] = timeit.repeat(lambda: vortex_noise(inputs.T_perRotor, inputs.T_A, inputs.v_tip, inputs.s, inputs.Cl_mean, inputs.N,
+		inputs.c_avg, inputs.t_avg, inputs.rho, delta_S=generic_data["delta_S"], St=generic_data["Strouhal_number"], weighting="A"),
+		number=noise_calls, repeat=repeat)
+
+	for phase in ["stdatmo", "rotational_noise", "vortex_noise"]:
+		results[phase] = [t/noise_calls for t in results[phase]]
+
+	return OrderedDict((phase, min(results[phase])) for phase in phases)
+
+
+def git_commit():
+
+	try:
+		output = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.abspath(os.path.dirname(__file__)))
+		return output.decode().strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def load_history(file_path=history_file_path):
+
+	if not os.path.isfile(file_path):
+		return []
+	with open(file_path) as f:
+		return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(record, file_path=history_file_path):
+
+	with open(file_path, "a") as f:
+		f.write(json.dumps(record) + "\n")
+
+
+def run(repeat=3, history_file_path=history_file_path, save=True, solver=None):
+
+	record = OrderedDict()
+	record["time"]     = time.strftime("%Y-%m-%dT%H:%M:%S")
+	record["commit"]   = git_commit()
+	record["python"]   = platform.python_version()
+	record["platform"] = platform.platform()
+	record["solver"]   = repr(PresolveSolver(solver))
+	record["results"]  = OrderedDict((config, benchmark_config(config, repeat=repeat, solver=solver)) for config in configs)
+
+	history  = load_history(history_file_path)
+	previous = history[-1]["results"] if history else {}
+
+	print("Phase times (s); ratio to the previous run (commit %s) in parentheses" % (history[-1]["commit"] if history else "none"))
+	for config, results in record["results"].items():
+		print()
+		print(config)
+		for phase, t in results.items():
+			ratio = t/previous[config][phase] if phase in previous.get(config, {}) else None
+			flag  = "  <-- regression" if ratio is not None and ratio > regression_threshold else ""
+			print("%-28s %10.3e%s%s" % (phase, t, " (%0.2fx)" % ratio if ratio is not None else "", flag))
+
+	if save:
+		append_history(record, history_file_path)
+	return record
+
+
+if __name__=="__main__":
+
+	parser = argparse.ArgumentParser(description="Times the model build, solve and post-process phases for every configuration.")
+	parser.add_argument("--repeat",  type=int, default=3,       help="repeats per phase (the minimum is recorded)")
+	parser.add_argument("--history", default=history_file_path, help="history file (JSON lines)")
+	parser.add_argument("--no-save", action="store_true",      help="do not append this run to the history file")
+	parser.add_argument("--solver",  default=None,              help="GP solver wrapped by the presolve (default: gpkit's default)")
+	args = parser.parse_args()
+
+	run(repeat=args.repeat, history_file_path=args.history, save=not args.no_save, solver=args.solver)
@@ -0,0 +1,36 @@
+# Benchmark of the presolve pass: program size before and after the monomial equalities are eliminated, and solve time with and
+# without presolve, for every configuration
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import timeit
+from gpkit.exceptions       import Infeasible
+from problem_factory        import on_demand_problem
+from presolve               import PresolveSolver, presolve_report
+from standard_substitutions import configs
+
+repeat = 3
+
+for config in configs:
+
+	problem = on_demand_problem(config)
+	report  = presolve_report(problem.model)
+
+	print(config)
+	for key in ["variables", "posynomials", "monomials"]:
+		print("%-12s %4d -> %4d" % (key + ":", report[key][0], report[key][1]))
+	print("%d monomial equalities eliminated" % report["eliminated_equalities"])
+
+	times = {}
+	for label, solver in [("Full GP", None), ("Presolved", PresolveSolver())]:
+		try:
+			times[label] = min(timeit.repeat(lambda: problem.solve(solver=solver), number=1, repeat=repeat))
+			print("%-10s %0.3f s" % (label + ":", times[label]))
+		except Infeasible as e:
+			print("%-10s solve failed (%s)" % (label + ":", e.__class__.__name__))
+
+	if len(times) == 2:
+		print("Speedup:   %0.1fx" % (times["Full GP"]/times["Presolved"]))
+	print()
@@ -0,0 +1,74 @@
+# Benchmark of the sizing-plot grid: model rebuilt for every point vs. cached problem (problem_factory)
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import time
+import numpy as np
+from gpkit                  import Model, ureg
+from aircraft_models        import OnDemandAircraft
+from mission_models         import OnDemandSizingMission, OnDemandRevenueMission, OnDemandDeadheadMission
+from cost_models            import OnDemandMissionCost
+from problem_factory        import on_demand_problem
+from presolve               import PresolveSolver
+from standard_substitutions import generic_data
+
+config = "Lift + cruise"
+
+# Both variants solve through the presolve: cvxopt alone does not converge on every point of the grid
+solver = PresolveSolver()
+
+# Same 4x4 grid as case_studies/sizing_plot
+numrows       = 4
+L_D_array     = np.linspace(9, 15, numrows)
+T_A_max_array = np.linspace(4, 16, numrows) * ureg.lbf / ureg.ft**2
+
+def rebuilt_problem_solve(L_D_cruise, T_A_max):
+
+	aircraft = OnDemandAircraft()
+	aircraft = aircraft.standard_substitutions(config=config, autonomousEnabled=generic_data["autonomousEnabled"])
+
+	aircraft.substitutions.update({
+		aircraft.L_D_cruise:     L_D_cruise,
+		aircraft.rotors.T_A_max: T_A_max,
+		})
+
+	sizing_mission = OnDemandSizingMission(aircraft=aircraft)
+	sizing_mission = sizing_mission.standard_substitutions(piloted=generic_data["isSizingMissionPiloted"], reserve=generic_data["reserve"])
+
+	revenue_mission = OnDemandRevenueMission(aircraft=aircraft)
+	revenue_mission = revenue_mission.standard_substitutions(piloted=generic_data["isRevenueMissionPiloted"])
+
+	deadhead_mission = OnDemandDeadheadMission(aircraft=aircraft)
+	deadhead_mission = deadhead_mission.standard_substitutions(piloted=generic_data["isDeadheadMissionPiloted"])
+
+	mission_cost = OnDemandMissionCost(aircraft=aircraft, revenue_mission=revenue_mission, deadhead_mission=deadhead_mission)
+	mission_cost = mission_cost.standard_substitutions(isRevenueMissionPiloted=generic_data["isRevenueMissionPiloted"], isDeadheadMissionPiloted=generic_data["isDeadheadMissionPiloted"])
+
+	objective_function = mission_cost.cpt
+	problem            = Model(objective_function, [aircraft, sizing_mission, revenue_mission, deadhead_mission, mission_cost])
+	return problem.solve(verbosity=0, solver=solver)
+
+def cached_problem_solve(L_D_cruise, T_A_max):
+
+	problem = on_demand_problem(config)
+	return problem.solve({
+		problem.aircraft.L_D_cruise:     L_D_cruise,
+		problem.aircraft.rotors.T_A_max: T_A_max,
+		}, solver=solver)
+
+num_solves = np.size(L_D_array) * np.size(T_A_max_array)
+results    = {}
+
+for name, solve_function in [("Rebuilt per point", rebuilt_problem_solve), ("Cached problem", cached_problem_solve)]:
+
+	t_start = time.time()
+	for T_A_max in T_A_max_array:
+		for L_D_cruise in L_D_array:
+			solve_function(L_D_cruise, T_A_max)
+	results[name] = time.time() - t_start
+
+print("Sizing-plot grid (%dx%d), %s" % (numrows, numrows, config))
+for name in ["Rebuilt per point", "Cached problem"]:
+	print("%-18s %0.2f s (%0.1f solves/s)" % (name + ":", results[name], num_solves/results[name]))
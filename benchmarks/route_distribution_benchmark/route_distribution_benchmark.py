@@ -0,0 +1,51 @@
+# Benchmark of the route-length distribution in OnDemandRouteDistributionCost: K representative routes of a trip-length distribution
+# carried in one model (one solve for the demand-weighted cost per trip), for K = 10, 50, 200.
+# Reports the model build time, the program size (before and after presolve) and the solve time. The solve time is dominated by the
+# interior-point solver, whose Newton system is dense in the (presolved) variables with cvxopt; use --solver for a sparse solver
+# (e.g. mosek_conif), and --routes to run a subset of K.
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import argparse
+import time
+import numpy as np
+from gpkit                  import ureg
+from problem_factory        import on_demand_problem, route_distribution_substitutions
+from presolve               import PresolveSolver, presolve_report
+from cost_models            import representative_routes
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--routes", type=int, nargs="+", default=[10, 50, 200], help="numbers of representative routes (K)")
+parser.add_argument("--solver", default=None,                               help="GP solver wrapped by the presolve (default: gpkit's default)")
+args = parser.parse_args()
+
+config = "Lift + cruise"
+
+# Trip-length distribution (log-normal, median 20 nmi), sampled
+trip_distances = np.random.default_rng(0).lognormal(np.log(20.), 0.5, 100000)*ureg.nautical_mile
+
+for num_routes in args.routes:
+
+	d, p_route = representative_routes(trip_distances, num_routes)
+
+	start_time = time.time()
+	problem    = on_demand_problem(config, num_routes=num_routes)
+	build_time = time.time() - start_time
+
+	report = presolve_report(problem.model)
+
+	start_time = time.time()
+	solution   = problem.solve(route_distribution_substitutions(problem, d, p_route), solver=PresolveSolver(args.solver))
+	solve_time = time.time() - start_time
+
+	cpt_route = solution(problem.mission_cost.cpt_route)
+	cpt_route = getattr(cpt_route, "magnitude", cpt_route)
+
+	print("K = %d routes" % num_routes)
+	print("Build:      %0.2f s" % build_time)
+	print("Variables:  %d -> %d after presolve" % report["variables"])
+	print("Solve:      %0.2f s" % solve_time)
+	print("Demand-weighted cost per trip: $%0.2f (routes: $%0.2f to $%0.2f)" % (solution["cost"], np.min(cpt_route), np.max(cpt_route)))
+	print()
@@ -0,0 +1,25 @@
+# Benchmark of the study executor: configuration trade study solved serially vs. over a process pool
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
+
+import multiprocessing
+from presolve               import PresolveSolver
+from study_executor         import StudyCase, config_cases, time_study
+from standard_substitutions import configs
+
+if __name__=="__main__":
+
+	# Configuration trade study (one case per configuration), and the same study at three cruise L/D values
+	solveargs = {"solver": PresolveSolver()}
+	studies   = {}
+	studies["Configurations"] = config_cases(configs, solveargs=solveargs)
+	studies["Configurations x L/D"] = [StudyCase(config, substitutions={"aircraft.L_D_cruise": L_D}, label=(config, L_D), solveargs=solveargs)
+		for config in configs for L_D in [8., 10., 12.]]
+
+	print("Processes available: %d" % multiprocessing.cpu_count())
+	for name in ["Configurations", "Configurations x L/D"]:
+		times = time_study(studies[name])
+		print("%-22s %2d cases; serial %0.2f s, parallel %0.2f s (speedup %0.2fx)" \
+			% (name + ":", len(studies[name]), times["serial"], times["parallel"], times["speedup"]))
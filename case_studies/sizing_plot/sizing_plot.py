@@ -11,10 +11,12 @@ from matplotlib             import pyplot as plt
 from aircraft_models        import OnDemandAircraft
 from mission_models         import OnDemandSizingMission, OnDemandRevenueMission, OnDemandDeadheadMission
 from cost_models            import OnDemandMissionCost
-from noise_models           import vortex_noise
+from noise_models           import vortex_noise_batch
+from problem_factory        import on_demand_problem, grid_sweep
+from presolve               import PresolveSolver
 from standard_substitutions import generic_data, configs
 
-from scipy.interpolate      import interp2d
+from scipy.interpolate      import RectBivariateSpline
 
 configs = deepcopy(configs)
 del configs["Compound heli"]
@@ -43,13 +45,6 @@ T_A_max_array            = np.linspace(4, 16, numrows)
 L_D_array, T_A_max_array = np.meshgrid(L_D_array, T_A_max_array)
 T_A_max_array            = T_A_max_array * ureg.lbf / ureg.ft**2
 
-MTOM_array  = np.zeros(np.shape(L_D_array))
-MTOW_array  = np.zeros(np.shape(L_D_array))
-cptpp_array = np.zeros(np.shape(L_D_array))
-cppk_array  = np.zeros(np.shape(L_D_array))
-SPL_array   = np.zeros(np.shape(L_D_array))
-SPL_A_array = np.zeros(np.shape(L_D_array))
-
 #Optimize 
 
 sizing_plot_config = "Lift + cruise" #pull other data from this configuration
@@ -57,91 +52,62 @@ config             = sizing_plot_config
 
 c = configs[config]
 
-for i, T_A_max in enumerate(T_A_max_array[:,0]):
-	
-	for j, L_D_cruise in enumerate(L_D_array[0]):
-
-		aircraft = OnDemandAircraft()
-		aircraft = aircraft.standard_substitutions(config=config, autonomousEnabled=generic_data["autonomousEnabled"])
-
-		aircraft.substitutions.update({
-			aircraft.L_D_cruise:     L_D_cruise,
-			aircraft.rotors.T_A_max: T_A_max,
-			})
-
-		sizing_mission = OnDemandSizingMission(aircraft=aircraft)
-		sizing_mission = sizing_mission.standard_substitutions(piloted=generic_data["isSizingMissionPiloted"], reserve=generic_data["reserve"])
-
-		revenue_mission = OnDemandRevenueMission(aircraft=aircraft)
-		revenue_mission = revenue_mission.standard_substitutions(piloted=generic_data["isRevenueMissionPiloted"])
-
-		deadhead_mission = OnDemandDeadheadMission(aircraft=aircraft)
-		deadhead_mission = deadhead_mission.standard_substitutions(piloted=generic_data["isDeadheadMissionPiloted"])
-
-		mission_cost = OnDemandMissionCost(aircraft=aircraft, revenue_mission=revenue_mission, deadhead_mission=deadhead_mission)
-		mission_cost = mission_cost.standard_substitutions(isRevenueMissionPiloted=generic_data["isRevenueMissionPiloted"], isDeadheadMissionPiloted=generic_data["isDeadheadMissionPiloted"])
-
-		objective_function = mission_cost.cpt
-		problem            = Model(objective_function, [aircraft, sizing_mission, revenue_mission, deadhead_mission, mission_cost])
-		solution           = problem.solve(verbosity=0)
-
-		MTOM_array[i,j]  = solution("MTOM_OnDemandAircraft").to(ureg.kg).magnitude
-		MTOW_array[i,j]  = solution("MTOW_OnDemandAircraft").to(ureg.lbf).magnitude
-		cptpp_array[i,j] = solution("cost_per_trip_per_passenger_OnDemandMissionCost")
-		cppk_array[i,j]  = solution("cost_per_passenger_km_OnDemandMissionCost").to(ureg.km**-1).magnitude
-		
-		#Noise computations
-		T_perRotor = solution("T_perRotor_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		T_A        = solution("T/A_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		V_tip      = solution("v_{tip}_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		s          = solution("s_OnDemandAircraft/Rotors")
-		Cl_mean    = solution("Cl_{mean}_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		N          = solution("N_OnDemandAircraft/Rotors")
-		c_avg      = solution("c_{avg}_OnDemandAircraft/Rotors")
-		t_avg      = solution("t_{avg}_OnDemandAircraft/Rotors")
-		rho        = solution("\\rho_OnDemandSizingMission/HoverTakeoff/HoverFlightState/FixedStandardAtmosphere")
-		
-		delta_S = generic_data["delta_S"]
-		St      = generic_data["Strouhal_number"]
-		
-		f_peak, SPL_array[i,j],   spectrum = vortex_noise(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St, weighting="None")  # Unweighted
-		f_peak, SPL_A_array[i,j], spectrum = vortex_noise(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St, weighting="A")  # Unweighted
-
-		# print "T/A = %0.4f lbf/ft^2; L/D = %0.4f; cptpp = $%0.2f" \
-		# 	% (solution("T/A_OnDemandSizingMission").to(ureg.lbf/ureg.ft**2).magnitude, solution("L_D_cruise"), solution("cost_per_trip_per_passenger"))
-
-		# print "cptpp values: $%0.2f, $%0.2f, $%0.2f" % (cptpp_array[i,j], solution("cost_per_trip_per_passenger"), solution("cost_per_trip_per_passenger_OnDemandMissionCost"))
-
-
-MTOM_array = MTOM_array * ureg.kg
-MTOW_array = MTOW_array * ureg.lbf
-cppk_array = cppk_array * ureg.km**-1
+# Whole carpet solved as one sweep of the cached model; outputs are aligned with the (T/A, L/D) grid
+problem = on_demand_problem(config)
+
+hover_segment     = problem.sizing_mission.takeoff_segment
+hover_performance = hover_segment.performance.rotors_perf
+outputs = {"MTOM":       problem.aircraft.MTOM,
+	"MTOW":       problem.aircraft.MTOW,
+	"cptpp":      problem.mission_cost.cptpp,
+	"cppk":       problem.mission_cost.cpt_passenger_km,
+	"T_perRotor": hover_performance.T_perRotor,
+	"T_A":        hover_performance.T_A,
+	"V_tip":      hover_performance.v_tip,
+	"s":          problem.aircraft.rotors.s,
+	"Cl_mean":    hover_performance.Cl_mean,
+	"N":          problem.aircraft.rotors.N,
+	"c_avg":      problem.aircraft.rotors.c_avg,
+	"t_avg":      problem.aircraft.rotors.t_avg,
+	"rho":        hover_segment.state.atmosphere.rho}
+
+results = grid_sweep(problem, [(problem.aircraft.rotors.T_A_max, T_A_max_array[:,0]), (problem.aircraft.L_D_cruise, L_D_array[0])], outputs,
+	solver=PresolveSolver())
+
+MTOM_array  = results["MTOM"].to(ureg.kg)
+MTOW_array  = results["MTOW"].to(ureg.lbf)
+cptpp_array = results["cptpp"]
+cppk_array  = results["cppk"].to(ureg.km**-1)
+
+#Noise computations
+delta_S = generic_data["delta_S"]
+St      = generic_data["Strouhal_number"]
+
+f_peak, SPL_array, SPL_A_array, spectrum = vortex_noise_batch(results["T_perRotor"], results["T_A"], results["V_tip"], results["s"], results["Cl_mean"],
+	results["N"], results["c_avg"], results["t_avg"], results["rho"], delta_S, St)
 
 # Add Boeing inputs to configs
 for config in boeing_data:
 	configs[config] = boeing_data[config]
 	
-# Set up the bilinear interpolation functions
-cptpp_interp = interp2d(L_D_array, T_A_max_array.to(ureg.N/ureg.m**2).magnitude, cptpp_array,                          kind="cubic")
-cppk_interp  = interp2d(L_D_array, T_A_max_array.to(ureg.N/ureg.m**2).magnitude, cppk_array.to(ureg.km**-1).magnitude, kind="cubic")
-SPL_A_interp = interp2d(L_D_array, T_A_max_array.to(ureg.N/ureg.m**2).magnitude, SPL_A_array,                          kind="cubic")	
+# Set up the bicubic interpolation functions, called as f(L/D, T/A) (scipy's former interp2d)
+def grid_interpolant(values):
+	spline = RectBivariateSpline(T_A_max_array[:,0].to(ureg.N/ureg.m**2).magnitude, L_D_array[0], values, kx=3, ky=3)
+	return lambda L_D, T_A_max: spline(T_A_max, L_D).ravel()
+
+cptpp_interp = grid_interpolant(cptpp_array)
+cppk_interp  = grid_interpolant(cppk_array.to(ureg.km**-1).magnitude)
+SPL_A_interp = grid_interpolant(SPL_A_array)
 	
 # Estimated cptpp, cpsk and SPL_A
 for config in configs:
 	try:
 		# This will not work for the Boeing configs
-		aircraft = OnDemandAircraft()
-		aircraft = aircraft.standard_substitutions(config=config, autonomousEnabled=generic_data["autonomousEnabled"])
-
-		sizing_mission = OnDemandSizingMission(aircraft=aircraft)
-		sizing_mission = sizing_mission.standard_substitutions(piloted=generic_data["isSizingMissionPiloted"], reserve=generic_data["reserve"])
-
-		objective_function = aircraft.MTOM
-		problem            = Model(objective_function, [aircraft, sizing_mission])
-		solution           = problem.solve(verbosity=0)
+		config_problem = on_demand_problem(config)
+		solution       = config_problem.solve(solver=PresolveSolver())
 
-		L_D     = solution("(L/D)_{cruise}")
-		T_A_max = solution("(T/A)_{max}").to(ureg.N/ureg.m**2).magnitude
+		L_D     = solution(config_problem.aircraft.L_D_cruise)
+		T_A_max = solution(config_problem.aircraft.rotors.T_A_max).to(ureg.N/ureg.m**2).magnitude
 
 	except:
 
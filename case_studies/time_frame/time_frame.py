@@ -5,14 +5,15 @@ import sys
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/../../models'))
 
 import numpy as np
-from gpkit                  import Model, ureg
+from gpkit                  import ureg
 from copy                   import deepcopy
 from collections            import OrderedDict
 from matplotlib             import pyplot as plt
-from aircraft_models        import OnDemandAircraft
-from mission_models         import OnDemandSizingMission, OnDemandRevenueMission, OnDemandDeadheadMission
-from cost_models            import OnDemandMissionCost
-from noise_models           import vortex_noise
+from noise_models           import solution_noise
+from presolve               import PresolveSolver
+from solution_store         import solution_table
+from study_executor         import StudyCase, run_study
+from solution_cache         import solution_cache
 from standard_substitutions import generic_data, configs
 
 
@@ -60,80 +61,47 @@ for config in configs:
 	cases[config]["Long term"]["battery_cost_per_energy"] = 100 * ureg.kWh**-1
 
 
-# Optimize
+# Optimize (all cases solved in parallel)
+study_cases = []
 for config in cases:
-	
-	print "Solving configuration: " + config
+	for case in cases[config]:
 
-	for i, case in enumerate(cases[config]):
-		
 		c = cases[config][case]
 
-		aircraft = OnDemandAircraft()
-		aircraft = aircraft.standard_substitutions(config=config, autonomousEnabled=c["autonomousEnabled"])
+		options = {"autonomousEnabled":        c["autonomousEnabled"],
+			"isSizingMissionPiloted":   c["isSizingMissionPiloted"],
+			"isRevenueMissionPiloted":  c["isRevenueMissionPiloted"],
+			"isDeadheadMissionPiloted": c["isDeadheadMissionPiloted"]}
 
-		aircraft.substitutions.update({
-			aircraft.airframe.cost_per_weight: c["airframe_cost_per_weight"],
-			aircraft.battery.e:                c["e"],
-			aircraft.battery.cost_per_energy:  c["battery_cost_per_energy"],
-		})
+		substitutions = {"aircraft.airframe.cost_per_weight": c["airframe_cost_per_weight"],
+			"aircraft.battery.e":                c["e"],
+			"aircraft.battery.cost_per_energy":  c["battery_cost_per_energy"],
+			"mission_cost.deadhead_ratio":       c["deadhead_ratio"]}
 
-		sizing_mission = OnDemandSizingMission(aircraft=aircraft)
-		sizing_mission = sizing_mission.standard_substitutions(piloted=c["isSizingMissionPiloted"], reserve=generic_data["reserve"])
+		study_cases.append(StudyCase(config, substitutions=substitutions, options=options, label=(config, case),
+			solveargs={"solver": PresolveSolver()}))
 
-		revenue_mission = OnDemandRevenueMission(aircraft=aircraft)
-		revenue_mission = revenue_mission.standard_substitutions(piloted=c["isRevenueMissionPiloted"])
+solutions = run_study(study_cases, cache=solution_cache())
 
-		deadhead_mission = OnDemandDeadheadMission(aircraft=aircraft)
-		deadhead_mission = deadhead_mission.standard_substitutions(piloted=c["isDeadheadMissionPiloted"])
+for study_case, solution in zip(study_cases, solutions):
 
-		mission_cost = OnDemandMissionCost(aircraft=aircraft, revenue_mission=revenue_mission, deadhead_mission=deadhead_mission)
-		mission_cost = mission_cost.standard_substitutions(isRevenueMissionPiloted=c["isRevenueMissionPiloted"], isDeadheadMissionPiloted=c["isDeadheadMissionPiloted"])
+	config, case = study_case.label
+	c = cases[config][case]
 
-		mission_cost.substitutions.update({
-			mission_cost.deadhead_ratio: c["deadhead_ratio"]
-		})
+	table         = solution_table(solution)
+	c["solution"] = table
 
-		objective_function = mission_cost.cpt
-		problem            = Model(objective_function, [aircraft, sizing_mission, revenue_mission, deadhead_mission, mission_cost])
-		solution           = problem.solve(verbosity=0)
+	print(case + " aircraft cost: %0.1f per kg" % table("cost_per_mass_OnDemandAircraft/Airframe").to(ureg.kg**-1).magnitude)
 
-		c["solution"] = solution
+	# Noise computations (sizing and revenue missions)
 
-		print case + "aircraft cost: %0.1f per kg" % solution("cost_per_mass_OnDemandAircraft/Airframe").to(ureg.kg**-1).magnitude
+	for mission, name in [("OnDemandSizingMission", "sizing"), ("OnDemandRevenueMission", "revenue")]:
 
-		# Noise computations (sizing mission)
-		T_perRotor = solution("T_perRotor_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		T_A        = solution("T/A_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		V_tip      = solution("v_{tip}_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		s          = solution("s_OnDemandAircraft/Rotors")
-		Cl_mean    = solution("Cl_{mean}_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		N          = solution("N_OnDemandAircraft/Rotors")
-		c_avg      = solution("c_{avg}_OnDemandAircraft/Rotors")
-		t_avg      = solution("t_{avg}_OnDemandAircraft/Rotors")
-		rho        = solution("\\rho_OnDemandSizingMission/HoverTakeoff/HoverFlightState/FixedStandardAtmosphere")
-		
-		delta_S = generic_data["delta_S"]
-		St      = generic_data["Strouhal_number"]
+		noise = solution_noise(table, mission=mission, delta_S=generic_data["delta_S"], St=generic_data["Strouhal_number"])
 
-		f_peak, SPL, spectrum = vortex_noise(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St, weighting="A")
-
-		c["SPL_sizing_A"]      = SPL
-		c["f_{peak}"]          = f_peak
-		c["spectrum_sizing_A"] = spectrum
-
-		#Noise computations (revenue mission)
-		T_perRotor = solution("T_perRotor_OnDemandRevenueMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		T_A        = solution("T/A_OnDemandRevenueMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		V_tip      = solution("v_{tip}_OnDemandRevenueMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		Cl_mean    = solution("Cl_{mean}_OnDemandRevenueMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-		rho        = solution("\\rho_OnDemandRevenueMission/HoverTakeoff/HoverFlightState/FixedStandardAtmosphere")
-
-		f_peak, SPL, spectrum = vortex_noise(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St, weighting="A")
-		
-		c["SPL_revenue_A"]      = SPL
-		c["f_{peak}"]           = f_peak
-		c["spectrum_revenue_A"] = spectrum
+		c["SPL_" + name + "_A"]      = noise["vortex"]["SPL_A"]
+		c["f_{peak}"]                = noise["vortex"]["f_peak"]
+		c["spectrum_" + name + "_A"] = noise["vortex"]["spectrum"]
 
 
 # Plotting commands
@@ -179,7 +147,7 @@ for i,config in enumerate(cases):
 
 		offset   = style["offsets"][j]
 		solution = cases[config][case]["solution"]
-		MTOM     = solution("MTOM").to(ureg.kg).magnitude
+		MTOM     = solution("MTOM_OnDemandAircraft").to(ureg.kg).magnitude
 
 		if i==0:
 			plt.bar(i+offset, MTOM, align='center', alpha=1, width=style["bar_width_narrow"], color=style["colors"][j], edgecolor='k', label=case)
@@ -5,68 +5,32 @@ import sys
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../models"))
 
 import numpy as np
-from gpkit                  import Model, ureg
+from gpkit                  import ureg
 from copy                   import deepcopy
 from matplotlib             import pyplot as plt
-from aircraft_models        import OnDemandAircraft
-from mission_models         import OnDemandSizingMission, OnDemandRevenueMission, OnDemandDeadheadMission
-from cost_models            import OnDemandMissionCost
-from noise_models           import vortex_noise
+from noise_models           import solution_noise
+from presolve               import PresolveSolver
+from study_executor         import run_study, config_cases
+from solution_cache         import solution_cache
+from solution_store         import solution_table
 from standard_substitutions import generic_data, configs
 
 configs = deepcopy(configs)
 
 
-#Optimize and do noise analysis
-for config in configs:
-	
-	print "Solving configuration: " + config
-
-	aircraft = OnDemandAircraft()
-	aircraft = aircraft.standard_substitutions(config=config, autonomousEnabled=generic_data["autonomousEnabled"])
-
-	sizing_mission = OnDemandSizingMission(aircraft=aircraft)
-	sizing_mission = sizing_mission.standard_substitutions(piloted=generic_data["isSizingMissionPiloted"], reserve=generic_data["reserve"])
-
-	revenue_mission = OnDemandRevenueMission(aircraft=aircraft)
-	revenue_mission = revenue_mission.standard_substitutions(piloted=generic_data["isRevenueMissionPiloted"])
-
-	deadhead_mission = OnDemandDeadheadMission(aircraft=aircraft)
-	deadhead_mission = deadhead_mission.standard_substitutions(piloted=generic_data["isDeadheadMissionPiloted"])
+#Optimize (configurations solved in parallel) and do noise analysis
+solutions = run_study(config_cases(configs, solveargs={"solver": PresolveSolver()}), cache=solution_cache())
 
-	mission_cost = OnDemandMissionCost(aircraft=aircraft, revenue_mission=revenue_mission, deadhead_mission=deadhead_mission)
-	mission_cost = mission_cost.standard_substitutions(isRevenueMissionPiloted=generic_data["isRevenueMissionPiloted"], isDeadheadMissionPiloted=generic_data["isDeadheadMissionPiloted"])
+for config, solution in zip(configs, solutions):
 
-	objective_function = mission_cost.cpt
-	problem            = Model(objective_function, [aircraft, sizing_mission, revenue_mission, deadhead_mission, mission_cost])
-	solution           = problem.solve(verbosity=0)
-
-	configs[config]["solution"] = solution
-
-	# Noise computations
-	T_perRotor = solution("T_perRotor_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-	T_A        = solution("T/A_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-	V_tip      = solution("v_{tip}_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-	s          = solution("s_OnDemandAircraft/Rotors")
-	Cl_mean    = solution("Cl_{mean}_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")
-	N          = solution("N_OnDemandAircraft/Rotors")
-	c_avg      = solution("c_{avg}_OnDemandAircraft/Rotors")
-	t_avg      = solution("t_{avg}_OnDemandAircraft/Rotors")
-	rho        = solution("\\rho_OnDemandSizingMission/HoverTakeoff/HoverFlightState/FixedStandardAtmosphere")
-	
-	delta_S = generic_data["delta_S"]
-	St      = generic_data["Strouhal_number"]
-
-	#Unweighted
-	f_peak, SPL, spectrum = vortex_noise(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St, weighting="None")
-	
-	configs[config]["SPL"]      = SPL
-	configs[config]["f_{peak}"] = f_peak
+	configs[config]["solution"] = solution_table(solution)
 
-	#A-weighted
-	f_peak, SPL, spectrum = vortex_noise(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St, weighting="A")	
+	# Noise computations (sizing-mission hover takeoff)
+	noise = solution_noise(configs[config]["solution"], delta_S=generic_data["delta_S"], St=generic_data["Strouhal_number"])
 
-	configs[config]["SPL_A"] = SPL
+	configs[config]["SPL"]      = noise["vortex"]["SPL"]
+	configs[config]["f_{peak}"] = noise["vortex"]["f_peak"]
+	configs[config]["SPL_A"]    = noise["vortex"]["SPL_A"]
 
 
 # Plotting commands
@@ -437,7 +401,7 @@ for i, output in enumerate(outputs):
 			var_strings = ["purchase_price_OnDemandAircraft/Airframe", "purchase_price_OnDemandAircraft/Avionics", "purchase_price_OnDemandAircraft/Battery"]
 			precision   = "%0.0f"
 
-			output_string += precision % (sum(solution(v) for v in var_strings).to(ureg.dimensionless).magnitude / 1e3)
+			output_string += precision % (sum(solution(v) for v in var_strings) / 1e3)  # Dimensionless columns are plain floats
 			output_string += "\t\t"
 
 			continue
@@ -494,13 +458,13 @@ for i, output in enumerate(outputs):
 			continue
 
 
-		output_string += precision % solution(var_string).to(ureg(units)).magnitude
+		output_string += precision % (solution(var_string)*ureg.dimensionless).to(ureg(units)).magnitude  # Dimensionless columns are plain floats
 		output_string += "\t\t"
 
 	output_string += units + "\n"
 
-print "\n\n"
-print output_string
+print("\n\n")
+print(output_string)
 
 text_file = open("config_trade_study_tabulatedData.txt", "w")
 text_file.write(output_string)
@@ -0,0 +1,67 @@
+# Test case
+
+import os
+import stat
+import tempfile
+import numpy as np
+from gpkit               import ureg
+from mission_models      import FixedStandardAtmosphere
+from standard_atmosphere import stdatmo, stdatmo_fast, isa_atmosphere, isa_atmosphere_fast, load_table, table_columns, fast_fields
+
+def test():
+
+	h = np.linspace(0, 20000, 101) * ureg.ft
+
+	# Fast path matches the pint-wrapped lookup
+	atmospheric_data = stdatmo(h)
+	fast_data        = stdatmo_fast(h.to(ureg.m).magnitude, fields=fast_fields)
+
+	for key, field in zip(table_columns[1:], fast_fields):
+		assert np.allclose(fast_data[field], atmospheric_data[key].magnitude, rtol=1e-12, atol=0)
+
+	assert stdatmo_fast(0.).shape == ()
+	assert stdatmo_fast(np.zeros((3,4)), fields=("T",))["T"].shape == (3,4)
+
+	try:
+		stdatmo_fast(-1.)
+	except ValueError:
+		pass
+	else:
+		raise AssertionError("Altitude below the table range was accepted")
+
+	# Binary table: written with the usual permissions (not mkstemp's owner-only mode), and a corrupt one falls back to the text table
+	data_from_file   = np.asarray(load_table(binary_file_path=None))
+	binary_file_path = os.path.join(tempfile.mkdtemp(), "stdatmo_table.npy")
+
+	assert np.array_equal(load_table(binary_file_path=binary_file_path), data_from_file)
+	umask = os.umask(0)
+	os.umask(umask)
+	assert stat.S_IMODE(os.stat(binary_file_path).st_mode) == 0o666 & ~umask
+	assert np.array_equal(load_table(binary_file_path=binary_file_path), data_from_file)  # Memory-mapped
+
+	with open(binary_file_path, "wb") as binary_file:
+		binary_file.write(b"truncated")
+	assert np.array_equal(load_table(binary_file_path=binary_file_path), data_from_file)
+
+	# Analytic ISA matches the lookup table (the table speed of sound is constant, so it is only checked at sea level)
+	isa_data       = isa_atmosphere_fast(data_from_file[:,0], fields=fast_fields)
+
+	for i, field in enumerate(fast_fields):
+		if field == "a":
+			assert np.isclose(isa_data[field][0], data_from_file[0,i+1], rtol=1e-4)
+		else:
+			assert np.allclose(isa_data[field], data_from_file[:,i+1], rtol=1e-4)
+
+	# Hot day: standard pressure, shifted temperature
+	hot_day = isa_atmosphere(h, delta_T=15*ureg.K)
+	isa_day = isa_atmosphere(h)
+	assert np.allclose(hot_day["T"].magnitude - isa_day["T"].magnitude, 15.)
+	assert np.allclose(hot_day["P"].magnitude, isa_day["P"].magnitude)
+	assert np.all(hot_day["\rho"].magnitude < isa_day["\rho"].magnitude)
+
+	atmosphere = FixedStandardAtmosphere(0*ureg.m, model="isa")
+	assert np.isclose(atmosphere.substitutions[atmosphere.rho], 1.225, rtol=1e-4)
+
+if __name__=="__main__":
+
+	test()
@@ -0,0 +1,51 @@
+# Continuation sweeps: the points of a 1-D sweep are solved in order along the path, re-solving the cached problem (see problem_factory).
+# The points are not warm-started: neither cvxopt.solvers.gp nor the MOSEK interfaces accept a starting point, and a primal-only start
+# (the same program solved by cvxopt.solvers.cp from the previous optimum) was measured to take as many iterations as a cold start.
+# The solver iterations of each point are recorded, so this can be checked on any sweep (see continuation_benchmark).
+
+import re
+import numpy as np
+from problem_factory import axis_magnitude, store_output
+
+iteration_pattern = re.compile(r"^\s*(\d+):", re.MULTILINE)  # cvxopt progress line, e.g. " 7:  5.3653e+00  4.0714e+00  1e+00 ..."
+
+
+def solver_iterations(problem):
+
+	# Interior-point iterations of the last solve of an OnDemandProblem, from the solver progress that gpkit captures (cvxopt prints one
+	# numbered line per iteration, starting at 0); None if the solver does not report them
+	solve_log  = getattr(getattr(problem.model, "program", None), "solve_log", None)
+	iterations = iteration_pattern.findall(getattr(solve_log, "written", ""))
+	return int(iterations[-1]) if iterations else None
+
+
+def continuation_sweep(problem, variable, values, outputs, verbosity=0, **solveargs):
+
+	# Solves an OnDemandProblem for each value of the variable, in sorted order along the path (e.g. solver=PresolveSolver()).
+	# Outputs are returned in the order of the values, as in grid_sweep, together with the solve time and the solver iterations of each
+	# point (NaN where the solver does not report them).
+	values = axis_magnitude(variable, values)
+
+	magnitudes = {}
+	units      = {}
+	for name in outputs:
+		magnitudes[name] = np.zeros(np.size(values))
+		units[name]      = None
+
+	statistics = {"soltime":np.zeros(np.size(values)), "iterations":np.full(np.size(values), np.nan)}
+
+	for i in np.argsort(values, kind="mergesort"):
+		solution = problem.solve({variable: values[i]}, verbosity=verbosity, **solveargs)
+
+		statistics["soltime"][i] = solution["soltime"]
+		iterations               = solver_iterations(problem)
+		if iterations is not None:
+			statistics["iterations"][i] = iterations
+		for name in outputs:
+			store_output(solution, outputs, magnitudes, units, name, i)
+
+	results = {}
+	for name in outputs:
+		results[name] = magnitudes[name] if units[name] is None else magnitudes[name]*units[name]
+
+	return results, statistics
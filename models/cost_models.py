@@ -19,16 +19,25 @@ class OnDemandMissionCost(Model):
 	# Includes both revenue and deadhead missions
 	def setup(self, aircraft, revenue_mission, deadhead_mission):
 
+		self.cpt            = cpt            = Variable("cost_per_trip",            "-", "Cost for one trip")
+		self.deadhead_ratio = deadhead_ratio = Variable("deadhead_ratio",           "-", "Number of deadhead missions per total missions")
+		self.NdNr           = NdNr           = Variable("N_{deadhead}/N_{revenue}", "-", "Number of deadhead missions per revenue mission")
+
+		return self.trip_cost_constraints(aircraft, revenue_mission, deadhead_mission, cpt)
+
+	def trip_cost_constraints(self, aircraft, revenue_mission, deadhead_mission, cpt):
+
+		# Cost per trip cpt from the revenue and deadhead mission costs (one per route, if called under Vectorize)
 		N_passengers  = revenue_mission.passengers.N
 		trip_distance = revenue_mission.cruise_segment.d_segment
 
-		self.cpt              = cpt              = Variable("cost_per_trip",               "-",      "Cost for one trip")
+		deadhead_ratio = self.deadhead_ratio
+		NdNr           = self.NdNr
+
 		self.cptpp            = cptpp            = Variable("cost_per_trip_per_passenger", "-",      "Cost for one trip, per passenger carried on revenue trip")
 		self.cpt_passenger_km = cpt_passenger_km = Variable("cost_per_passenger_km",       "km**-1", "Cost per trip, per seat (passenger) kilometer")
 		self.cpt_revenue      = cpt_revenue      = Variable("revenue_cost_per_trip",       "-",      "Portion of the cost per trip incurred during the revenue-generating flights")
 		self.cpt_deadhead     = cpt_deadhead     = Variable("deadhead_cost_per_trip",      "-",      "Portion of the cost per trip incurred during the deadhead flights")
-		self.deadhead_ratio   = deadhead_ratio   = Variable("deadhead_ratio",              "-",      "Number of deadhead missions per total missions")
-		self.NdNr             = NdNr             = Variable("N_{deadhead}/N_{revenue}",    "-",      "Number of deadhead missions per revenue mission")
 
 		self.revenue_mission_cost  = revenue_mission_cost  = RevenueMissionCost( aircraft=aircraft, mission=revenue_mission)
 		self.deadhead_mission_cost = deadhead_mission_cost = DeadheadMissionCost(aircraft=aircraft, mission=deadhead_mission)
@@ -47,6 +56,60 @@ class OnDemandMissionCost(Model):
 		
 		return constraints
 
+class OnDemandRouteDistributionCost(OnDemandMissionCost):
+
+	def standard_substitutions(self, isRevenueMissionPiloted=True, isDeadheadMissionPiloted=False):
+		mission_cost = on_demand_mission_cost_substitutions(mission_cost=self, isRevenueMissionPiloted=isRevenueMissionPiloted, isDeadheadMissionPiloted=isDeadheadMissionPiloted)
+		mission_cost.substitutions.update({mission_cost.p_route: np.ones(self.num_routes)/self.num_routes})  # Equally likely routes
+		return mission_cost
+
+	# Demand-weighted cost per trip over K representative routes (e.g. from a trip-length distribution; see representative_routes).
+	# The revenue and deadhead missions are built under Vectorize(K), one entry per route; p_route is the probability of each route.
+	def setup(self, aircraft, revenue_mission, deadhead_mission):
+
+		self.num_routes = num_routes = np.shape(revenue_mission.t_mission)[0]
+
+		self.cpt            = cpt            = Variable("cost_per_trip",            "-", "Demand-weighted cost for one trip")
+		self.deadhead_ratio = deadhead_ratio = Variable("deadhead_ratio",           "-", "Number of deadhead missions per total missions")
+		self.NdNr           = NdNr           = Variable("N_{deadhead}/N_{revenue}", "-", "Number of deadhead missions per revenue mission")
+
+		with Vectorize(num_routes):
+
+			self.p_route   = p_route   = Variable("route_probability",   "-", "Probability of each route (sums to 1)")
+			self.cpt_route = cpt_route = Variable("cost_per_trip_route", "-", "Cost for one trip, on each route")
+
+			constraints = self.trip_cost_constraints(aircraft, revenue_mission, deadhead_mission, cpt_route)
+
+		constraints += [cpt >= (p_route * cpt_route).sum()]
+
+		return constraints
+
+
+def representative_routes(distances, num_routes, weights=None):
+
+	# Reduces a sample of trip distances (e.g. from demand data) to num_routes representative routes of equal probability mass:
+	# the weighted mean distance of each quantile bin, and the probability of the bin (1/num_routes). weights: optional demand per
+	# sample. A sample whose probability mass straddles a quantile is split between the two bins, so no bin is ever empty.
+	distances = np.ravel(distances)
+	weights   = np.ones(np.size(distances)) if weights is None else np.ravel(np.asarray(weights, dtype=np.float64))
+
+	magnitudes = getattr(distances, "magnitude", distances)
+	order      = np.argsort(magnitudes)
+	magnitudes = magnitudes[order]
+	weights    = weights[order]
+
+	# Cumulative probability, and cumulative probability-weighted distance (the integral of the quantile function), at the sample edges
+	cumulative_probability = np.concatenate([[0.], np.cumsum(weights)])/np.sum(weights)
+	cumulative_distance    = np.concatenate([[0.], np.cumsum(weights*magnitudes)])/np.sum(weights)
+
+	quantiles       = np.linspace(0., 1., num_routes + 1)
+	route_distances = np.diff(np.interp(quantiles, cumulative_probability, cumulative_distance))*num_routes
+	if hasattr(distances, "units"):
+		route_distances = route_distances*distances.units
+
+	return route_distances, np.ones(num_routes)/num_routes
+
+
 class RevenueMissionCost(Model):
 	
 	# Cost for one mission. Revenue and Deadhead cost models have exactly the same code. Simplifies data output.
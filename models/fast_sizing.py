@@ -0,0 +1,226 @@
+# Fast sizing for design-space screening: the standard problem (sizing mission, weight closure, revenue and deadhead missions, cost per
+# trip) evaluated without a GP solver, vectorized over candidate parameter sets (e.g. millions of points, to prefilter a design space
+# before GP refinement).
+# At the GP optimum the sizing mission sets the design: the disk loading is at its maximum in hover, so the rotor area, hover power and
+# cruise power all scale with the weight, and so does the battery (energy or power limited). The weight-closure fixed point
+# MTOM = (m_battery(MTOM) + m_payload)/(1 - empty_mass_fraction) is therefore linear, and is solved exactly. The revenue and deadhead
+# missions are then flown by the sized design (see off_design).
+# The _si functions take and return plain SI magnitudes (kg, N, m, s, W, J).
+
+import numpy as np
+from collections import OrderedDict
+from gpkit       import ureg
+from off_design  import off_design_mission_si
+
+
+def fast_sizing_inputs(problem):
+
+	# Inputs of fast_sizing_si() for an OnDemandProblem, in SI, from its substitutions (no solve needed):
+	# aircraft parameters, sizing mission, revenue and deadhead mission inputs (as in off_design.mission_inputs), and the deadhead ratio
+	aircraft = problem.aircraft
+	battery  = aircraft.battery
+	rotors   = aircraft.rotors
+	sizing   = problem.sizing_mission
+
+	parameters = OrderedDict([("g",                                    substitution_si(problem, aircraft.g,                                    "m/s^2")),
+		("empty_mass_fraction",                  substitution_si(problem, aircraft.empty_mass_fraction,                  "-")),
+		("v_cruise",                             substitution_si(problem, aircraft.v_cruise,                             "m/s")),
+		("L_D_cruise",                           substitution_si(problem, aircraft.L_D_cruise,                           "-")),
+		("eta_levelFlight",                      substitution_si(problem, aircraft.eta_levelFlight,                      "-")),
+		("eta_electrical",                       substitution_si(problem, aircraft.electrical_system.eta,                "-")),
+		("tailRotor_power_fraction_hover",       substitution_si(problem, aircraft.tailRotor_power_fraction_hover,       "-")),
+		("tailRotor_power_fraction_levelFlight", substitution_si(problem, aircraft.tailRotor_power_fraction_levelFlight, "-")),
+		("e",                                    substitution_si(problem, battery.e,                                     "J/kg")),
+		("p",                                    substitution_si(problem, battery.p,                                     "W/kg")),
+		("E_frac",                               substitution_si(problem, battery.E_frac,                                "-")),
+		("battery_cost_per_energy",              substitution_si(problem, battery.cost_per_energy,                       "1/J")),
+		("battery_cycle_life",                   substitution_si(problem, battery.cycle_life,                            "-")),
+		("airframe_cost_per_weight",             substitution_si(problem, aircraft.airframe.cost_per_weight,             "1/N")),
+		("airframe_lifetime",                    substitution_si(problem, aircraft.airframe.lifetime,                    "s")),
+		("avionics_purchase_price",              substitution_si(problem, aircraft.avionics.purchase_price,              "-")),
+		("avionics_lifetime",                    substitution_si(problem, aircraft.avionics.lifetime,                    "s")),
+		("N",                                    substitution_si(problem, rotors.N,                                      "-")),
+		("s",                                    substitution_si(problem, rotors.s,                                      "-")),
+		("ki",                                   substitution_si(problem, rotors.ki,                                     "-")),
+		("Cd0",                                  substitution_si(problem, rotors.Cd0,                                    "-")),
+		("T_A_max",                              substitution_si(problem, rotors.T_A_max,                                "N/m^2")),
+		("M_tip_max",                            substitution_si(problem, rotors.M_tip_max,                              "-")),
+		("Cl_mean_max",                          substitution_si(problem, rotors.Cl_mean_max,                            "-"))])
+
+	sizing_inputs = OrderedDict([("N_crew",  substitution_si(problem, sizing.crew.N,              "-")),
+		("W_unit_crew",        substitution_si(problem, sizing.crew.W_unit,                         "N")),
+		("N_passengers",       substitution_si(problem, sizing.passengers.N,                        "-")),
+		("W_unit_passenger",   substitution_si(problem, sizing.passengers.W_unit,                   "N")),
+		("d",                  substitution_si(problem, sizing.cruise_segment.d_segment,            "m")),
+		("v_reserve_nondim",   substitution_si(problem, sizing.v_reserve_nondim,                    "-")),
+		("L_D_reserve_nondim", substitution_si(problem, sizing.L_D_reserve_nondim,                  "-"))])
+
+	# Reserve given either as a time (loiter) or as a distance (diversion)
+	if sizing.reserve_segment.t_segment in problem.model.substitutions:
+		sizing_inputs["t_reserve"] = substitution_si(problem, sizing.reserve_segment.t_segment, "s")
+	else:
+		sizing_inputs["d_reserve"] = substitution_si(problem, sizing.reserve_segment.d_segment, "m")
+
+	hover_segments = [sizing.takeoff_segment, sizing.landing_segment]
+	sizing_inputs["t_hover"]   = np.array([substitution_si(problem, c.t_segment,            "s")      for c in hover_segments])
+	sizing_inputs["rho_hover"] = np.array([substitution_si(problem, c.state.atmosphere.rho, "kg/m^3") for c in hover_segments])
+	sizing_inputs["a_hover"]   = np.array([substitution_si(problem, c.state.atmosphere.a,   "m/s")    for c in hover_segments])
+
+	mission_inputs = OrderedDict()
+	for name, mission, mission_cost in [("revenue", problem.revenue_mission, problem.mission_cost.revenue_mission_cost),
+		("deadhead", problem.deadhead_mission, problem.mission_cost.deadhead_mission_cost)]:
+
+		operating_expenses = mission_cost.operating_expenses
+		hover_segments     = [mission.takeoff_segment, mission.landing_segment]
+
+		inputs = OrderedDict([("N_crew", substitution_si(problem, mission.crew.N,                          "-")),
+			("W_unit_crew",       substitution_si(problem, mission.crew.W_unit,                              "N")),
+			("N_passengers",      substitution_si(problem, mission.passengers.N,                             "-")),
+			("W_unit_passenger",  substitution_si(problem, mission.passengers.W_unit,                        "N")),
+			("d",                 substitution_si(problem, mission.cruise_segment.d_segment,                 "m")),
+			("t_passenger",       substitution_si(problem, mission.ground_segment.t_passenger,               "s")),
+			("P_charger",         substitution_si(problem, mission.ground_segment.charger.P,                 "W")),
+			("eta_charger",       substitution_si(problem, mission.ground_segment.charger.eta,               "-")),
+			("pilot_cost_per_time", substitution_si(problem, operating_expenses.pilot_cost.wrap_rate, "1/s")
+				*substitution_si(problem, operating_expenses.pilot_cost.pilots_per_aircraft, "-")),
+			("maintenance_cost_per_time", substitution_si(problem, operating_expenses.maintenance_cost.wrap_rate, "1/s")
+				*substitution_si(problem, operating_expenses.maintenance_cost.MMH_FH, "-")),
+			("cost_per_energy",   substitution_si(problem, operating_expenses.energy_cost.cost_per_energy,   "1/J")),
+			("IOC_fraction",      substitution_si(problem, operating_expenses.IOC_fraction,                  "-"))])
+
+		inputs["t_hover"]   = np.array([substitution_si(problem, c.t_segment,            "s")      for c in hover_segments])
+		inputs["rho_hover"] = np.array([substitution_si(problem, c.state.atmosphere.rho, "kg/m^3") for c in hover_segments])
+		inputs["a_hover"]   = np.array([substitution_si(problem, c.state.atmosphere.a,   "m/s")    for c in hover_segments])
+
+		mission_inputs[name] = inputs
+
+	deadhead_ratio = substitution_si(problem, problem.mission_cost.deadhead_ratio, "-")
+
+	return parameters, sizing_inputs, mission_inputs["revenue"], mission_inputs["deadhead"], deadhead_ratio
+
+
+def fast_sizing_si(parameters, sizing, revenue, deadhead, deadhead_ratio):
+
+	# Sized design and cost per trip, broadcast over the arrays given in parameters (and in the mission inputs, except for the hover
+	# segments). feasible is False where the weight does not close, the tip Mach number limit is exceeded in hover, or the sized design
+	# cannot fly its revenue or deadhead mission.
+	p = parameters
+
+	W_payload = sizing["N_crew"]*sizing["W_unit_crew"] + sizing["N_passengers"]*sizing["W_unit_passenger"]
+
+	eta_hover       = (1 - p["tailRotor_power_fraction_hover"])*p["eta_electrical"]
+	eta_levelFlight = p["eta_levelFlight"]*(1 - p["tailRotor_power_fraction_levelFlight"])*p["eta_electrical"]
+
+	# Hover at the maximum disk loading and mean lift coefficient: electrical power per unit weight, independent of the weight
+	CT       = p["s"]*p["Cl_mean_max"]/3.
+	E_hover  = []  # Energy per unit weight (J/N), per hover segment
+	P_hover  = 0.  # Maximum electrical power per unit weight (W/N)
+	feasible = True
+	for t, rho, a in zip(sizing["t_hover"], sizing["rho_hover"], sizing["a_hover"]):
+		v_tip    = np.sqrt(p["T_A_max"]/(0.5*rho*CT))
+		P_W      = v_tip*(p["ki"]*0.5*CT**1.5 + 0.25*p["s"]*p["Cd0"])/CT/eta_hover
+		feasible = feasible & (v_tip <= p["M_tip_max"]*a*(1 + 1e-6))
+		E_hover.append(P_W*t)
+		P_hover  = np.maximum(P_hover, P_W)
+
+	# Cruise and reserve, at the design speed and lift-to-drag ratio (reserve: scaled by the reserve nondimensional speed and L/D)
+	P_cruise = p["v_cruise"]/p["L_D_cruise"]/eta_levelFlight
+	E_cruise = P_cruise*sizing["d"]/p["v_cruise"]
+
+	v_reserve = p["v_cruise"]*sizing["v_reserve_nondim"]
+	P_reserve = v_reserve/(p["L_D_cruise"]*sizing["L_D_reserve_nondim"])/eta_levelFlight
+	t_reserve = sizing["t_reserve"] if "t_reserve" in sizing else sizing["d_reserve"]/v_reserve
+	E_reserve = P_reserve*t_reserve
+
+	E_W = sum(E_hover) + E_cruise + E_reserve
+	P_W = np.maximum(np.maximum(P_hover, P_cruise), P_reserve)
+
+	# Weight closure: battery mass per unit weight from energy or power, whichever is limiting
+	m_battery_W = np.maximum(E_W/(p["E_frac"]*p["e"]), P_W/p["p"])
+	closure     = 1 - p["empty_mass_fraction"] - m_battery_W*p["g"]
+	feasible    = feasible & (closure > 0)
+
+	MTOM       = np.where(closure > 0, W_payload/p["g"]/np.where(closure > 0, closure, 1.), np.inf)
+	MTOW       = p["g"]*MTOM
+	m_battery  = m_battery_W*MTOW
+	m_airframe = p["empty_mass_fraction"]*MTOM
+	E          = m_battery*p["e"]  # The battery capacity follows its mass, even where it is sized by power
+	E_eff      = p["E_frac"]*E
+
+	design = {"MTOM": MTOM,
+		"g":                                    p["g"],
+		"W_noPassengersOrCrew":                 p["g"]*(m_airframe + m_battery),
+		"v_cruise":                             p["v_cruise"],
+		"L_D_cruise":                           p["L_D_cruise"],
+		"eta_levelFlight":                      p["eta_levelFlight"],
+		"eta_electrical":                       p["eta_electrical"],
+		"tailRotor_power_fraction_hover":       p["tailRotor_power_fraction_hover"],
+		"tailRotor_power_fraction_levelFlight": p["tailRotor_power_fraction_levelFlight"],
+		"E_eff":                                E_eff,
+		"P_max":                                m_battery*p["p"],
+		"A":                                    MTOW/(p["N"]*p["T_A_max"]),
+		"N":                                    p["N"],
+		"s":                                    p["s"],
+		"ki":                                   p["ki"],
+		"Cd0":                                  p["Cd0"],
+		"T_A_max":                              p["T_A_max"],
+		"M_tip_max":                            p["M_tip_max"],
+		"Cl_mean_max":                          p["Cl_mean_max"],
+		"airframe_purchase_price":              p["airframe_cost_per_weight"]*p["g"]*m_airframe,
+		"airframe_lifetime":                    p["airframe_lifetime"],
+		"avionics_purchase_price":              p["avionics_purchase_price"],
+		"avionics_lifetime":                    p["avionics_lifetime"],
+		"battery_purchase_price":               p["battery_cost_per_energy"]*E,
+		"battery_cycle_life":                   p["battery_cycle_life"]}
+
+	with np.errstate(divide="ignore", invalid="ignore"):  # Candidates whose weight does not close have an infinite MTOM
+		revenue_results  = off_design_mission_si(design, revenue,  revenue["d"],  revenue["N_passengers"])
+		deadhead_results = off_design_mission_si(design, deadhead, deadhead["d"], deadhead["N_passengers"])
+
+	NdNr = deadhead_ratio/(1 - deadhead_ratio)
+	cpt  = revenue_results["cost_per_mission"] + NdNr*deadhead_results["cost_per_mission"]
+
+	feasible = feasible & revenue_results["feasible"] & deadhead_results["feasible"]
+
+	shape = np.broadcast(MTOM, cpt).shape
+	return {"MTOM": np.broadcast_to(MTOM, shape),
+		"m_battery":           np.broadcast_to(m_battery, shape),
+		"E":                   np.broadcast_to(E, shape),
+		"A_total":             np.broadcast_to(design["A"]*p["N"], shape),
+		"E_hover":             np.broadcast_to(sum(E_hover)*MTOW, shape),
+		"E_cruise":            np.broadcast_to(E_cruise*MTOW, shape),
+		"E_reserve":           np.broadcast_to(E_reserve*MTOW, shape),
+		"E_revenue":           np.broadcast_to(revenue_results["E_mission"], shape),
+		"E_deadhead":          np.broadcast_to(deadhead_results["E_mission"], shape),
+		"cpt":                 np.broadcast_to(cpt, shape),
+		"cptpp":               np.broadcast_to(cpt/revenue["N_passengers"], shape),
+		"feasible":            np.broadcast_to(feasible, shape)}
+
+
+def fast_sizing(problem, **parameters):
+
+	# Fast sizing of an OnDemandProblem, with parameter overrides (e.g. e=np.linspace(300, 500, 100)*ureg.Wh/ureg.kg, L_D_cruise=...)
+	# broadcast against each other. Parameter names are those of fast_sizing_inputs(); pint quantities are converted to SI.
+	base_parameters, sizing, revenue, deadhead, deadhead_ratio = fast_sizing_inputs(problem)
+
+	for name, value in parameters.items():
+		if name not in base_parameters:
+			error_string = "Fast-sizing parameter " + name + " not recognized."
+			raise ValueError(error_string)
+		if hasattr(value, "to"):
+			value = value.to_base_units().magnitude
+		base_parameters[name] = np.asarray(value, dtype=np.float64)
+
+	return fast_sizing_si(base_parameters, sizing, revenue, deadhead, deadhead_ratio)
+
+
+def substitution_si(problem, variable, units):
+
+	# Substituted (fixed) value of a variable of an OnDemandProblem, as a float in the given units
+	value = problem.model.substitutions[variable]
+	value = getattr(value, "magnitude", value)
+	if np.size(value) != 1:
+		error_string = "Substitution for " + str(variable) + " has " + str(np.size(value)) + " values; a scalar substitution is required."
+		raise ValueError(error_string)
+	value = float(np.ravel(value)[0])*(variable.key.units or ureg.dimensionless)
+	return value.to(units).magnitude if units != "-" else value.to("dimensionless").magnitude
@@ -5,16 +5,26 @@ pi = math.pi
 
 from gpkit                  import Variable, Model, Vectorize, ureg
 from aircraft_models        import OnDemandAircraft
-from standard_atmosphere    import stdatmo
+from standard_atmosphere    import stdatmo, isa_atmosphere
 from standard_substitutions import on_demand_sizing_mission_substitutions, on_demand_revenue_mission_substitutions, on_demand_deadhead_mission_substitutions
 
 # from noise_models import rotational_noise, vortex_noise, noise_weighting
 
 class FixedStandardAtmosphere(Model):
 	
-	def setup(self, h):
+	# model="table" uses the lookup table; model="isa" uses the analytic ISA, with optional temperature offset (e.g. hot day)
+	def setup(self, h, model="table", delta_T=0*ureg.K):
 		
-		atmospheric_data = stdatmo(h)
+		if model == "table":
+			if delta_T.to(ureg.K).magnitude != 0:
+				error_string = "Temperature offsets require the analytic atmosphere model (model=\"isa\")."
+				raise ValueError(error_string)
+			atmospheric_data = stdatmo(h)
+		elif model == "isa":
+			atmospheric_data = isa_atmosphere(h, delta_T)
+		else:
+			error_string = "Atmosphere model " + model + " not recognized."
+			raise ValueError(error_string)
 		
 		rho = atmospheric_data["\rho"].to(ureg.kg / ureg.m**3.).magnitude
 		a   = atmospheric_data["a"].to(ureg.m / ureg.s).magnitude
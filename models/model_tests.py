@@ -1,13 +1,23 @@
 # Test case
 
+import os
+import tempfile
 import numpy as np
 from gpkit                  import Model, ureg
 from copy                   import deepcopy
 from matplotlib             import pyplot as plt
 from aircraft_models        import OnDemandAircraft
 from mission_models         import OnDemandSizingMission, OnDemandRevenueMission, OnDemandDeadheadMission
-from cost_models            import OnDemandMissionCost
+from cost_models            import OnDemandMissionCost, representative_routes
 from noise_models           import vortex_noise
+from problem_factory        import on_demand_problem, grid_sweep, config_study, route_distribution_substitutions
+from continuation           import continuation_sweep
+from study_executor         import run_study, config_cases
+from solution_cache         import SolutionCache
+from presolve               import PresolveSolver, presolve_report
+from off_design             import off_design_missions, frozen_design_substitutions
+from fast_sizing            import fast_sizing
+from solution_store         import solution_table, save_table, load_table, solution_results, standard_quantities, key_string
 from standard_substitutions import generic_data, configs
 
 def test():
@@ -31,7 +41,169 @@ def test():
 
 		objective_function = mission_cost.cpt
 		problem            = Model(objective_function, [aircraft, sizing_mission, revenue_mission, deadhead_mission, mission_cost])
-		solution           = problem.solve(verbosity=0)
+		solution           = problem.solve(verbosity=0, solver=PresolveSolver())
+
+		# Cached problem gives the same optimum, and overrides do not persist between solves
+		factory_problem = on_demand_problem(config)
+		factory_problem.solve({factory_problem.aircraft.L_D_cruise: 1.1*solution("(L/D)_{cruise}")}, solver=PresolveSolver())
+		factory_solution = factory_problem.solve(solver=PresolveSolver())
+		assert abs(factory_solution["cost"] - solution["cost"]) <= 1e-4*solution["cost"]
+
+		# Presolved (monomial equalities eliminated) program gives the same optimum and sensitivities, on a smaller program
+		presolver          = PresolveSolver()
+		presolved_solution = factory_problem.solve(solver=presolver)
+		assert abs(presolved_solution["cost"] - solution["cost"]) <= 1e-4*solution["cost"]
+		for key, value in presolve_report(factory_problem.model).items():
+			assert presolver.report[key] == value
+		assert presolver.report["variables"][1] < presolver.report["variables"][0]
+
+		sensitivity = presolved_solution["sensitivities"]["variables"]["(L/D)_{cruise}"]
+		assert abs(sensitivity - solution["sensitivities"]["variables"]["(L/D)_{cruise}"]) <= 1e-3*abs(sensitivity) + 1e-6
+
+	#Presolve: same reduction (program size after presolve) as the original dense elimination, for every configuration and for a
+	#route distribution
+	reference_report = {"variables": (355, 47), "posynomials": (714, 94), "monomials": (765, 145), "eliminated_equalities": 308}
+	for config in configs:
+		assert presolve_report(on_demand_problem(config).model) == reference_report
+
+	reference_report = {"variables": (814, 114), "posynomials": (1629, 225), "monomials": (1760, 356), "eliminated_equalities": 700}
+	assert presolve_report(on_demand_problem(num_routes=3).model) == reference_report
+
+	#Grid sweep: a single gpkit sweep must match point-by-point re-solves, on the same grid layout
+	problem = on_demand_problem()
+	axes    = [(problem.aircraft.rotors.T_A_max, np.array([6., 12.])*ureg.lbf/ureg.ft**2), (problem.aircraft.L_D_cruise, np.array([9., 11., 13.]))]
+	outputs = {"MTOM":problem.aircraft.MTOM, "cptpp":problem.mission_cost.cptpp}
+
+	sweep_results   = grid_sweep(problem, axes, outputs, mode="sweep", solver=PresolveSolver())
+	resolve_results = grid_sweep(problem, axes, outputs, mode="resolve", solver=PresolveSolver())
+
+	for name in outputs:
+		assert np.shape(sweep_results[name]) == (2, 3)
+		ratio = sweep_results[name]/resolve_results[name]
+		assert np.allclose(getattr(ratio, "magnitude", ratio), 1, rtol=1e-4)
+
+	#Continuation sweep: same outputs as the re-solves, in the order of the values, with the solver iterations of every point
+	e_values                         = np.array([500., 300., 400.])*ureg.Wh/ureg.kg
+	continuation_results, statistics = continuation_sweep(problem, problem.aircraft.battery.e, e_values, outputs, solver=PresolveSolver())
+	resolve_results                  = grid_sweep(problem, [(problem.aircraft.battery.e, e_values)], outputs, mode="resolve", solver=PresolveSolver())
+
+	for name in outputs:
+		ratio = continuation_results[name]/resolve_results[name]
+		assert np.allclose(getattr(ratio, "magnitude", ratio), 1, rtol=1e-6)
+	assert np.all(statistics["iterations"] > 0)
+
+	#Config study: all configurations solved as one vectorized GP must match the per-configuration solves, in configs order
+	outputs            = {"MTOM":"aircraft.MTOM", "cptpp":"mission_cost.cptpp"}
+	vectorized_results = config_study(configs, outputs, mode="vectorized", solver=PresolveSolver())
+	resolve_results    = config_study(configs, outputs, solver=PresolveSolver())
+
+	for name in outputs:
+		assert np.shape(vectorized_results[name]) == (len(configs),)
+		ratio = vectorized_results[name]/resolve_results[name]
+		assert np.allclose(getattr(ratio, "magnitude", ratio), 1, rtol=1e-4)
+
+	#Off-design missions: the frozen design flies its own revenue mission at the design cost, and other routes at the cost of a GP
+	#re-solve with the sizing variables fixed
+	design_solution = problem.solve(solver=PresolveSolver())
+	design_results  = off_design_missions(problem, design_solution, design_solution(problem.revenue_mission.cruise_segment.d_segment))
+	assert abs(design_results["cpt"] - design_solution["cost"]) <= 1e-4*design_solution["cost"]
+
+	off_design_model = Model(problem.mission_cost.cpt, [problem.aircraft, problem.revenue_mission, problem.deadhead_mission, problem.mission_cost])
+	off_design_model.substitutions.update(frozen_design_substitutions(problem, design_solution))
+	off_design_model.substitutions.update({problem.revenue_mission.cruise_segment.d_segment: 12*ureg.nautical_mile, problem.revenue_mission.passengers.N: 3.})
+	off_design_solution = off_design_model.solve(verbosity=0, solver=PresolveSolver())
+
+	d              = np.array([[12.], [25.], [40.]])*ureg.nautical_mile
+	routes_results = off_design_missions(problem, design_solution, d, np.array([1., 2., 3.]), d_deadhead=30*ureg.nautical_mile)
+	assert np.shape(routes_results["cpt"]) == (3, 3)
+	assert np.all(routes_results["feasible"])
+	assert abs(routes_results["cpt"][0, 2] - off_design_solution["cost"]) <= 1e-4*off_design_solution["cost"]
+
+	E_mission = off_design_solution(problem.revenue_mission.E_mission)
+	assert abs(routes_results["revenue"]["E_mission"][0, 2] - E_mission) <= 1e-4*E_mission
+
+	#Route distribution: identical routes give the single-route cost; otherwise the cost per trip is the demand-weighted mean of the routes
+	routes_problem  = on_demand_problem(num_routes=3)
+	routes_solution = routes_problem.solve(solver=PresolveSolver())
+	assert abs(routes_solution["cost"] - design_solution["cost"]) <= 1e-4*design_solution["cost"]
+
+	d, p_route = representative_routes(np.array([5., 10., 20., 25., 40., 60.])*ureg.nautical_mile, 3, weights=[1., 1., 2., 2., 1., 1.])
+	assert np.allclose(p_route, [1./3, 1./3, 1./3])
+	assert np.allclose(d.to(ureg.nautical_mile).magnitude, [10.625, 22.5, 43.75])
+
+	routes_solution = routes_problem.solve(route_distribution_substitutions(routes_problem, d, p_route), solver=PresolveSolver())
+	cpt_route       = routes_solution(routes_problem.mission_cost.cpt_route)
+	assert np.all(np.diff(getattr(cpt_route, "magnitude", cpt_route)) > 0)
+	assert abs(routes_solution["cost"] - np.dot(p_route, cpt_route)) <= 1e-4*routes_solution["cost"]
+
+	#Representative routes: fewer samples than routes still give equal-probability routes (no empty bins)
+	d_sparse, p_sparse = representative_routes([10., 20.], 3)
+	assert np.allclose(p_sparse, [1./3, 1./3, 1./3])
+	assert np.allclose(d_sparse, [10., 15., 20.])
+
+	#Fast sizing: same design and cost per trip as the GP, including a power-limited battery
+	for config in configs:
+		config_problem = on_demand_problem(config)
+		for parameters in [{}, {"p": 0.6*ureg.kW/ureg.kg}]:
+			substitutions   = {config_problem.aircraft.battery.p: parameters["p"]} if parameters else None
+			config_solution = config_problem.solve(substitutions, solver=PresolveSolver())
+			fast_results    = fast_sizing(config_problem, **parameters)
+			assert fast_results["feasible"]
+			for name, variable in [("MTOM", config_problem.aircraft.MTOM), ("E", config_problem.aircraft.battery.E)]:
+				value = config_solution(variable).to_base_units().magnitude
+				assert abs(fast_results[name] - value) <= 1e-4*value
+			assert abs(fast_results["cpt"] - config_solution["cost"]) <= 1e-4*config_solution["cost"]
+
+	#Fast sizing: a vectorized problem (one substitution per configuration) is rejected, rather than sized for its first configuration
+	try:
+		fast_sizing(on_demand_problem(configs))
+		assert False
+	except ValueError:
+		pass
+
+	#Study executor: parallel solves come back in configs order
+	parallel_solutions = run_study(config_cases(configs, solveargs={"solver": PresolveSolver()}), processes=2)
+	for config, parallel_solution in zip(configs, parallel_solutions):
+		serial_solution = on_demand_problem(config).solve(solver=PresolveSolver())
+		assert abs(parallel_solution["cost"] - serial_solution["cost"]) <= 1e-4*serial_solution["cost"]
+
+	#Solution cache: the second solve is read from disk, also with another solver instance of the same configuration; a different
+	#substitution or solver configuration is not
+	cache           = SolutionCache(directory_path=tempfile.mkdtemp())
+	solved_solution = problem.solve(cache=cache, solver=PresolveSolver())
+	cached_solution = problem.solve(cache=cache, solver=PresolveSolver())
+	problem.solve({problem.aircraft.L_D_cruise: 12.}, cache=cache, solver=PresolveSolver())
+	problem.solve(cache=cache, solver=PresolveSolver(tolerance=1e-6))
+	assert (cache.hits, cache.misses) == (1, 3)
+	assert cached_solution["cost"] == solved_solution["cost"]
+	cache.clear()
+
+	#Solution table: same values as the solution, and the same table after a save/load round trip (.npy memory-mapped, and .npz), for
+	#the full problem and for one with vector variables (routes)
+	table_directory_path = tempfile.mkdtemp()
+	for table_solution in [solved_solution, routes_solution]:
+		table = solution_table(table_solution)
+		for file_name in ["solution.npy", "solution.npz"]:
+			table_file_path = os.path.join(table_directory_path, file_name)
+			save_table(table_file_path, table)
+			loaded_table = load_table(table_file_path)
+			assert (loaded_table.units, loaded_table.names) == (table.units, table.names)
+			for column in table.units:
+				assert np.array_equal(loaded_table.column(column), table.column(column))
+
+	table = solution_table(solved_solution)
+	for key, variable in [("MTOM_OnDemandAircraft", problem.aircraft.MTOM), ("cost_per_trip_per_passenger_OnDemandMissionCost", problem.mission_cost.cptpp)]:
+		assert np.allclose(getattr(table(key), "magnitude", table(key)), getattr(solved_solution(variable), "magnitude", solved_solution(variable)))
+	assert np.shape(solution_table(routes_solution)("cost_per_trip_route_OnDemandRouteDistributionCost")) == (3,)
+
+	#Solution results: every standard quantity is available as an attribute, with the same value as the solution lookup of its variable
+	results         = solution_results(solved_solution)
+	solution_values = dict((key_string(varkey), value) for varkey, value in solved_solution["variables"].items())
+	for name, key in standard_quantities.items():
+		value          = getattr(results, name)
+		solution_value = solution_values[key]
+		assert np.allclose(getattr(value, "magnitude", value), getattr(solution_value, "magnitude", solution_value))
+	assert np.allclose(results.MTOM.to(ureg.kg).magnitude, solved_solution(problem.aircraft.MTOM).to(ureg.kg).magnitude)
 
 if __name__=="__main__":
 
@@ -1,123 +1,229 @@
 # Functions for rotor noise prediction
 from __future__ import print_function
+import os
 import numpy as np
 import math
 pi = math.pi
 
+from collections         import OrderedDict
 from scipy.special       import jv
 from gpkit               import Model, ureg
 from matplotlib          import pyplot as plt
 from aircraft_models     import OnDemandAircraft
 from mission_models      import OnDemandSizingMission, OnDemandRevenueMission, OnDemandDeadheadMission
 from cost_models         import OnDemandMissionCost
-from standard_atmosphere import stdatmo
+from standard_atmosphere import stdatmo, write_file
+from solution_store      import SolutionTable, SolutionResults, solution_table
+
+# Vortex-noise spectrum shape: band frequencies (relative to the peak frequency) and SPL offsets from the overall SPL
+vortex_spectrum_fr         = np.array([0.5,  1,    2,    4,    8,     16   ])
+vortex_spectrum_offsets_dB = np.array([7.92, 4.17, 8.33, 8.75, 12.92, 13.33])
+
+# A-weighting lookup table: log-spaced frequency grid (Hz), persisted next to this file
+A_weighting_table_file_path = os.path.abspath(os.path.dirname(__file__)) + "/A_weighting_table.npz"
+A_weighting_table_f_min     = 1.
+A_weighting_table_f_max     = 1e5
+A_weighting_table_num_pts   = 4001  # Interpolation error below 1e-4 dB
+
+# SI units of the noise-model inputs (see noise_input_quantities), as taken by rotational_noise_si and vortex_noise_si
+noise_input_units = OrderedDict([("T_perRotor", ureg.N),
+	("Q_perRotor", ureg.N*ureg.m),
+	("T_A",        ureg.N/ureg.m**2),
+	("v_tip",      ureg.m/ureg.s),
+	("omega",      ureg.rad/ureg.s),
+	("Cl_mean",    ureg.dimensionless),
+	("R",          ureg.m),
+	("s",          ureg.dimensionless),
+	("N",          ureg.dimensionless),
+	("B",          ureg.dimensionless),
+	("c_avg",      ureg.m),
+	("t_avg",      ureg.m),
+	("rho",        ureg.kg/ureg.m**3),
+	("a",          ureg.m/ureg.s)])
+
+# Units of the numeric cores' frequencies (built once: pint unit arithmetic costs tens of microseconds per operation; quantities are built
+# with ureg.Quantity, which is much cheaper than multiplying an array by a unit)
+radian_per_second = ureg.rad/ureg.s
+hertz             = ureg.turn/ureg.s
 
 
 def rotational_noise(T_perRotor, Q_perRotor, R, omega, c_avg, t_avg, N, B, rho, a, theta=175*ureg.degree, delta_S=500*ureg.ft, num_harmonics=10, weighting="None"):
 
-	P_ref = 2e-5 * ureg.Pa  # Reference pressure
-	R_eff = 0.8  * R        # Effective rotor radius
+	f_fundamental, SPL, spectrum = rotational_noise_batch(T_perRotor, Q_perRotor, R, omega, c_avg, t_avg, N, B, rho, a, theta=theta, delta_S=delta_S,
+		num_harmonics=num_harmonics, weighting=weighting)
 
-	omega = omega.to(ureg.radian / ureg.s)
+	spectrum["m"] = range(1, num_harmonics+1, 1)
+	return f_fundamental, float(SPL), spectrum
 
-	spectrum = {}
-	spectrum["m"]   = range(1, num_harmonics+1, 1)
-	spectrum["f"]   = np.zeros(num_harmonics) * ureg.rad/ureg.s
-	spectrum["SPL"] = np.zeros(num_harmonics)
 
-	p_ratio_squared = np.zeros(num_harmonics)
+def rotational_noise_batch(T_perRotor, Q_perRotor, R, omega, c_avg, t_avg, N, B, rho, a, theta=175*ureg.degree, delta_S=500*ureg.ft, num_harmonics=10, harmonics=None, weighting="None"):
+
+	# Vectorized rotational_noise. All inputs are broadcast against each other, and the harmonics form a trailing axis.
+	# E.g. theta[:,np.newaxis] and delta_S[np.newaxis,:] give SPL on the full (theta x delta_S) grid; spectrum["SPL"] is (theta x delta_S x harmonic).
+	# Units are converted once, at the boundary; the computation itself is rotational_noise_si.
+	units = noise_input_units
+	f_fundamental, SPL, spectrum = rotational_noise_si(magnitude(T_perRotor, units["T_perRotor"]), magnitude(Q_perRotor, units["Q_perRotor"]),
+		magnitude(R, units["R"]), magnitude(omega, units["omega"]), magnitude(c_avg, units["c_avg"]), magnitude(t_avg, units["t_avg"]),
+		magnitude(N, units["N"]), magnitude(B, units["B"]), magnitude(rho, units["rho"]), magnitude(a, units["a"]), theta=magnitude(theta, ureg.rad),
+		delta_S=magnitude(delta_S, ureg.m), num_harmonics=num_harmonics, harmonics=harmonics, weighting=weighting)
+
+	spectrum["f"] = ureg.Quantity(spectrum["f"], radian_per_second)
+
+	f_fundamental = spectrum["f"][..., 0]
+	return f_fundamental, SPL, spectrum
+
+
+def rotational_noise_si(T_perRotor, Q_perRotor, R, omega, c_avg, t_avg, N, B, rho, a, theta=175*pi/180, delta_S=152.4, num_harmonics=10, harmonics=None, weighting="None"):
+
+	# Numeric core of the rotational noise model. Inputs are plain floats or arrays in SI units (N, N*m, m, rad/s, m, m, -, -, kg/m^3, m/s,
+	# rad, m), broadcast as in rotational_noise_batch. Frequencies are returned in rad/s.
+	if harmonics is None:
+		harmonics = np.arange(1, num_harmonics+1)
 
-	#Compute unweighted spectrum
-	for i, m in enumerate(spectrum["m"]):
-		spectrum["f"][i] = m*B*omega
+	P_ref = 2e-5                                   # Reference pressure (Pa)
+	m     = np.asarray(harmonics, dtype=np.float64)
 
-		bessel_argument = ((m*B*omega/a) * R_eff * np.sin(theta)).to(ureg.dimensionless)
-		bessel_term     = jv(m*B, bessel_argument)
+	T_perRotor = np.asarray(T_perRotor, dtype=np.float64)[..., np.newaxis]
+	Q_perRotor = np.asarray(Q_perRotor, dtype=np.float64)[..., np.newaxis]
+	R_eff      = 0.8 * np.asarray(R, dtype=np.float64)[..., np.newaxis]  # Effective rotor radius
+	omega      = np.asarray(omega, dtype=np.float64)[..., np.newaxis]
+	c_avg      = np.asarray(c_avg, dtype=np.float64)[..., np.newaxis]
+	t_avg      = np.asarray(t_avg, dtype=np.float64)[..., np.newaxis]
+	N          = np.asarray(N, dtype=np.float64)[..., np.newaxis]
+	B          = np.asarray(B, dtype=np.float64)[..., np.newaxis]
+	rho        = np.asarray(rho, dtype=np.float64)[..., np.newaxis]
+	a          = np.asarray(a, dtype=np.float64)[..., np.newaxis]
+	theta      = np.asarray(theta, dtype=np.float64)[..., np.newaxis]
+	delta_S    = np.asarray(delta_S, dtype=np.float64)[..., np.newaxis]
 
-		#RMS acoustic pressures
-		P_mL = ((m*B*omega)/(2*np.sqrt(2)*pi*a*delta_S)) * (T_perRotor*np.cos(theta) - (Q_perRotor*a)/(omega*R_eff**2)) * bessel_term  # Loading pressure
-		P_mT = ((-rho * ((m*B*omega)**2) * B)/(3*np.sqrt(2)*pi*delta_S)) * c_avg * t_avg * R_eff * bessel_term                         # Thickness pressure
+	mBomega = m*B*omega
 
-		p_ratio_squared[i] = N   * ((P_mL/P_ref)**2 + (P_mT/P_ref)**2)
-		spectrum["SPL"][i] = 10. * np.log10(p_ratio_squared[i])
+	bessel_argument = (mBomega/a) * R_eff * np.sin(theta)
+	bessel_term     = jv(m*B, bessel_argument)
+
+	#RMS acoustic pressures
+	P_mL = (mBomega/(2*np.sqrt(2)*pi*a*delta_S)) * (T_perRotor*np.cos(theta) - (Q_perRotor*a)/(omega*R_eff**2)) * bessel_term  # Loading pressure
+	P_mT = ((-rho * (mBomega**2) * B)/(3*np.sqrt(2)*pi*delta_S)) * c_avg * t_avg * R_eff * bessel_term                         # Thickness pressure
+
+	spectrum = {}
+	spectrum["m"]   = m
+	spectrum["f"]   = mBomega
+	spectrum["SPL"] = 10. * np.log10(N * ((P_mL/P_ref)**2 + (P_mT/P_ref)**2))
 
 	#Apply weighting schemes
 	if weighting == "None":
 		pass
 	elif weighting == "A":
-		spectrum["SPL"] = noise_weighting(spectrum["f"], spectrum["SPL"], weighting="A")
+		spectrum["SPL"] = spectrum["SPL"] + A_weighting(mBomega/(2*pi))
 	else:
 		error_string = "Noise weighting scheme " + weighting + " not recognized."
 		raise AttributeError(error_string)
 
 	#Calculate overall SPL
-	p_ratio_squared_sum = 0
-	for i,SPL in enumerate(spectrum["SPL"]):
-		p_ratio_squared_sum += 10**(SPL/10)
-
-	SPL = 10*np.log10(p_ratio_squared_sum)
+	SPL = 10*np.log10(np.sum(10**(spectrum["SPL"]/10), axis=-1))
 
-	f_fundamental = spectrum["f"][0]
+	f_fundamental = spectrum["f"][..., 0]
 	return f_fundamental, SPL, spectrum
 
 
 def vortex_noise(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S=500*ureg.ft, St=0.28, weighting="None"):
 
-	k2 = 1.206e-2 * ureg.s**3/ureg.ft**3
+	f_peak, SPL, SPL_A, spectrum = vortex_noise_batch(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S=delta_S, St=St)
+
+	spectrum["f"] = ureg.Quantity(2*pi*spectrum["f"].magnitude, radian_per_second)
+
+	if weighting == "A":
+		spectrum["SPL"] = spectrum["SPL_A"]
+		SPL             = SPL_A
+	del spectrum["SPL_A"]
+
+	return f_peak, float(SPL), spectrum
+
+
+def vortex_noise_batch(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S=500*ureg.ft, St=0.28):
+
+	# Vectorized vortex_noise (e.g. over the points of a gpkit sweep). All inputs are broadcast against each other.
+	# Returns both the unweighted and the A-weighted SPL; the spectrum bands form a trailing axis of spectrum["f"], spectrum["SPL"] and spectrum["SPL_A"].
+	# Units are converted once, at the boundary; the computation itself is vortex_noise_si.
+	units = noise_input_units
+	f_peak, SPL, SPL_A, spectrum = vortex_noise_si(magnitude(T_perRotor, units["T_perRotor"]), magnitude(T_A, units["T_A"]),
+		magnitude(V_tip, units["v_tip"]), magnitude(s, units["s"]), magnitude(Cl_mean, units["Cl_mean"]), magnitude(N, units["N"]),
+		magnitude(c_avg, units["c_avg"]), magnitude(t_avg, units["t_avg"]), magnitude(rho, units["rho"]), delta_S=magnitude(delta_S, ureg.m), St=St)
+
+	spectrum["f"] = ureg.Quantity(spectrum["f"], hertz)
+	f_peak        = ureg.Quantity(2*pi*f_peak, radian_per_second)
+
+	return f_peak, SPL, SPL_A, spectrum
+
+
+def vortex_noise_si(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S=152.4, St=0.28):
+
+	# Numeric core of the vortex noise model. Inputs are plain floats or arrays in SI units (N, N/m^2, m/s, -, -, -, m, m, kg/m^3, m),
+	# broadcast as in vortex_noise_batch. Frequencies are returned in Hz.
+	k2 = 1.206e-2 / 0.3048**3  # s^3/m^3 (1.206e-2 s^3/ft^3)
+
+	T_perRotor = np.asarray(T_perRotor, dtype=np.float64)
+	T_A        = np.asarray(T_A, dtype=np.float64)
+	V_tip      = np.asarray(V_tip, dtype=np.float64)
+	s          = np.asarray(s, dtype=np.float64)
+	Cl_mean    = np.asarray(Cl_mean, dtype=np.float64)
+	N          = np.asarray(N, dtype=np.float64)
+	c_avg      = np.asarray(c_avg, dtype=np.float64)
+	t_avg      = np.asarray(t_avg, dtype=np.float64)
+	rho        = np.asarray(rho, dtype=np.float64)
+	delta_S    = np.asarray(delta_S, dtype=np.float64)
 
 	V_07   = 0.7 * V_tip
 	alpha  = Cl_mean / (2*pi)                           # Angle of attack (average)
 	t_proj = t_avg*np.cos(alpha) + c_avg*np.sin(alpha)  # Blade projected thickness
 
-	f_peak = (St*V_07/t_proj) * ureg.turn  # Peak frequency
-	f_peak = f_peak.to(ureg.rad/ureg.s)    # Convert to rad/s
+	f_peak = St*V_07/t_proj  # Peak frequency (Hz)
 
 	p_ratio = k2 * (V_tip/(rho*delta_S))*np.sqrt((T_perRotor*N/s)*(T_A))
 	SPL     = 20 * np.log10(p_ratio)
 
 	spectrum = {}
-	spectrum["f"] = f_peak * [0.5,  1,    2,    4,    8,     16   ]
-	offsets_dB    =          [7.92, 4.17, 8.33, 8.75, 12.92, 13.33]
+	spectrum["f"]     = f_peak[..., np.newaxis] * vortex_spectrum_fr
+	spectrum["SPL"]   = SPL[..., np.newaxis] - vortex_spectrum_offsets_dB
+	spectrum["SPL_A"] = spectrum["SPL"] + A_weighting(spectrum["f"])
 
-	spectrum["SPL"] = SPL*np.ones(np.shape(offsets_dB)) - offsets_dB
+	SPL_A = integrate_band_spectrum(vortex_spectrum_fr, spectrum["SPL_A"])
 
-	if weighting == "A":
+	return f_peak, SPL, SPL_A, spectrum
 
-		#Apply A-weighting to the spectrum
-		spectrum["SPL"] = noise_weighting(spectrum["f"], spectrum["SPL"], weighting="A")
 
-		fr = (spectrum["f"]/f_peak).to(ureg.dimensionless)  # Frequency ratio array
+def integrate_band_spectrum(fr, SPL):
 
-		# Interpolate in log-space
-		weighted_p_ratio_squared = 0
-		for i in range(0,np.size(fr)-1):
-			fr1 = fr[i]
-			fr2 = fr[i+1]
-			SPL1 = spectrum["SPL"][i]
-			SPL2 = spectrum["SPL"][i+1]
+	# Overall SPL of a band spectrum, interpolated linearly in log-space between bands and integrated over frequency ratio.
+	# fr: band frequency ratios (1-D); SPL: band SPLs, with the bands as the trailing axis (e.g. design x band).
+	fr     = np.asarray(fr, dtype=np.float64)
+	log_fr = np.log10(fr)
+	SPL    = np.asarray(SPL, dtype=np.float64)
 
-			a = (SPL2-SPL1)/(np.log10(fr2)-np.log10(fr1))
-			b = SPL2 - a*np.log10(fr2)
+	fr1  = fr[:-1]
+	fr2  = fr[1:]
+	SPL1 = SPL[..., :-1]
+	SPL2 = SPL[..., 1:]
 
-			leading_term = (10**(b/10))/((a/10) + 1)
-			fr_term      = fr2**((a/10) + 1) - fr1**((a/10) + 1)
+	a = (SPL2-SPL1)/(log_fr[1:]-log_fr[:-1])
+	b = SPL2 - a*log_fr[1:]
 
-			weighted_p_ratio_squared += leading_term*fr_term
+	# Band integral of 10**(b/10) * fr**(a/10). Where a/10 + 1 == 0, the integrand is ~1/fr and integrates to a logarithm.
+	exponent = (a/10) + 1
+	singular = np.abs(exponent) < 1e-9
+	exponent = np.where(singular, 1., exponent)
 
-		SPL = 10*np.log10(weighted_p_ratio_squared)
+	leading_term = 10**(b/10)
+	fr_term      = np.where(singular, np.log(fr2/fr1), (fr2**exponent - fr1**exponent)/exponent)
 
-	return f_peak, SPL, spectrum
+	return 10*np.log10(np.sum(leading_term*fr_term, axis=-1))
 
 
 def noise_weighting(f, SPL, weighting="A"):
 
 	# Noise weighting function. Currently, only A-weighting is implemented.
 	if weighting == "A":
-		f           = f.to(ureg.turn/ureg.s).magnitude
-		numerator   = 12194**2*f**4
-		denominator = (f**2+20.6**2)*(f**2+12194**2)*np.sqrt((f**2+107.7**2)*(f**2+737.9**2))
-		R           = numerator / denominator
-		weight      = 20*np.log10(R) + 2.00
+		weight = A_weighting(f.to(ureg.turn/ureg.s).magnitude)
 
 	else:
 		error_string = "Noise weighting scheme " + weighting + " not recognized."
@@ -127,6 +233,315 @@ def noise_weighting(f, SPL, weighting="A"):
 	return dBA
 
 
+def A_weighting(f):
+
+	# A-weighting response (dB). Frequency in Hz (float or array).
+	numerator   = 12194**2*f**4
+	denominator = (f**2+20.6**2)*(f**2+12194**2)*np.sqrt((f**2+107.7**2)*(f**2+737.9**2))
+	R           = numerator / denominator
+	weight      = 20*np.log10(R) + 2.00
+
+	return weight
+
+
+class AWeightingTable(object):
+
+	# A-weighting response and integrated vortex-noise dBA offset, tabulated against log10(frequency). Built once; see A_weighting_table().
+	def __init__(self, file_path=A_weighting_table_file_path):
+
+		grid_parameters = np.array([A_weighting_table_f_min, A_weighting_table_f_max, A_weighting_table_num_pts])
+		grid_parameters = np.concatenate([grid_parameters, vortex_spectrum_fr, vortex_spectrum_offsets_dB])
+
+		self.values = {}
+		if file_path is not None and os.path.isfile(file_path):
+			try:
+				with np.load(file_path) as data:
+					if np.array_equal(data["grid_parameters"], grid_parameters):
+						self.log_f                       = data["log_f"]
+						self.values["A_weighting"]       = data["A_weighting"]
+						self.values["vortex_dBA_offset"] = data["vortex_dBA_offset"]
+			except (IOError, OSError, ValueError, KeyError):
+				self.values = {}  # Unreadable or corrupt (e.g. truncated) table; it is rebuilt
+
+		if not self.values:
+			self.log_f                       = np.linspace(np.log10(A_weighting_table_f_min), np.log10(A_weighting_table_f_max), A_weighting_table_num_pts)
+			self.values["A_weighting"]       = A_weighting(10**self.log_f)
+			self.values["vortex_dBA_offset"] = exact_vortex_dBA_offset(10**self.log_f)
+
+			if file_path is not None:
+				# Read-only install: the table is rebuilt on every process start
+				write_file(file_path, lambda table_file: np.savez(table_file, grid_parameters=grid_parameters, log_f=self.log_f, **self.values))
+
+		self.delta_log_f = (self.log_f[-1] - self.log_f[0]) / (np.size(self.log_f) - 1)  # Uniform grid: index computed directly
+		self.slopes      = {}
+		for key in self.values:
+			self.slopes[key] = np.diff(self.values[key])
+
+	def interpolate(self, f, key, exact_function):
+
+		f = np.asarray(f, dtype=np.float64)
+		x = (np.log10(f) - self.log_f[0]) / self.delta_log_f
+		i = np.clip(x.astype(np.intp), 0, np.size(self.log_f) - 2)
+
+		output = self.values[key][i] + (x - i)*self.slopes[key][i]
+
+		# Frequencies outside the table are computed exactly
+		outside = (x < 0) | (x > np.size(self.log_f) - 1)
+		if np.any(outside):
+			output = np.where(outside, exact_function(np.where(outside, f, 10**self.log_f[0])), output)
+
+		return output
+
+
+_A_weighting_table = None
+
+def A_weighting_table():
+
+	# Process-wide cached table, lazy-loaded on first use
+	global _A_weighting_table
+	if _A_weighting_table is None:
+		_A_weighting_table = AWeightingTable()
+	return _A_weighting_table
+
+
+def A_weighting_fast(f):
+
+	# Tabulated A_weighting. Frequency in Hz (float or array).
+	table = A_weighting_table()
+	return table.interpolate(f, "A_weighting", A_weighting)
+
+
+def exact_vortex_dBA_offset(f_peak):
+
+	# A-weighted minus unweighted vortex SPL, as a function of peak frequency (Hz)
+	f_peak       = np.asarray(f_peak, dtype=np.float64)
+	SPL_spectrum = -vortex_spectrum_offsets_dB + A_weighting(f_peak[..., np.newaxis]*vortex_spectrum_fr)
+
+	return integrate_band_spectrum(vortex_spectrum_fr, SPL_spectrum)
+
+
+def vortex_dBA_offset(f_peak):
+
+	# Tabulated exact_vortex_dBA_offset, for tight sweep loops: SPL_A = SPL + vortex_dBA_offset(f_peak).
+	# Peak frequency in Hz (float or array), or a pint quantity.
+	table = A_weighting_table()
+	return table.interpolate(magnitude(f_peak, ureg.turn/ureg.s), "vortex_dBA_offset", exact_vortex_dBA_offset)
+
+
+def noise_input_quantities(mission="OnDemandSizingMission", segment="HoverTakeoff"):
+
+	# Rotor and atmosphere inputs of the noise models for one hover segment (attribute name -> solution variable)
+	performance = "_" + mission + "/" + segment + "/OnDemandAircraftHoverPerformance/RotorsPerformance"
+	atmosphere  = "_" + mission + "/" + segment + "/HoverFlightState/FixedStandardAtmosphere"
+
+	return OrderedDict([("T_perRotor", "T_perRotor" + performance),
+		("Q_perRotor", "Q_perRotor" + performance),
+		("T_A",        "T/A" + performance),
+		("v_tip",      "v_{tip}" + performance),
+		("omega",      "\\omega" + performance),
+		("Cl_mean",    "Cl_{mean}" + performance),
+		("R",          "R_OnDemandAircraft/Rotors"),
+		("s",          "s_OnDemandAircraft/Rotors"),
+		("N",          "N_OnDemandAircraft/Rotors"),
+		("B",          "B_OnDemandAircraft/Rotors"),
+		("c_avg",      "c_{avg}_OnDemandAircraft/Rotors"),
+		("t_avg",      "t_{avg}_OnDemandAircraft/Rotors"),
+		("rho",        "\\rho" + atmosphere),
+		("a",          "a" + atmosphere)])
+
+
+class NoiseInputs(object):
+
+	# Noise-model inputs given directly (e.g. a hypothetical hover state), with the same attributes as noise_input_quantities()
+	def __init__(self, **values):
+		self.__dict__.update(values)
+
+
+def noise_inputs(solution, mission="OnDemandSizingMission", segment="HoverTakeoff"):
+
+	# Extracted once; pass the returned object to solution_noise() to reuse the inputs (e.g. for several observer positions)
+	if isinstance(solution, (SolutionResults, NoiseInputs)):
+		return solution
+
+	table = solution if isinstance(solution, SolutionTable) else solution_table(solution)
+	return SolutionResults(table, noise_input_quantities(mission, segment))
+
+
+def solution_noise(solution, mission="OnDemandSizingMission", segment="HoverTakeoff", theta=175*ureg.degree, delta_S=500*ureg.ft, St=0.28, num_harmonics=10):
+
+	# Rotational, vortex and total noise (unweighted and A-weighted) of a solution, in one vectorized pass over all of its points.
+	# solution: gpkit solution (scalar or sweep), SolutionTable or the SolutionResults returned by noise_inputs().
+	# theta and delta_S are broadcast against the solution points (rotational noise); vortex noise depends on delta_S only.
+	inputs = noise_inputs(solution, mission, segment)
+
+	noise = {"rotational":{}, "vortex":{}, "total":{}}
+
+	f_fund, SPL, spectrum = rotational_noise_batch(inputs.T_perRotor, inputs.Q_perRotor, inputs.R, inputs.omega, inputs.c_avg, inputs.t_avg,
+		inputs.N, inputs.B, inputs.rho, inputs.a, theta=theta, delta_S=delta_S, num_harmonics=num_harmonics, weighting="None")
+
+	# A-weighting applied to the same harmonic spectrum
+	SPL_A = 10*np.log10(np.sum(10**((spectrum["SPL"] + A_weighting(spectrum["f"].to(ureg.turn/ureg.s).magnitude))/10), axis=-1))
+
+	noise["rotational"]["f_fund"]   = f_fund
+	noise["rotational"]["SPL"]      = SPL
+	noise["rotational"]["SPL_A"]    = SPL_A
+	noise["rotational"]["spectrum"] = spectrum
+
+	f_peak, SPL, SPL_A, spectrum = vortex_noise_batch(inputs.T_perRotor, inputs.T_A, inputs.v_tip, inputs.s, inputs.Cl_mean, inputs.N,
+		inputs.c_avg, inputs.t_avg, inputs.rho, delta_S=delta_S, St=St)
+
+	noise["vortex"]["f_peak"]   = f_peak
+	noise["vortex"]["SPL"]      = SPL
+	noise["vortex"]["SPL_A"]    = SPL_A
+	noise["vortex"]["spectrum"] = spectrum
+
+	# Incoherent sum of the two sources
+	for key in ["SPL", "SPL_A"]:
+		noise["total"][key] = 10*np.log10(10**(noise["rotational"][key]/10) + 10**(noise["vortex"][key]/10))
+
+	return noise
+
+
+def noise_footprint(solution, x, y, h=500*ureg.ft, mission="OnDemandSizingMission", segment="HoverTakeoff", St=0.28, num_harmonics=10, chunk_size=2**15):
+
+	# A-weighted SPL (rotational, vortex and total) on the ground grid x by y, for an aircraft hovering at height h above the origin.
+	# solution: scalar gpkit solution, SolutionTable, or the object returned by noise_inputs().
+	# Returns 2-D arrays of shape (len(y), len(x)). Cells are evaluated chunk_size at a time, bounding the size of the harmonic spectra.
+	inputs = noise_inputs(solution, mission, segment)
+
+	x = np.asarray(magnitude(x, ureg.m), dtype=np.float64)
+	y = np.asarray(magnitude(y, ureg.m), dtype=np.float64)
+	h = magnitude(h, ureg.m)
+
+	r = np.hypot(x[np.newaxis, :], y[:, np.newaxis]).ravel()  # Horizontal distance from the point below the aircraft
+
+	footprint = {}
+	for key in ["rotational", "vortex", "total"]:
+		footprint[key] = np.zeros(np.size(r))
+
+	for start in range(0, np.size(r), chunk_size):
+		r_chunk = r[start:start + chunk_size]
+		theta   = pi - np.arctan2(r_chunk, h)  # Angle from the rotor axis (rad); 180 degrees directly below the aircraft
+		delta_S = np.hypot(h, r_chunk)         # Distance from the aircraft (m)
+
+		with np.errstate(divide="ignore"):  # Rotational noise vanishes (-inf dB) directly below the rotor axis
+			noise = solution_noise(inputs, theta=theta, delta_S=delta_S, St=St, num_harmonics=num_harmonics)
+		for key in footprint:
+			footprint[key][start:start + chunk_size] = noise[key]["SPL_A"]
+
+	for key in footprint:
+		footprint[key] = footprint[key].reshape(np.size(y), np.size(x))
+
+	return footprint
+
+
+class LabeledArray(object):
+
+	# N-D array with named axes and their coordinates (a plain-NumPy stand-in for an xarray DataArray), e.g.
+	# cube.dims == ("config", "B", "theta", "delta_S") and cube.coords["B"] == array([2, 3, ...]).
+	def __init__(self, values, dims, coords):
+
+		self.values = values
+		self.dims   = tuple(dims)
+		self.coords = OrderedDict((dim, coords[dim]) for dim in self.dims)
+
+	@property
+	def shape(self):
+		return np.shape(self.values)
+
+	def axis(self, dim):
+		return self.dims.index(dim)
+
+	def sel(self, **labels):
+
+		# Values at the given coordinates, e.g. cube.sel(config="Tilt rotor", B=5). Numeric coordinates are matched to the nearest
+		# grid value; the selected axes are dropped (a plain value is returned once every axis is selected).
+		idx = []
+		for dim in self.dims:
+			if dim not in labels:
+				idx.append(slice(None))
+				continue
+
+			coords = self.coords[dim]
+			if isinstance(labels[dim], str):
+				idx.append(list(coords).index(labels[dim]))
+			else:
+				label = magnitude(labels[dim], coords.units) if hasattr(coords, "units") else labels[dim]
+				idx.append(int(np.argmin(np.abs(np.asarray(getattr(coords, "magnitude", coords), dtype=np.float64) - label))))
+
+		dims = [dim for dim in self.dims if dim not in labels]
+		if not dims:
+			return self.values[tuple(idx)]
+		return LabeledArray(self.values[tuple(idx)], dims, self.coords)
+
+
+def blade_count_noise_study(solutions, B, theta, delta_S, mission="OnDemandSizingMission", segment="HoverTakeoff", St=0.28, num_harmonics=10,
+	weighting="A"):
+
+	# Rotational, vortex and total noise of every configuration over the full (config x B x theta x delta_S) grid, in one broadcast call.
+	# solutions: dictionary of configuration name to solution (scalar gpkit solution, SolutionTable or noise_inputs() object), or a list.
+	# Blade count is varied at constant solidity and thickness-to-chord ratio: blade chord and thickness scale as B_solved/B.
+	# Returns a dictionary of LabeledArrays of SPL (A-weighted unless weighting == "None"), with dims ("config", "B", "theta", "delta_S").
+	if not hasattr(solutions, "keys"):
+		solutions = OrderedDict(enumerate(solutions))
+
+	config_inputs = [noise_inputs(solution, mission, segment) for solution in solutions.values()]
+
+	inputs = {}
+	for name, units in noise_input_units.items():
+		inputs[name] = np.array([magnitude(getattr(config_input, name), units) for config_input in config_inputs], dtype=np.float64).reshape(-1, 1, 1, 1)
+
+	B_grid       = np.asarray(B, dtype=np.float64).reshape(1, -1, 1, 1)
+	theta_grid   = np.asarray(magnitude(theta, ureg.rad), dtype=np.float64).reshape(1, 1, -1, 1)
+	delta_S_grid = np.asarray(magnitude(delta_S, ureg.m), dtype=np.float64).reshape(1, 1, 1, -1)
+
+	chord_scaling = inputs["B"]/B_grid
+	c_avg         = inputs["c_avg"]*chord_scaling
+	t_avg         = inputs["t_avg"]*chord_scaling
+
+	f_fund, SPL_rotational, spectrum = rotational_noise_si(inputs["T_perRotor"], inputs["Q_perRotor"], inputs["R"], inputs["omega"], c_avg, t_avg,
+		inputs["N"], B_grid, inputs["rho"], inputs["a"], theta=theta_grid, delta_S=delta_S_grid, num_harmonics=num_harmonics, weighting=weighting)
+
+	f_peak, SPL_vortex, SPL_A_vortex, spectrum = vortex_noise_si(inputs["T_perRotor"], inputs["T_A"], inputs["v_tip"], inputs["s"], inputs["Cl_mean"],
+		inputs["N"], c_avg, t_avg, inputs["rho"], delta_S=delta_S_grid, St=St)
+	if weighting == "A":
+		SPL_vortex = SPL_A_vortex
+
+	shape      = np.broadcast(SPL_rotational, SPL_vortex).shape
+	SPL_vortex = np.broadcast_to(SPL_vortex, shape)  # Independent of theta
+
+	dims   = ("config", "B", "theta", "delta_S")
+	coords = {"config": list(solutions.keys()), "B": B_grid.ravel(), "theta": theta_grid.ravel()*ureg.rad, "delta_S": delta_S_grid.ravel()*ureg.m}
+
+	study = {}
+	study["rotational"] = LabeledArray(SPL_rotational, dims, coords)
+	study["vortex"]     = LabeledArray(SPL_vortex,     dims, coords)
+	study["total"]      = LabeledArray(10*np.log10(10**(SPL_rotational/10) + 10**(SPL_vortex/10)), dims, coords)
+
+	return study
+
+
+def magnitude(x, units):
+
+	# Magnitude of x in the given units. Plain numbers are assumed to be in those units already.
+	# Conversion factors are computed once, and cached (a pint conversion costs tens of microseconds); conversions with an offset
+	# (e.g. degC to K) are not a factor, and go through pint every time.
+	if not hasattr(x, "to"):
+		return x
+
+	key = (x.units, units)
+	if key not in _conversion_factors:
+		offset = ureg.Quantity(0., x.units).to(units).magnitude
+		_conversion_factors[key] = ureg.Quantity(1., x.units).to(units).magnitude if offset == 0 else None
+
+	factor = _conversion_factors[key]
+	if factor is None:
+		return x.to(units).magnitude
+	return x.magnitude*factor
+
+_conversion_factors = {}
+
+
 if __name__=="__main__":
 
 	config = "Lift + cruise"
@@ -0,0 +1,226 @@
+# Test case
+
+import os
+import stat
+import tempfile
+import numpy as np
+from collections   import OrderedDict
+from gpkit        import ureg
+from noise_models import rotational_noise, rotational_noise_batch, rotational_noise_si, vortex_noise, vortex_noise_batch, vortex_noise_si, integrate_band_spectrum
+from noise_models import AWeightingTable, A_weighting, A_weighting_fast, vortex_dBA_offset, exact_vortex_dBA_offset
+from noise_models import noise_input_quantities, noise_inputs, solution_noise, noise_footprint, NoiseInputs, blade_count_noise_study
+from solution_store import SolutionTable
+
+# Representative hover state (no solve required)
+rotor_data = {}
+rotor_data["T_perRotor"] = 1500.  * ureg.N
+rotor_data["Q_perRotor"] = 150.   * ureg.N * ureg.m
+rotor_data["R"]          = 1.5    * ureg.m
+rotor_data["omega"]      = 1100.  * ureg.rpm
+rotor_data["c_avg"]      = 0.1    * ureg.m
+rotor_data["t_avg"]      = 1.2    * ureg.cm
+rotor_data["N"]          = 8.
+rotor_data["B"]          = 5.
+rotor_data["rho"]        = 1.225  * ureg.kg / ureg.m**3
+rotor_data["a"]          = 340.29 * ureg.m / ureg.s
+rotor_data["T_A"]        = 15.    * ureg.lbf / ureg.ft**2
+rotor_data["V_tip"]      = 170.   * ureg.m / ureg.s
+rotor_data["s"]          = 0.1
+rotor_data["Cl_mean"]    = 0.9
+
+def rotational_args(d):
+	return [d["T_perRotor"], d["Q_perRotor"], d["R"], d["omega"], d["c_avg"], d["t_avg"], d["N"], d["B"], d["rho"], d["a"]]
+
+def vortex_args(d):
+	return [d["T_perRotor"], d["T_A"], d["V_tip"], d["s"], d["Cl_mean"], d["N"], d["c_avg"], d["t_avg"], d["rho"]]
+
+def rotor_table(rotor_data_list):
+
+	# Solution table with the noise-model inputs of each hover state (one row per state)
+	quantities = noise_input_quantities()
+
+	data  = np.zeros(len(rotor_data_list), dtype=[(column, np.float64) for column in quantities.values()])
+	units = {}
+	for name, column in quantities.items():
+		values = [d["V_tip" if name == "v_tip" else name] for d in rotor_data_list]
+		units[column] = str(values[0].units) if hasattr(values[0], "units") else ""
+		data[column]  = [value.magnitude if hasattr(value, "magnitude") else value for value in values]
+
+	return SolutionTable(data, units, dict((column, column) for column in quantities.values()), sweep=True)
+
+def test():
+
+	theta_array   = np.linspace(91, 175, 7)          * ureg.degree
+	delta_S_array = np.array([100., 500., 2000.]) * ureg.ft
+
+	# Batched rotational noise matches the scalar function over the (theta x delta_S x harmonic) tensor
+	for weighting in ["None", "A"]:
+
+		f_fund, SPL, spectrum = rotational_noise_batch(*rotational_args(rotor_data), theta=theta_array[:,np.newaxis], delta_S=delta_S_array[np.newaxis,:], num_harmonics=10, weighting=weighting)
+		assert np.shape(SPL) == (7, 3)
+		assert np.shape(spectrum["SPL"]) == (7, 3, 10)
+
+		for i, theta in enumerate(theta_array):
+			for j, delta_S in enumerate(delta_S_array):
+				f_fund_scalar, SPL_scalar, spectrum_scalar = rotational_noise(*rotational_args(rotor_data), theta=theta, delta_S=delta_S, num_harmonics=10, weighting=weighting)
+
+				assert np.isclose(SPL[i,j], SPL_scalar, rtol=1e-12)
+				assert np.allclose(spectrum["SPL"][i,j], spectrum_scalar["SPL"], rtol=1e-12)
+				assert np.allclose(spectrum["f"].to(ureg.rad/ureg.s).magnitude, spectrum_scalar["f"].to(ureg.rad/ureg.s).magnitude, rtol=1e-12)
+				assert np.isclose(f_fund.to(ureg.rad/ureg.s).magnitude, f_fund_scalar.to(ureg.rad/ureg.s).magnitude, rtol=1e-12)
+
+	# Reference overall SPLs (dB) of the representative hover state, computed with the original per-harmonic pint implementation
+	rotational_reference = [(120, 300,  "None", 64.9898168604), (120, 300,  "A", 44.6790761949),
+		(175, 500,  "None", -35.3442259525), (175, 500,  "A", -55.7214082263),
+		(95,  2000, "None", 52.1993951606),  (95,  2000, "A", 32.1480404756)]
+	vortex_reference     = [(300,  "None", 75.5638706609), (300,  "A", 76.0430648928),
+		(500,  "None", 71.1268956686), (500,  "A", 71.6060899005),
+		(2000, "None", 59.0856958420), (2000, "A", 59.5648900739)]
+
+	for theta, delta_S, weighting, SPL_reference in rotational_reference:
+		SPL = rotational_noise(*rotational_args(rotor_data), theta=theta*ureg.degree, delta_S=delta_S*ureg.ft, num_harmonics=10, weighting=weighting)[1]
+		assert np.isclose(SPL, SPL_reference, rtol=0, atol=1e-8)
+
+	for delta_S, weighting, SPL_reference in vortex_reference:
+		f_peak, SPL, spectrum = vortex_noise(*vortex_args(rotor_data), delta_S=delta_S*ureg.ft, St=0.28, weighting=weighting)
+		assert np.isclose(SPL, SPL_reference, rtol=0, atol=1e-8)
+		assert np.isclose(f_peak.to(ureg.turn/ureg.s).magnitude, 1274.084177826075, rtol=1e-12)
+
+	# Numeric (SI) core matches the pint API
+	f_fund, SPL, spectrum = rotational_noise(*rotational_args(rotor_data), theta=120*ureg.degree, delta_S=300*ureg.ft, num_harmonics=10, weighting="A")
+	f_fund_si, SPL_si, spectrum_si = rotational_noise_si(1500., 150., 1.5, 1100.*2*np.pi/60, 0.1, 0.012, 8., 5., 1.225, 340.29, theta=120*np.pi/180,
+		delta_S=300*0.3048, num_harmonics=10, weighting="A")
+
+	assert np.isclose(SPL_si, SPL, rtol=1e-10)
+	assert np.allclose(spectrum_si["SPL"], spectrum["SPL"], rtol=1e-10)
+	assert np.isclose(f_fund_si, f_fund.to(ureg.rad/ureg.s).magnitude, rtol=1e-10)
+
+	f_peak, SPL_A, spectrum = vortex_noise(*vortex_args(rotor_data), delta_S=300*ureg.ft, St=0.28, weighting="A")
+	f_peak_si, SPL_si, SPL_A_si, spectrum_si = vortex_noise_si(1500., 15.*4.4482216152605/0.3048**2, 170., 0.1, 0.9, 8., 0.1, 0.012, 1.225,
+		delta_S=300*0.3048, St=0.28)
+
+	assert np.isclose(SPL_A_si, SPL_A, rtol=1e-10)
+	assert np.allclose(spectrum_si["SPL_A"], spectrum["SPL"], rtol=1e-10)
+	assert np.isclose(f_peak_si, f_peak.to(ureg.turn/ureg.s).magnitude, rtol=1e-10)
+
+	# Batched vortex noise matches the scalar function, point by point (e.g. a sweep over tip speed and disk loading)
+	sweep_data          = dict(rotor_data)
+	sweep_data["V_tip"] = np.linspace(120, 220, 5)  * ureg.m / ureg.s
+	sweep_data["T_A"]   = np.linspace(5, 20, 5)     * ureg.lbf / ureg.ft**2
+
+	f_peak, SPL, SPL_A, spectrum = vortex_noise_batch(*vortex_args(sweep_data), delta_S=500*ureg.ft, St=0.28)
+	assert np.shape(spectrum["SPL_A"]) == (5, 6)
+
+	for i in range(5):
+		point_data          = dict(rotor_data)
+		point_data["V_tip"] = sweep_data["V_tip"][i]
+		point_data["T_A"]   = sweep_data["T_A"][i]
+
+		f_peak_scalar, SPL_scalar,   spectrum_scalar = vortex_noise(*vortex_args(point_data), delta_S=500*ureg.ft, St=0.28, weighting="None")
+		f_peak_scalar, SPL_A_scalar, spectrum_scalar = vortex_noise(*vortex_args(point_data), delta_S=500*ureg.ft, St=0.28, weighting="A")
+
+		assert np.isclose(SPL[i],   SPL_scalar,   rtol=1e-12)
+		assert np.isclose(SPL_A[i], SPL_A_scalar, rtol=1e-12)
+		assert np.allclose(spectrum["SPL_A"][i], spectrum_scalar["SPL"], rtol=1e-12)
+		assert np.isclose(f_peak[i].to(ureg.rad/ureg.s).magnitude, f_peak_scalar.to(ureg.rad/ureg.s).magnitude, rtol=1e-12)
+
+	# Band integration matches quadrature, including bands where the integrand is ~1/fr (a/10 + 1 == 0)
+	fr        = np.array([0.5, 1., 2., 4.])
+	SPL_bands = np.array([[-3., 0., -5., -12.],
+		[0., -10*np.log10(2.), -20*np.log10(2.), -21.]])
+
+	for i in range(np.shape(SPL_bands)[0]):
+		fr_fine         = np.logspace(np.log10(fr[0]), np.log10(fr[-1]), 200001)
+		SPL_fine        = np.interp(np.log10(fr_fine), np.log10(fr), SPL_bands[i])
+		p_ratio_squared = 10**(SPL_fine/10)
+		SPL_quadrature  = 10*np.log10(np.sum(0.5*(p_ratio_squared[1:] + p_ratio_squared[:-1])*np.diff(fr_fine)))  # Trapezoidal rule
+
+		assert np.isclose(integrate_band_spectrum(fr, SPL_bands[i]), SPL_quadrature, atol=1e-6)
+
+	assert np.allclose(integrate_band_spectrum(fr, SPL_bands), [integrate_band_spectrum(fr, SPL) for SPL in SPL_bands])
+
+	# Tabulated A-weighting and vortex dBA offset match the exact functions (exact outside the table range)
+	f = np.logspace(-1, 6, 1001)
+
+	assert np.allclose(A_weighting_fast(f),  A_weighting(f),             atol=1e-4)
+	assert np.allclose(vortex_dBA_offset(f), exact_vortex_dBA_offset(f), atol=1e-4)
+	assert np.isclose(vortex_dBA_offset(f_peak[0]), SPL_A[0] - SPL[0], atol=1e-4)
+
+	# The table file is written with the usual permissions, and a truncated one is rebuilt
+	table_file_path = os.path.join(tempfile.mkdtemp(), "A_weighting_table.npz")
+	table           = AWeightingTable(table_file_path)
+	umask           = os.umask(0)
+	os.umask(umask)
+	assert stat.S_IMODE(os.stat(table_file_path).st_mode) == 0o666 & ~umask
+
+	with open(table_file_path, "wb") as table_file:
+		table_file.write(b"truncated")
+	rebuilt_table = AWeightingTable(table_file_path)
+	assert np.array_equal(rebuilt_table.values["A_weighting"], table.values["A_weighting"])
+	assert np.array_equal(AWeightingTable(table_file_path).log_f, table.log_f)
+
+	# Single-pass noise post-processing of a (two-point) solution matches the individual noise functions
+	rotor_data_list = [rotor_data, dict(rotor_data, T_perRotor=1800.*ureg.N, omega=1250.*ureg.rpm, V_tip=195.*ureg.m/ureg.s)]
+	inputs          = noise_inputs(rotor_table(rotor_data_list))
+	noise           = solution_noise(inputs, theta=120*ureg.degree, delta_S=300*ureg.ft)
+
+	for i, d in enumerate(rotor_data_list):
+		for key, weighting in [("SPL", "None"), ("SPL_A", "A")]:
+			SPL_rotational = rotational_noise(*rotational_args(d), theta=120*ureg.degree, delta_S=300*ureg.ft, num_harmonics=10, weighting=weighting)[1]
+			SPL_vortex     = vortex_noise(*vortex_args(d), delta_S=300*ureg.ft, St=0.28, weighting=weighting)[1]
+			SPL_total      = 10*np.log10(10**(SPL_rotational/10) + 10**(SPL_vortex/10))
+
+			assert np.isclose(noise["rotational"][key][i], SPL_rotational, rtol=1e-10)
+			assert np.isclose(noise["vortex"][key][i],     SPL_vortex,     rtol=1e-10)
+			assert np.isclose(noise["total"][key][i],      SPL_total,      rtol=1e-10)
+
+	# Ground noise footprint (evaluated in several chunks) matches the individual noise functions at the geometry of each cell
+	x_array   = np.linspace(-1000, 1000, 9) * ureg.ft
+	y_array   = np.linspace(0, 600, 4)      * ureg.ft
+	h         = 500 * ureg.ft
+	inputs    = NoiseInputs(v_tip=rotor_data["V_tip"], **dict((key, value) for key, value in rotor_data.items() if key != "V_tip"))
+	footprint = noise_footprint(inputs, x_array, y_array, h=h, chunk_size=7)
+	assert np.shape(footprint["total"]) == (4, 9)
+
+	for i, y in enumerate(y_array):
+		for j, x in enumerate(x_array):
+			r       = np.sqrt(x**2 + y**2)
+			theta   = 180*ureg.degree - (np.arctan(r/h)*ureg.radian).to(ureg.degree)
+			delta_S = np.sqrt(h**2 + r**2)
+
+			SPL_rotational = rotational_noise(*rotational_args(rotor_data), theta=theta, delta_S=delta_S, num_harmonics=10, weighting="A")[1]
+			SPL_vortex     = vortex_noise(*vortex_args(rotor_data), delta_S=delta_S, St=0.28, weighting="A")[1]
+
+			assert np.isclose(footprint["rotational"][i,j], SPL_rotational, rtol=1e-10)
+			assert np.isclose(footprint["vortex"][i,j],     SPL_vortex,     rtol=1e-10)
+			assert np.isclose(footprint["total"][i,j],      10*np.log10(10**(SPL_rotational/10) + 10**(SPL_vortex/10)), rtol=1e-10)
+
+	# Blade-count study cube matches the individual noise functions, with chord and thickness scaled to keep solidity constant
+	hover_states = OrderedDict()
+	for label, d in zip(["A", "B"], rotor_data_list):
+		hover_states[label] = NoiseInputs(v_tip=d["V_tip"], **dict((key, value) for key, value in d.items() if key != "V_tip"))
+
+	B_array       = np.array([3., 5., 7.])
+	theta_array   = np.array([95., 130., 170.]) * ureg.degree
+	delta_S_array = np.array([200., 800.])      * ureg.ft
+	study         = blade_count_noise_study(hover_states, B_array, theta_array, delta_S_array)
+	assert study["total"].shape == (2, 3, 3, 2)
+	assert study["total"].dims  == ("config", "B", "theta", "delta_S")
+
+	for i, d in enumerate(rotor_data_list):
+		for j, B in enumerate(B_array):
+			scaled_data = dict(d, B=B, c_avg=d["c_avg"]*d["B"]/B, t_avg=d["t_avg"]*d["B"]/B)
+			for k, theta in enumerate(theta_array):
+				for l, delta_S in enumerate(delta_S_array):
+					SPL_rotational = rotational_noise(*rotational_args(scaled_data), theta=theta, delta_S=delta_S, num_harmonics=10, weighting="A")[1]
+					SPL_vortex     = vortex_noise(*vortex_args(scaled_data), delta_S=delta_S, St=0.28, weighting="A")[1]
+
+					assert np.isclose(study["rotational"].values[i,j,k,l], SPL_rotational, rtol=1e-10)
+					assert np.isclose(study["vortex"].values[i,j,k,l],     SPL_vortex,     rtol=1e-10)
+
+	assert np.isclose(study["rotational"].sel(config="B", B=5, theta=130*ureg.degree, delta_S=800*ureg.ft), study["rotational"].values[1,1,1,1])
+	assert study["total"].sel(config="A", B=7).shape == (3, 2)
+
+if __name__=="__main__":
+
+	test()
@@ -0,0 +1,227 @@
+# Off-design evaluation of a frozen design: the sizing variables of a solved OnDemandAircraft (MTOM, battery energy, rotor radius, and
+# everything that follows from them) are held fixed, and the revenue and deadhead missions are flown over other route distances and
+# passenger counts (e.g. route-network analysis).
+# With the design frozen, each mission has a closed-form optimum: hover at the lowest tip speed allowed by the maximum mean lift
+# coefficient (profile power grows with tip speed, induced power does not depend on it), cruise at the design speed and lift-to-drag
+# ratio. Thousands of routes are therefore evaluated in one NumPy pass, without a GP solve per route.
+# The _si functions take and return plain SI magnitudes (kg, N, m, s, W, J).
+
+import numpy as np
+from collections import OrderedDict
+from gpkit       import ureg
+from noise_models import magnitude
+
+
+def sizing_variables(problem):
+
+	# Variables that define the design; the rest of the aircraft follows from them through its equality constraints
+	aircraft = problem.aircraft
+	return [aircraft.MTOM, aircraft.battery.E, aircraft.rotors.R]
+
+
+def frozen_design_substitutions(problem, solution):
+
+	# Substitutions that freeze the design of a solution, e.g. to re-solve the missions of the same aircraft as a GP
+	return {variable: solution(variable) for variable in sizing_variables(problem)}
+
+
+def frozen_design(problem, solution):
+
+	# Aircraft quantities used by the mission models, in SI, from a solution of an OnDemandProblem
+	aircraft = problem.aircraft
+	battery  = aircraft.battery
+	rotors   = aircraft.rotors
+
+	quantities = OrderedDict([("MTOM",                                 (aircraft.MTOM,                                 "kg")),
+		("g",                                    (aircraft.g,                                    "m/s^2")),
+		("W_noPassengersOrCrew",                 (aircraft.W_noPassengersOrCrew,                 "N")),
+		("v_cruise",                             (aircraft.v_cruise,                             "m/s")),
+		("L_D_cruise",                           (aircraft.L_D_cruise,                           "-")),
+		("eta_levelFlight",                      (aircraft.eta_levelFlight,                      "-")),
+		("eta_electrical",                       (aircraft.electrical_system.eta,                "-")),
+		("tailRotor_power_fraction_hover",       (aircraft.tailRotor_power_fraction_hover,       "-")),
+		("tailRotor_power_fraction_levelFlight", (aircraft.tailRotor_power_fraction_levelFlight, "-")),
+		("E_eff",                                (battery.E_eff,                                 "J")),
+		("P_max",                                (battery.P_max,                                 "W")),
+		("A",                                    (rotors.A,                                      "m^2")),
+		("N",                                    (rotors.N,                                      "-")),
+		("s",                                    (rotors.s,                                      "-")),
+		("ki",                                   (rotors.ki,                                     "-")),
+		("Cd0",                                  (rotors.Cd0,                                    "-")),
+		("T_A_max",                              (rotors.T_A_max,                                "N/m^2")),
+		("M_tip_max",                            (rotors.M_tip_max,                              "-")),
+		("Cl_mean_max",                          (rotors.Cl_mean_max,                            "-")),
+		("airframe_purchase_price",              (aircraft.airframe.purchase_price,              "-")),
+		("airframe_lifetime",                    (aircraft.airframe.lifetime,                    "s")),
+		("avionics_purchase_price",              (aircraft.avionics.purchase_price,              "-")),
+		("avionics_lifetime",                    (aircraft.avionics.lifetime,                    "s")),
+		("battery_purchase_price",               (battery.purchase_price,                        "-")),
+		("battery_cycle_life",                   (battery.cycle_life,                            "-"))])
+
+	return OrderedDict((name, si_value(solution, variable, units)) for name, (variable, units) in quantities.items())
+
+
+def mission_inputs(problem, solution, mission="revenue"):
+
+	# Mission and mission-cost inputs in SI (payload, segment times, charger, operating costs), for mission "revenue" or "deadhead"
+	if mission == "revenue":
+		mission_model, mission_cost = problem.revenue_mission, problem.mission_cost.revenue_mission_cost
+	elif mission == "deadhead":
+		mission_model, mission_cost = problem.deadhead_mission, problem.mission_cost.deadhead_mission_cost
+	else:
+		error_string = "Mission " + mission + " not recognized."
+		raise ValueError(error_string)
+
+	operating_expenses = mission_cost.operating_expenses
+	hover_segments     = [mission_model.takeoff_segment, mission_model.landing_segment]
+
+	inputs = OrderedDict([("N_crew",              si_value(solution, mission_model.crew.N,                                   "-")),
+		("W_unit_crew",         si_value(solution, mission_model.crew.W_unit,                              "N")),
+		("N_passengers",        si_value(solution, mission_model.passengers.N,                             "-")),
+		("W_unit_passenger",    si_value(solution, mission_model.passengers.W_unit,                        "N")),
+		("d",                   si_value(solution, mission_model.cruise_segment.d_segment,                 "m")),
+		("t_passenger",         si_value(solution, mission_model.ground_segment.t_passenger,               "s")),
+		("P_charger",           si_value(solution, mission_model.ground_segment.charger.P,                 "W")),
+		("eta_charger",         si_value(solution, mission_model.ground_segment.charger.eta,               "-")),
+		("pilot_cost_per_time", si_value(solution, operating_expenses.pilot_cost.cost_per_time,            "1/s")),
+		("maintenance_cost_per_time", si_value(solution, operating_expenses.maintenance_cost.cost_per_time, "1/s")),
+		("cost_per_energy",     si_value(solution, operating_expenses.energy_cost.cost_per_energy,         "1/J")),
+		("IOC_fraction",        si_value(solution, operating_expenses.IOC_fraction,                        "-"))])
+
+	inputs["t_hover"]   = np.array([si_value(solution, c.t_segment,                  "s")      for c in hover_segments])
+	inputs["rho_hover"] = np.array([si_value(solution, c.state.atmosphere.rho,       "kg/m^3") for c in hover_segments])
+	inputs["a_hover"]   = np.array([si_value(solution, c.state.atmosphere.a,         "m/s")    for c in hover_segments])
+
+	return inputs
+
+
+def off_design_mission_si(design, inputs, d, N_passengers):
+
+	# Energy, time and cost of one mission of a frozen design, broadcast over route distance d (m) and passenger count.
+	# feasible is False where the frozen design cannot fly the mission (mass, disk loading, tip Mach number, battery energy or power).
+	d            = np.asarray(d, dtype=np.float64)
+	N_passengers = np.asarray(N_passengers, dtype=np.float64)
+
+	W_mission = design["W_noPassengersOrCrew"] + inputs["N_crew"]*inputs["W_unit_crew"] + N_passengers*inputs["W_unit_passenger"]
+	m_mission = W_mission/design["g"]
+
+	# Hover (lift equals weight, thrust equals lift), at the tip speed for which the mean lift coefficient is at its maximum
+	T_perRotor = W_mission/design["N"]
+	T_A        = T_perRotor/design["A"]
+	CT         = design["s"]*design["Cl_mean_max"]/3.
+
+	E_hover  = 0.
+	P_max    = 0.
+	feasible = (m_mission <= design["MTOM"]*(1 + 1e-6)) & (T_A <= design["T_A_max"]*(1 + 1e-6))
+	for t, rho, a in zip(inputs["t_hover"], inputs["rho_hover"], inputs["a_hover"]):
+		v_tip      = np.sqrt(T_perRotor/(0.5*rho*design["A"]*CT))
+		P_perRotor = 0.5*rho*v_tip**3*design["A"]*(design["ki"]*0.5*CT**1.5 + 0.25*design["s"]*design["Cd0"])
+		P_electric = design["N"]*P_perRotor/(1 - design["tailRotor_power_fraction_hover"])/design["eta_electrical"]
+
+		feasible = feasible & (v_tip <= design["M_tip_max"]*a*(1 + 1e-6))
+		E_hover  = E_hover + P_electric*t
+		P_max    = np.maximum(P_max, P_electric)
+	P_hover = E_hover/np.sum(inputs["t_hover"])  # Time-averaged over the hover segments
+
+	# Cruise at the design speed and lift-to-drag ratio
+	D_cruise   = W_mission/design["L_D_cruise"]
+	P_cruise   = D_cruise*design["v_cruise"]/design["eta_levelFlight"]/(1 - design["tailRotor_power_fraction_levelFlight"])/design["eta_electrical"]
+	t_cruise   = d/design["v_cruise"]
+	E_cruise   = P_cruise*t_cruise
+	P_max      = np.maximum(P_max, P_cruise)
+
+	E_mission = E_hover + E_cruise
+	feasible  = feasible & (E_mission <= design["E_eff"]*(1 + 1e-6)) & (P_max <= design["P_max"]*(1 + 1e-6))
+
+	# Time on ground: passenger loading or recharging, whichever takes longer
+	E_charger = E_mission/inputs["eta_charger"]
+	t_charge  = E_charger/inputs["P_charger"]
+	t_flight  = np.sum(inputs["t_hover"]) + t_cruise
+	t_ground  = np.maximum(inputs["t_passenger"], t_charge)
+	t_mission = t_flight + t_ground
+
+	capital_cost_per_mission = t_mission*(design["airframe_purchase_price"]/design["airframe_lifetime"] + design["avionics_purchase_price"]/design["avionics_lifetime"]) \
+		+ design["battery_purchase_price"]/design["battery_cycle_life"]
+	DOC_per_mission = t_mission*(inputs["pilot_cost_per_time"] + inputs["maintenance_cost_per_time"]) + E_charger*inputs["cost_per_energy"]
+	operating_cost_per_mission = DOC_per_mission*(1 + inputs["IOC_fraction"])
+
+	shape = np.broadcast(d, N_passengers, W_mission, t_mission, capital_cost_per_mission, feasible).shape  # Design quantities may be arrays too
+	return {"W_mission": np.broadcast_to(W_mission, shape),
+		"P_hover":          np.broadcast_to(P_hover, shape),
+		"P_cruise":         np.broadcast_to(P_cruise, shape),
+		"E_hover":          np.broadcast_to(E_hover, shape),
+		"E_cruise":         np.broadcast_to(E_cruise, shape),
+		"E_mission":        np.broadcast_to(E_mission, shape),
+		"t_flight":         np.broadcast_to(t_flight, shape),
+		"t_charge":         np.broadcast_to(t_charge, shape),
+		"t_mission":        np.broadcast_to(t_mission, shape),
+		"capital_cost_per_mission":   np.broadcast_to(capital_cost_per_mission, shape),
+		"operating_cost_per_mission": np.broadcast_to(operating_cost_per_mission, shape),
+		"cost_per_mission": np.broadcast_to(capital_cost_per_mission + operating_cost_per_mission, shape),
+		"feasible":         np.broadcast_to(feasible, shape)}
+
+
+off_design_units = OrderedDict([("W_mission", ureg.N),
+	("P_hover",                    ureg.W),
+	("P_cruise",                   ureg.W),
+	("E_hover",                    ureg.J),
+	("E_cruise",                   ureg.J),
+	("E_mission",                  ureg.J),
+	("t_flight",                   ureg.s),
+	("t_charge",                   ureg.s),
+	("t_mission",                  ureg.s),
+	("capital_cost_per_mission",   None),
+	("operating_cost_per_mission", None),
+	("cost_per_mission",           None),
+	("feasible",                   None)])
+
+
+def off_design_missions(problem, solution, d, N_passengers=None, d_deadhead=None):
+
+	# Revenue and deadhead missions of the design of a solution (see frozen_design), over route distances and passenger counts.
+	# d, N_passengers and d_deadhead are broadcast together; N_passengers defaults to the design revenue mission, d_deadhead to d.
+	# Returns {"revenue": {...}, "deadhead": {...}} (quantities of off_design_mission_si, with units), and the cost per trip of the
+	# revenue mission plus its share of deadhead missions (cpt, cptpp, cost_per_passenger_km) and feasible, as in OnDemandMissionCost.
+	design   = frozen_design(problem, solution)
+	revenue  = mission_inputs(problem, solution, "revenue")
+	deadhead = mission_inputs(problem, solution, "deadhead")
+
+	d            = magnitude(d, ureg.m)
+	d_deadhead   = d if d_deadhead is None else magnitude(d_deadhead, ureg.m)
+	N_passengers = revenue["N_passengers"] if N_passengers is None else magnitude(N_passengers, ureg.dimensionless)
+
+	d, N_passengers, d_deadhead = np.broadcast_arrays(np.asarray(d, dtype=np.float64), np.asarray(N_passengers, dtype=np.float64),
+		np.asarray(d_deadhead, dtype=np.float64))
+
+	results = {"revenue": off_design_mission_si(design, revenue, d, N_passengers),
+		"deadhead":     off_design_mission_si(design, deadhead, d_deadhead, deadhead["N_passengers"])}
+
+	deadhead_ratio = si_value(solution, problem.mission_cost.deadhead_ratio, "-")
+	NdNr           = deadhead_ratio/(1 - deadhead_ratio)
+
+	cpt = results["revenue"]["cost_per_mission"] + NdNr*results["deadhead"]["cost_per_mission"]
+
+	for mission in ["revenue", "deadhead"]:
+		for name, units in off_design_units.items():
+			if units is not None:
+				results[mission][name] = results[mission][name]*units
+
+	results["cpt"]                   = cpt
+	results["cptpp"]                 = cpt/N_passengers
+	results["cost_per_passenger_km"] = cpt/(N_passengers*d/1000.)/ureg.km
+	results["feasible"]              = results["revenue"]["feasible"] & results["deadhead"]["feasible"]
+
+	return results
+
+
+def si_value(solution, variable, units):
+
+	# Value of a variable of a (scalar) solution, as a float in the given units
+	value = solution(variable)
+	if hasattr(value, "to"):
+		value = value.to(units).magnitude if units != "-" else value.to("dimensionless").magnitude
+	if np.size(value) != 1:
+		error_string = "Variable " + str(variable) + " has " + str(np.size(value)) + " values; a scalar solution is required."
+		raise ValueError(error_string)
+	return float(np.ravel(value)[0])
+
@@ -0,0 +1,226 @@
+# Presolve for the standard GP: monomial equalities (e.g. W == g*m, MTOW == g*MTOM, purchase_price == cost_per_mass*m) are linear in
+# log-space, so each one is used to eliminate one variable from the program before it is handed to the solver. The reduced GP is solved,
+# and the full solution (eliminated variables, and the duals of the eliminated equalities) is reconstructed for gpkit.
+# Fixed substitutions are already folded into the coefficients by gpkit when the GP is generated; a variable fixed through an equality
+# (x == constant) is eliminated like any other.
+
+import time
+import numpy as np
+from scipy.sparse          import coo_matrix
+from scipy.sparse.linalg   import spsolve
+from gpkit.constraints.gp  import MonoEqualityIndexes, DEFAULT_SOLVER_KWARGS, _get_solver
+from gpkit.exceptions      import PrimalInfeasible
+
+
+class PresolveSolver(object):
+
+	# gpkit solver function (pass as solver=...), wrapping the given solver (name or function; None for gpkit's default solver).
+	# After each solve, report holds the size of the program before and after presolve, and the presolve and solve times.
+	def __init__(self, solver=None, tolerance=1e-9):
+
+		self.__name__  = "presolve"
+		self.solver    = solver
+		self.tolerance = tolerance
+		self.report    = None
+
+	def __repr__(self):
+
+		# Configuration only (used in solution cache keys)
+		solver = self.solver if self.solver is None or isinstance(self.solver, str) else self.solver.__module__ + "." + self.solver.__qualname__
+		return "PresolveSolver(solver=%r, tolerance=%r)" % (solver, self.tolerance)
+
+	def __call__(self, c, A, k, meq_idxs, p_idxs=None, **kwargs):
+
+		t_start  = time.time()
+		reduced  = ReducedProgram(c, A, k, meq_idxs, tolerance=self.tolerance)
+		t_reduce = time.time() - t_start
+
+		solvername, solverfn = _get_solver(self.solver, kwargs)
+		solverargs = dict(DEFAULT_SOLVER_KWARGS.get(solvername, {}))
+		solverargs.update(kwargs)
+		solver_out = solverfn(c=reduced.c, A=reduced.A, k=reduced.k, meq_idxs=reduced.meq_idxs, p_idxs=reduced.p_idxs, **solverargs)
+
+		t_start = time.time()
+		primal  = reduced.full_primal(solver_out["primal"])
+		nu      = reduced.full_nu(solver_out)
+		t_reconstruct = time.time() - t_start
+
+		self.report = reduced.report()
+		self.report["solver"]      = solvername
+		self.report["presolve"]    = t_reduce
+		self.report["reconstruct"] = t_reconstruct
+
+		return dict(status=solver_out.get("status"),
+			objective=solver_out["objective"],
+			primal=primal,
+			nu=nu)
+
+
+class ReducedProgram(object):
+
+	# GP with its monomial equalities eliminated, in the solver format (c, A, k, meq_idxs, p_idxs).
+	# Elimination is Gaussian elimination of the equality rows in log-space: the pivot of each equality is the variable with the fewest
+	# occurrences (least fill-in); its column is removed from every other row. Rows are kept as sparse {column: exponent} dictionaries,
+	# so the cost grows with the number of nonzeros (e.g. for large vectorized programs), not with rows x columns.
+	def __init__(self, c, A, k, meq_idxs, tolerance=1e-9):
+
+		self.original_c = np.asarray(c, dtype=np.float64)
+		self.original_A = A.tocsr()
+		self.original_k = list(k)
+
+		num_rows, num_columns = self.original_A.shape
+		indptr, indices, data = self.original_A.indptr, self.original_A.indices, self.original_A.data
+
+		rows  = [{j: v for j, v in zip(indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]]) if v != 0} for i in range(num_rows)]
+		log_c = np.log(self.original_c)
+
+		column_rows = [set() for j in range(num_columns)]  # Rows in which each column appears
+		for i, row in enumerate(rows):
+			for j in row:
+				column_rows[j].add(i)
+
+		starts = np.concatenate([[0], np.cumsum(self.original_k)[:-1]]).astype(int)
+		posy_rows = [np.arange(start, start + n) for start, n in zip(starts, self.original_k)]
+
+		# Equalities are generated as two single-monomial posynomials (m <= 1, then 1/m <= 1); the first one is used, the second dropped
+		equality_rows = [start for start in starts if start in meq_idxs.first_half]
+		dropped_rows  = np.zeros(num_rows, dtype=bool)
+		for start in meq_idxs.all:
+			dropped_rows[start] = True
+		kept_equality_rows = np.zeros(num_rows, dtype=bool)
+		kept_equality_rows[equality_rows] = True
+
+		self.pivots = []  # (row, column) of each eliminated equality, in elimination order
+		for r in equality_rows:
+			row = rows[r]
+			nz  = sorted(j for j, v in row.items() if abs(v) > tolerance*max(max(abs(v) for v in row.values()), 1.))
+			if len(nz) == 0:
+				if abs(log_c[r]) > tolerance*1e3:
+					raise PrimalInfeasible("presolve found an inconsistent monomial equality")
+				continue  # Redundant equality
+
+			j = min(nz, key=lambda j: (len(column_rows[j]), -abs(row[j])))
+
+			for i in list(column_rows[j]):
+				if i == r or (dropped_rows[i] and not kept_equality_rows[i]):
+					continue
+				target = rows[i]
+				factor = target[j]/row[j]
+				for column, value in row.items():
+					if column == j:
+						continue
+					updated = target.get(column, 0.) - factor*value
+					if updated != 0:
+						target[column] = updated
+						column_rows[column].add(i)
+					elif column in target:
+						del target[column]
+						column_rows[column].discard(i)
+				log_c[i] -= factor*log_c[r]
+				del target[j]
+				column_rows[j].discard(i)
+
+			self.pivots.append((r, j))
+
+		self.rows_eliminated  = rows
+		self.log_c_eliminated = log_c
+
+		eliminated_columns = [j for r, j in self.pivots]
+		columns = np.setdiff1d(np.arange(num_columns), eliminated_columns)
+
+		# Posynomials that are kept: the cost, and every constraint that is not an equality and still depends on a variable
+		self.posys = []
+		for i, posy in enumerate(posy_rows):
+			if np.any(dropped_rows[posy]):
+				continue
+			if i > 0 and not any(rows[row] for row in posy):
+				if np.sum(np.exp(log_c[posy])) > 1 + tolerance*1e3:
+					raise PrimalInfeasible("presolve found a constraint that cannot be satisfied")
+				continue  # Constant constraint, satisfied
+			self.posys.append(i)
+
+		self.rows = np.concatenate([posy_rows[i] for i in self.posys])
+
+		# Variables that no longer appear in any kept posynomial are undetermined; they are fixed at 1 (zero in log-space)
+		kept_columns = set()
+		for row in self.rows:
+			kept_columns.update(rows[row])
+		self.columns = np.array(sorted(kept_columns), dtype=int)
+
+		column_index = np.zeros(num_columns, dtype=int)
+		column_index[self.columns] = np.arange(np.size(self.columns))
+		row_idxs, column_idxs, values = [], [], []
+		for n, row in enumerate(self.rows):
+			for j, value in rows[row].items():
+				row_idxs.append(n)
+				column_idxs.append(column_index[j])
+				values.append(value)
+
+		self.c        = np.exp(log_c[self.rows])
+		self.A        = coo_matrix((values, (row_idxs, column_idxs)), shape=(np.size(self.rows), np.size(self.columns)))
+		self.k        = [self.original_k[i] for i in self.posys]
+		self.meq_idxs = MonoEqualityIndexes()
+		self.p_idxs   = np.repeat(np.arange(len(self.k)), self.k).astype("int32")
+
+	def full_primal(self, primal):
+
+		# Log-space values of all of the original variables: kept variables from the reduced solution, eliminated ones by back-substitution
+		x = np.zeros(self.original_A.shape[1])
+		x[self.columns] = np.ravel(primal)
+
+		# After elimination, each pivot row only contains its own pivot and kept variables
+		for r, j in self.pivots:
+			row  = self.rows_eliminated[r]
+			x[j] = -(self.log_c_eliminated[r] + sum(value*x[column] for column, value in row.items() if column != j))/row[j]
+
+		return x
+
+	def full_nu(self, solver_out):
+
+		# Monomial duals of the original program. Kept monomials take the reduced solution's duals; the duals of the eliminated equalities
+		# follow from stationarity (A^T nu = 0) in the eliminated variables.
+		log_c_kept = np.log(self.c)
+		if "nu" in solver_out:
+			nu_kept = np.ravel(solver_out["nu"])
+		else:
+			la      = np.ravel(solver_out["la"])
+			z       = log_c_kept + self.A.tocsr().dot(np.ravel(solver_out["primal"]))
+			nu_kept = np.zeros(np.size(z))
+			start   = 0
+			for la_i, n in zip(la, self.k):
+				w = np.exp(z[start:start + n] - np.max(z[start:start + n]))
+				nu_kept[start:start + n] = la_i*w/np.sum(w)
+				start += n
+
+		nu = np.zeros(self.original_A.shape[0])
+		nu[self.rows] = nu_kept
+
+		if self.pivots:
+			pivot_rows    = [r for r, j in self.pivots]
+			pivot_columns = [j for r, j in self.pivots]
+
+			A_pivot_columns = self.original_A[:, pivot_columns]
+			M = A_pivot_columns[pivot_rows, :]
+			b = -A_pivot_columns.T.dot(nu)
+			d = spsolve(M.T.tocsc(), b)
+
+			# Positive multiplier on m <= 1 (the first row of the equality), negative on 1/m <= 1 (the next row)
+			nu[pivot_rows] = np.maximum(d, 0.)
+			nu[np.array(pivot_rows) + 1] = np.maximum(-d, 0.)
+
+		return nu
+
+	def report(self):
+
+		return {"variables":            (self.original_A.shape[1], np.size(self.columns)),
+			"posynomials":          (len(self.original_k), len(self.k)),
+			"monomials":            (self.original_A.shape[0], np.size(self.rows)),
+			"eliminated_equalities": len(self.pivots)}
+
+
+def presolve_report(model):
+
+	# Program size before and after presolve, without solving (e.g. problem.model of an OnDemandProblem)
+	program = model.gp()
+	reduced = ReducedProgram(program.cs, program.A, program.k, program.meq_idxs)
+	return reduced.report()
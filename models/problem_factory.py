@@ -0,0 +1,236 @@
+# Factory for the standard problem: aircraft, sizing/revenue/deadhead missions and mission cost.
+# Each configuration is built once per process, and then re-solved with substitution overrides.
+
+import numpy as np
+from contextlib             import nullcontext
+from gpkit                  import Model, Vectorize
+from gpkit.keydict          import KeyDict
+from aircraft_models        import OnDemandAircraft
+from mission_models         import OnDemandSizingMission, OnDemandRevenueMission, OnDemandDeadheadMission
+from cost_models            import OnDemandMissionCost, OnDemandRouteDistributionCost
+from standard_substitutions import generic_data
+
+
+class OnDemandProblem(object):
+
+	def __init__(self, config="Lift + cruise", autonomousEnabled=generic_data["autonomousEnabled"], isSizingMissionPiloted=generic_data["isSizingMissionPiloted"],
+		isRevenueMissionPiloted=generic_data["isRevenueMissionPiloted"], isDeadheadMissionPiloted=generic_data["isDeadheadMissionPiloted"], reserve=generic_data["reserve"], num_routes=None):
+
+		# num_routes: if given, the revenue and deadhead missions are flown on num_routes routes (one vector entry per route), and the
+		# objective is the demand-weighted cost per trip (see OnDemandRouteDistributionCost and route_distribution_substitutions).
+		self.config     = config
+		self.num_routes = num_routes
+
+		# A list of configurations is solved as one GP, with the configuration as a vector dimension of every variable.
+		# The configurations are independent, so minimizing the sum of their costs per trip minimizes each of them.
+		if isinstance(config, str):
+			self.build(config, autonomousEnabled, isSizingMissionPiloted, isRevenueMissionPiloted, isDeadheadMissionPiloted, reserve)
+		elif num_routes is not None:
+			error_string = "Route distributions are not supported for a list of configurations."
+			raise ValueError(error_string)
+		else:
+			with Vectorize(len(config)):
+				self.build(list(config), autonomousEnabled, isSizingMissionPiloted, isRevenueMissionPiloted, isDeadheadMissionPiloted, reserve)
+
+		self.base_substitutions = KeyDict(self.model.substitutions)
+
+	def build(self, config, autonomousEnabled, isSizingMissionPiloted, isRevenueMissionPiloted, isDeadheadMissionPiloted, reserve):
+
+		self.aircraft = aircraft = OnDemandAircraft()
+		self.aircraft = aircraft = aircraft.standard_substitutions(config=config, autonomousEnabled=autonomousEnabled)
+
+		self.sizing_mission = sizing_mission = OnDemandSizingMission(aircraft=aircraft)
+		self.sizing_mission = sizing_mission = sizing_mission.standard_substitutions(piloted=isSizingMissionPiloted, reserve=reserve)
+
+		with Vectorize(self.num_routes) if self.num_routes is not None else nullcontext():
+
+			self.revenue_mission = revenue_mission = OnDemandRevenueMission(aircraft=aircraft)
+			self.revenue_mission = revenue_mission = revenue_mission.standard_substitutions(piloted=isRevenueMissionPiloted)
+
+			self.deadhead_mission = deadhead_mission = OnDemandDeadheadMission(aircraft=aircraft)
+			self.deadhead_mission = deadhead_mission = deadhead_mission.standard_substitutions(piloted=isDeadheadMissionPiloted)
+
+		mission_cost_model = OnDemandMissionCost if self.num_routes is None else OnDemandRouteDistributionCost
+
+		self.mission_cost = mission_cost = mission_cost_model(aircraft=aircraft, revenue_mission=revenue_mission, deadhead_mission=deadhead_mission)
+		self.mission_cost = mission_cost = mission_cost.standard_substitutions(isRevenueMissionPiloted=isRevenueMissionPiloted, isDeadheadMissionPiloted=isDeadheadMissionPiloted)
+
+		objective_function = mission_cost.cpt if isinstance(config, str) else mission_cost.cpt.sum()
+		self.model         = Model(objective_function, [aircraft, sizing_mission, revenue_mission, deadhead_mission, mission_cost])
+
+	def reset_substitutions(self):
+
+		# Restore the standard substitutions (removes any overrides)
+		substitutions = self.model.substitutions
+		for key in list(substitutions.keys()):
+			if key not in self.base_substitutions:
+				del substitutions[key]
+		substitutions.update(self.base_substitutions)
+
+	def solve(self, substitutions=None, verbosity=0, cache=None, **solveargs):
+
+		# Substitution overrides are keyed by variable, e.g. {problem.aircraft.L_D_cruise: 12.}. They only apply to this solve.
+		# cache: optional SolutionCache (see solution_cache), e.g. to skip the solves when re-running a study for its plots.
+		self.reset_substitutions()
+		if substitutions:
+			self.model.substitutions.update(substitutions)
+
+		try:
+			if cache is not None:
+				return cache.solve(self.model, verbosity=verbosity, **solveargs)
+			return self.model.solve(verbosity=verbosity, **solveargs)
+		finally:
+			self.reset_substitutions()
+
+
+_problems = {}
+
+def on_demand_problem(config="Lift + cruise", **options):
+
+	# Cached OnDemandProblem, one per configuration or list of configurations (and set of options)
+	if not isinstance(config, str):
+		config = tuple(config)
+	key = (config,) + tuple(sorted(options.items()))
+	if key not in _problems:
+		_problems[key] = OnDemandProblem(config=config, **options)
+	return _problems[key]
+
+
+def route_distribution_substitutions(problem, d, p_route=None, d_deadhead=None):
+
+	# Substitutions for the routes of a problem built with num_routes: revenue trip distances d, their probabilities (default: equally
+	# likely) and the deadhead trip distances (default: same as the revenue trips). See representative_routes, to build d and p_route
+	# from a sample of trip distances.
+	substitutions = {problem.revenue_mission.cruise_segment.d_segment:  d,
+		problem.deadhead_mission.cruise_segment.d_segment: d if d_deadhead is None else d_deadhead}
+	if p_route is not None:
+		substitutions[problem.mission_cost.p_route] = np.asarray(p_route, dtype=np.float64)/np.sum(p_route)
+	return substitutions
+
+
+def grid_sweep(problem, axes, outputs, mode="sweep", verbosity=0, **solveargs):
+
+	# Solves an OnDemandProblem over the full grid of the given axes (e.g. a carpet plot), returning N-D arrays aligned with the axes.
+	# axes:    list of (variable, values) pairs; output arrays have shape (len(values_1), ..., len(values_N)).
+	# outputs: dictionary of output name to variable, e.g. {"MTOM": problem.aircraft.MTOM}.
+	# mode:    "sweep" solves the whole grid as one gpkit sweep; "resolve" re-solves the cached model point by point.
+	axis_values = [axis_magnitude(variable, values) for variable, values in axes]
+	shape       = tuple(np.size(values) for values in axis_values)
+
+	magnitudes = {}
+	units      = {}
+	for name in outputs:
+		magnitudes[name] = np.zeros(shape)
+		units[name]      = None
+
+	if mode == "sweep":
+		substitutions = {}
+		for (variable, values), magnitude_values in zip(axes, axis_values):
+			substitutions[variable] = ("sweep", magnitude_values)
+
+		solution = problem.solve(substitutions, verbosity=verbosity, **solveargs)
+
+		# Place each sweep point in the grid using its swept values (independent of the order in which gpkit enumerates the points)
+		grid_idxs = []
+		for (variable, values), magnitude_values in zip(axes, axis_values):
+			swept_values = axis_magnitude(variable, solution(variable))
+			grid_idxs.append(np.argmin(np.abs(np.reshape(swept_values, (-1, 1)) - magnitude_values), axis=1))
+		grid_idxs = tuple(grid_idxs)
+
+		for name in outputs:
+			store_output(solution, outputs, magnitudes, units, name, grid_idxs)
+
+	elif mode == "resolve":
+		for idx in np.ndindex(*shape):
+			substitutions = {}
+			for (variable, values), magnitude_values, i in zip(axes, axis_values, idx):
+				substitutions[variable] = magnitude_values[i]
+
+			solution = problem.solve(substitutions, verbosity=verbosity, **solveargs)
+
+			for name in outputs:
+				store_output(solution, outputs, magnitudes, units, name, idx)
+
+	else:
+		error_string = "Sweep mode " + mode + " not recognized."
+		raise ValueError(error_string)
+
+	results = {}
+	for name in outputs:
+		results[name] = magnitudes[name] if units[name] is None else magnitudes[name]*units[name]
+
+	return results
+
+
+def config_study(configs, outputs, mode="resolve", verbosity=0, options=None, **solveargs):
+
+	# Solves the standard problem for every configuration, returning 1-D arrays in configs order (e.g. for a config trade study).
+	# outputs: dictionary of output name to attribute path on the problem, e.g. {"MTOM": "aircraft.MTOM"} (see problem_variable).
+	# mode:    "resolve" (default) solves the cached problem of each configuration in turn;
+	#          "vectorized" solves all of the configurations as one GP, with the configuration as a vector dimension (one solve call).
+	# The vectorized mode is an opt-in convenience (one program, one solution), not a speedup: the stacked program is larger than the sum
+	# of its parts for a dense solver such as cvxopt, and is slower to solve than the configurations one by one (see
+	# config_vectorize_benchmark).
+	configs = list(configs)
+	options = options if options is not None else {}
+
+	magnitudes = {}
+	units      = {}
+	for name in outputs:
+		magnitudes[name] = np.zeros(len(configs))
+		units[name]      = None
+
+	def problem_outputs(problem):
+		return dict((name, problem_variable(problem, path)) for name, path in outputs.items())
+
+	if mode == "vectorized":
+		problem  = on_demand_problem(configs, **options)
+		solution = problem.solve(verbosity=verbosity, **solveargs)
+		for name in outputs:
+			store_output(solution, problem_outputs(problem), magnitudes, units, name, slice(None))
+
+	elif mode == "resolve":
+		for i, config in enumerate(configs):
+			problem  = on_demand_problem(config, **options)
+			solution = problem.solve(verbosity=verbosity, **solveargs)
+			for name in outputs:
+				store_output(solution, problem_outputs(problem), magnitudes, units, name, i)
+
+	else:
+		error_string = "Config study mode " + mode + " not recognized."
+		raise ValueError(error_string)
+
+	results = {}
+	for name in outputs:
+		results[name] = magnitudes[name] if units[name] is None else magnitudes[name]*units[name]
+
+	return results
+
+
+def problem_variable(problem, path):
+
+	# Variable of an OnDemandProblem from its attribute path, e.g. "aircraft.battery.e" -> problem.aircraft.battery.e
+	variable = problem
+	for attribute in path.split("."):
+		variable = getattr(variable, attribute)
+	return variable
+
+
+def store_output(solution, outputs, magnitudes, units, name, idx):
+
+	# Stores the value of output name from a solution at index idx of magnitudes[name], and its units in units[name] (None if dimensionless)
+	value = solution(outputs[name])
+	if hasattr(value, "magnitude") and value.dimensionless:
+		value = value.to("dimensionless").magnitude
+	elif hasattr(value, "magnitude"):
+		units[name] = value.units
+		value       = value.magnitude
+	magnitudes[name][idx] = value
+
+
+def axis_magnitude(variable, values):
+
+	# Values as a 1-D array, in the units of the variable
+	if hasattr(values, "to"):
+		values = values.to(variable.key.units).magnitude if variable.key.units else values.magnitude
+	return np.atleast_1d(np.asarray(values, dtype=np.float64)).ravel()
@@ -0,0 +1,159 @@
+# Content-addressed on-disk cache of solutions. The key is a hash of the model source files, the model structure, the full substitution
+# dictionary and the solve arguments; editing any model file therefore invalidates every stored solution.
+# Least-recently-used solutions are evicted once the cache exceeds its size limit.
+
+import glob
+import hashlib
+import os
+import tempfile
+import types
+import numpy as np
+import gpkit
+from gpkit.solution_array import SolutionArray
+
+cache_directory_path = os.path.abspath(os.path.dirname(__file__)) + "/solution_cache"
+default_max_bytes    = 256*1024**2
+
+
+def source_key(source_directory_path=os.path.abspath(os.path.dirname(__file__))):
+
+	# Hash of the model source code (and gpkit version)
+	global _source_key
+	if _source_key is None:
+		digest = hashlib.sha256(gpkit.__version__.encode("utf-8"))
+		for file_path in sorted(glob.glob(source_directory_path + "/*.py")):
+			with open(file_path, "rb") as source_file:
+				digest.update(source_file.read())
+		_source_key = digest.hexdigest()
+	return _source_key
+
+_source_key = None
+
+
+def value_string(value):
+
+	# Canonical string for a substitution value (numbers, arrays, pint quantities and sweep tuples)
+	if isinstance(value, tuple):
+		return "(" + ",".join(value_string(item) for item in value) + ")"
+	if isinstance(value, str):
+		return repr(value)
+	if hasattr(value, "magnitude"):
+		return value_string(value.magnitude) + " " + str(value.units)
+	if callable(value):
+		error_string = "Substitution values that are functions (linked sweeps) cannot be cached."
+		raise TypeError(error_string)
+
+	array = np.asarray(value)
+	if array.dtype == object:
+		return "[" + ",".join(value_string(item) for item in array.ravel()) + "]" + str(array.shape)
+	return array.dtype.str + str(array.shape) + hashlib.sha256(np.ascontiguousarray(array).tobytes()).hexdigest()
+
+
+def solvearg_string(value):
+
+	# Canonical string for a solve argument. Functions are keyed by their qualified name, solver objects (e.g. PresolveSolver) by their
+	# class and repr, which must describe their configuration (the default repr holds a memory address, and would never hit the cache).
+	if isinstance(value, (types.FunctionType, types.BuiltinFunctionType)):
+		return value.__module__ + "." + value.__qualname__
+	if callable(value) and not isinstance(value, type):
+		if type(value).__repr__ is object.__repr__:
+			error_string = "Solver " + type(value).__name__ + " has no __repr__ describing its configuration, and cannot be cached."
+			raise TypeError(error_string)
+		return type(value).__module__ + "." + type(value).__qualname__ + ":" + repr(value)
+	return repr(value)
+
+
+def solution_key(model, solveargs=None):
+
+	digest = hashlib.sha256(source_key().encode("utf-8"))
+	digest.update(str(model).encode("utf-8"))
+
+	substitution_strings = sorted(str(key) + "=" + value_string(value) for key, value in model.substitutions.items())
+	digest.update("\n".join(substitution_strings).encode("utf-8"))
+
+	if solveargs:
+		digest.update(repr(sorted((key, solvearg_string(value)) for key, value in solveargs.items())).encode("utf-8"))
+
+	return digest.hexdigest()
+
+
+class SolutionCache(object):
+
+	def __init__(self, directory_path=cache_directory_path, max_bytes=default_max_bytes):
+
+		self.directory_path = directory_path
+		self.max_bytes      = max_bytes
+		self.hits           = 0
+		self.misses         = 0
+
+	def file_path(self, key):
+		return os.path.join(self.directory_path, key + ".pgz")
+
+	def get(self, key):
+
+		file_path = self.file_path(key)
+		if not os.path.isfile(file_path):
+			return None
+		try:
+			solution = SolutionArray.decompress_file(file_path)
+		except Exception:
+			return None  # Unreadable (e.g. truncated) entry; it is overwritten on the next solve
+		os.utime(file_path, None)  # Marks the entry as recently used
+		return solution
+
+	def put(self, key, solution):
+
+		if not os.path.isdir(self.directory_path):
+			os.makedirs(self.directory_path)
+
+		# Written to a temporary file first, so that concurrent readers never see a partial entry
+		file_descriptor, temp_file_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory_path)
+		os.close(file_descriptor)
+		solution.save_compressed(temp_file_path, saveconstraints=False)
+		os.rename(temp_file_path, self.file_path(key))
+
+		self.evict()
+
+	def evict(self):
+
+		# Removes least-recently-used entries until the cache fits in max_bytes
+		entries = []
+		for file_path in glob.glob(os.path.join(self.directory_path, "*.pgz")):
+			entries.append((os.path.getmtime(file_path), os.path.getsize(file_path), file_path))
+		entries.sort()
+
+		total_bytes = sum(size for mtime, size, file_path in entries)
+		for mtime, size, file_path in entries:
+			if total_bytes <= self.max_bytes:
+				break
+			os.remove(file_path)
+			total_bytes -= size
+
+	def clear(self):
+		for file_path in glob.glob(os.path.join(self.directory_path, "*.pgz")):
+			os.remove(file_path)
+
+	def solve(self, model, verbosity=0, **solveargs):
+
+		# Drop-in for model.solve(): returns the stored solution if this model, with these substitutions, has been solved before
+		key      = solution_key(model, solveargs)
+		solution = self.get(key)
+		if solution is not None:
+			self.hits += 1
+			return solution
+
+		self.misses += 1
+		solution = model.solve(verbosity=verbosity, **solveargs)
+		self.put(key, solution)
+		return solution
+
+
+_solution_cache = None
+
+def solution_cache():
+
+	# Process-wide cache in the default location
+	global _solution_cache
+	if _solution_cache is None:
+		_solution_cache = SolutionCache()
+	return _solution_cache
@@ -0,0 +1,247 @@
+# Columnar solution store: a solve (or sweep) flattened into a NumPy record array, one row per solve and one column per variable,
+# with units kept as metadata. Tables are saved as a plain 2-D float64 array (one row per solve), in a .npz (one file) or a .npy
+# (memory-mappable, with the column names, units and shapes in a "_units.npz" file alongside), and are looked up with the variable
+# names of the studies, e.g. table("MTOM_OnDemandAircraft").
+
+import numpy as np
+from collections import OrderedDict
+from gpkit       import ureg
+
+
+def key_string(varkey):
+
+	# Variable name in the "name_Lineage/Path" form used by the studies, e.g. "T_perRotor_OnDemandSizingMission/HoverTakeoff/..."
+	# Model instance numbers are left out, so that the names do not depend on how many problems were built before this one.
+	if not hasattr(varkey, "lineagestr"):
+		return str(varkey)  # Older gpkit versions already print keys in this form
+	lineage = varkey.lineagestr(modelnums=False).replace(".", "/")
+	return varkey.name + "_" + lineage if lineage else varkey.name
+
+
+def unit_string(units):
+	if not units:
+		return ""
+	return str(getattr(units, "units", units))
+
+
+class SolutionTable(object):
+
+	def __init__(self, data, units, names, sweep=False):
+
+		self.data  = data   # Record array, one row per solve
+		self.units = units  # Unit string per column ("" if dimensionless)
+		self.names = names  # Variable name (without lineage) per column
+		self.sweep = sweep  # If False, lookups return the value of the single row (as for a scalar gpkit solution)
+
+		self.name_index = None
+
+	def __len__(self):
+		return len(self.data)
+
+	def __getitem__(self, idx):
+
+		# Rows (index, slice or index array) as a new table; memory-mapped data is not read until it is used
+		return SolutionTable(self.data[idx], self.units, self.names, sweep=True)
+
+	def column_name(self, key):
+
+		if key in self.units:
+			return key
+
+		# Bare variable names resolve to a column if they are unique
+		if self.name_index is None:
+			self.name_index = {}
+			for column, name in self.names.items():
+				self.name_index.setdefault(name, []).append(column)
+
+		columns = self.name_index.get(key, [])
+		if len(columns) == 1:
+			return columns[0]
+		if len(columns) > 1:
+			error_string = "Variable name " + key + " is ambiguous; use one of " + ", ".join(sorted(columns)) + "."
+			raise ValueError(error_string)
+
+		error_string = "No variable " + key + " found in the solution table."
+		raise ValueError(error_string)
+
+	def column(self, key):
+
+		# Magnitudes (in the column's units), as an array over rows
+		values = self.data[self.column_name(key)]
+		return values if self.sweep else values[0]
+
+	def __call__(self, key):
+
+		column = self.column_name(key)
+		values = self.column(column)
+		if self.units[column]:
+			return values*ureg(self.units[column])
+		return values
+
+
+# Commonly used quantities: SolutionResults attribute -> table column. Rotor and atmosphere quantities are those of the sizing-mission
+# hover takeoff (the noise-analysis inputs).
+hover_takeoff_performance = "_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/"
+
+standard_quantities = OrderedDict([("MTOM", "MTOM_OnDemandAircraft"),
+	("MTOW",            "MTOW_OnDemandAircraft"),
+	("L_D_cruise",      "(L/D)_{cruise}_OnDemandAircraft"),
+	("m_airframe",      "m_OnDemandAircraft/Airframe"),
+	("m_battery",       "m_OnDemandAircraft/Battery"),
+	("R",               "R_OnDemandAircraft/Rotors"),
+	("s",               "s_OnDemandAircraft/Rotors"),
+	("N",               "N_OnDemandAircraft/Rotors"),
+	("B",               "B_OnDemandAircraft/Rotors"),
+	("c_avg",           "c_{avg}_OnDemandAircraft/Rotors"),
+	("t_avg",           "t_{avg}_OnDemandAircraft/Rotors"),
+	("T_perRotor",      "T_perRotor" + hover_takeoff_performance + "RotorsPerformance"),
+	("Q_perRotor",      "Q_perRotor" + hover_takeoff_performance + "RotorsPerformance"),
+	("T_A",             "T/A" + hover_takeoff_performance + "RotorsPerformance"),
+	("v_tip",           "v_{tip}" + hover_takeoff_performance + "RotorsPerformance"),
+	("omega",           "\\omega" + hover_takeoff_performance + "RotorsPerformance"),
+	("Cl_mean",         "Cl_{mean}" + hover_takeoff_performance + "RotorsPerformance"),
+	("rho",             "\\rho_OnDemandSizingMission/HoverTakeoff/HoverFlightState/FixedStandardAtmosphere"),
+	("a",               "a_OnDemandSizingMission/HoverTakeoff/HoverFlightState/FixedStandardAtmosphere"),
+	("E_battery",       "E_OnDemandAircraft/Battery"),
+	("E_mission",       "E_{mission}_OnDemandSizingMission"),
+	("E_takeoff",       "E" + hover_takeoff_performance + "BatteryPerformance"),
+	("E_cruise",        "E_OnDemandSizingMission/Cruise/OnDemandAircraftLevelFlightFlightPerformance/BatteryPerformance"),
+	("E_landing",       "E_OnDemandSizingMission/HoverLanding/OnDemandAircraftHoverPerformance/BatteryPerformance"),
+	("E_reserve",       "E_OnDemandSizingMission/Reserve/OnDemandAircraftLevelFlightFlightPerformance/BatteryPerformance"),
+	("purchase_price_airframe", "purchase_price_OnDemandAircraft/Airframe"),
+	("purchase_price_battery",  "purchase_price_OnDemandAircraft/Battery"),
+	("purchase_price_avionics", "purchase_price_OnDemandAircraft/Avionics"),
+	("cost_per_trip",   "cost_per_trip_OnDemandMissionCost"),
+	("cptpp",           "cost_per_trip_per_passenger_OnDemandMissionCost"),
+	("cppk",            "cost_per_passenger_km_OnDemandMissionCost")])
+
+
+class SolutionResults(object):
+
+	# Attribute access to the standard quantities of a SolutionTable, e.g. results.MTOM, results.T_perRotor (arrays for sweep tables).
+	# The column lookup is compiled once per table schema; values are extracted on first access and then kept.
+	def __init__(self, table, quantities=standard_quantities):
+
+		self.table = table
+		self.index = quantity_index(table, quantities)
+
+	def __getattr__(self, name):
+
+		index = self.__dict__.get("index", {})
+		if name not in index:
+			raise AttributeError(name)
+
+		column, units = index[name]
+		value = self.table.column(column)
+		if units is not None:
+			value = value*units
+
+		setattr(self, name, value)
+		return value
+
+	def __dir__(self):
+		return sorted(set(dir(type(self)) + list(self.__dict__) + list(self.index)))
+
+
+_quantity_indexes = {}
+
+def quantity_index(table, quantities=standard_quantities):
+
+	# {attribute: (column, units)} for the quantities present in the table; cached per schema
+	key = (table.data.dtype.names, tuple(quantities.items()))
+	if key not in _quantity_indexes:
+		index = {}
+		for name, column in quantities.items():
+			if column in table.units:
+				index[name] = (column, ureg(table.units[column]).units if table.units[column] else None)
+		_quantity_indexes[key] = index
+	return _quantity_indexes[key]
+
+
+def solution_results(solution, quantities=standard_quantities):
+	return SolutionResults(solution_table(solution), quantities)
+
+
+def solution_table(solution):
+
+	# Flattens a gpkit solution (scalar or sweep) into a SolutionTable
+	sweep    = np.ndim(solution["cost"]) > 0
+	num_rows = np.size(solution["cost"]) if sweep else 1
+
+	columns = [("cost", np.asarray(getattr(solution["cost"], "magnitude", solution["cost"])), unit_string(getattr(solution["cost"], "units", None)), "cost")]
+	for varkey, value in solution["variables"].items():
+		value = np.asarray(getattr(value, "magnitude", value), dtype=np.float64)
+		columns.append((key_string(varkey), value, unit_string(varkey.units), varkey.name))
+
+	dtype = []
+	for column, value, units, name in columns:
+		dtype.append((column, np.float64, np.shape(value)[1:] if sweep else np.shape(value)))
+
+	data  = np.zeros(num_rows, dtype=dtype)
+	units = {}
+	names = {}
+	for column, value, column_units, name in columns:
+		data[column]  = value
+		units[column] = column_units
+		names[column] = name
+
+	return SolutionTable(data, units, names, sweep=sweep)
+
+
+def stack_tables(tables):
+
+	# Rows of several tables with the same schema (e.g. one table per configuration or study case), as a single sweep table
+	tables = list(tables)
+	data   = np.concatenate([np.atleast_1d(table.data) for table in tables])
+	return SolutionTable(data, tables[0].units, tables[0].names, sweep=True)
+
+
+def metadata_arrays(table):
+
+	# Column metadata as string arrays; shapes as e.g. "" (scalar column) or "3" or "2,3"
+	columns = list(table.data.dtype.names)
+	return {"columns":np.array(columns),
+		"units":np.array([table.units[column] for column in columns]),
+		"names":np.array([table.names[column] for column in columns]),
+		"shapes":np.array([",".join(str(size) for size in table.data.dtype[column].shape) for column in columns]),
+		"sweep":np.array(table.sweep)}
+
+
+def save_table(file_path, table):
+
+	# .npz: data and metadata in one compressed file. Otherwise: data in a .npy file (memory-mappable), metadata in a "_units.npz" file.
+	# The data is stored as a plain 2-D float64 array: a record dtype with one field per variable would need a .npy header larger than
+	# numpy accepts on load.
+	data = np.ascontiguousarray(np.atleast_1d(table.data))
+	data = data.view(np.float64).reshape(len(data), -1)
+	if file_path.endswith(".npz"):
+		np.savez_compressed(file_path, data=data, **metadata_arrays(table))
+	else:
+		np.save(file_path, data)
+		np.savez(units_file_path(file_path), **metadata_arrays(table))
+
+
+def load_table(file_path, mmap_mode="r"):
+
+	# .npy tables are memory-mapped (rows are read from disk only when they are used)
+	if file_path.endswith(".npz"):
+		archive  = np.load(file_path)
+		data     = archive["data"]
+		metadata = archive
+	else:
+		data     = np.load(file_path, mmap_mode=mmap_mode)
+		metadata = np.load(units_file_path(file_path))
+
+	columns = [str(column) for column in metadata["columns"]]
+	shapes  = [tuple(int(size) for size in str(shape).split(",")) if str(shape) else () for shape in metadata["shapes"]]
+	units   = dict(zip(columns, [str(units) for units in metadata["units"]]))
+	names   = dict(zip(columns, [str(name) for name in metadata["names"]]))
+
+	# Record view of the rows (no copy, so memory-mapped data stays on disk)
+	data = data.view(np.dtype([(column, np.float64, shape) for column, shape in zip(columns, shapes)])).reshape(len(data))
+
+	return SolutionTable(data, units, names, sweep=bool(metadata["sweep"]))
+
+
+def units_file_path(file_path):
+	return (file_path[:-4] if file_path.endswith(".npy") else file_path) + "_units.npz"
@@ -6,38 +6,224 @@ import scipy.interpolate as interp
 from gpkit import ureg
 import os
 import sys
+import tempfile
 
-def stdatmo(h):
+data_file_path   = os.path.abspath(os.path.dirname(__file__)) + "/stdatmo_table.txt"
+binary_file_path = os.path.abspath(os.path.dirname(__file__)) + "/stdatmo_table.npy"
+
+#units set manually to those in the lookup table
+table_columns = ["h", "\rho", "a", "T", "P", "kvisc"]
+table_units   = {"h":ureg.m,#altitude
+	"\rho":ureg.kg/ureg.m**3,#air density
+	"a":ureg.m/ureg.s,#speed of sound
+	"T":ureg.K,#temperature
+	"P":ureg.Pa,#pressure
+	"kvisc":ureg.m**2/ureg.s}#kinematic viscosity
+
+#field names used by stdatmo_fast (same order as the table columns)
+fast_fields = ["rho", "a", "T", "P", "kvisc"]
+
+
+def write_file(file_path, write):
+
+	#Writes a file through write(file_object), to a temporary file in the same directory that is then moved into place, so that
+	#concurrent processes never read a partial file. Returns False if the file could not be written (e.g. read-only install).
+	try:
+		file_descriptor, temp_file_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(file_path))
+	except (IOError, OSError):
+		return False
+	try:
+		with os.fdopen(file_descriptor, "wb") as output_file:
+			write(output_file)
+
+		#mkstemp creates the file readable by its owner only; the file gets the usual permissions instead
+		umask = os.umask(0)
+		os.umask(umask)
+		os.chmod(temp_file_path, 0o666 & ~umask)
+
+		os.replace(temp_file_path, file_path)
+	except (IOError, OSError):
+		os.remove(temp_file_path)
+		return False
+	return True
+
+
+def load_table(data_file_path=data_file_path, binary_file_path=binary_file_path):
+
+	#Use the precompiled binary (memory-mapped) if it is newer than the text table
+	if binary_file_path is not None and os.path.isfile(binary_file_path) and os.path.getmtime(binary_file_path) >= os.path.getmtime(data_file_path):
+		try:
+			return np.load(binary_file_path, mmap_mode="r")
+		except (IOError, OSError, ValueError):
+			pass  # Unreadable (e.g. another user's file) or corrupt binary; the text table is used, and the binary rewritten if possible
+
+	data_from_file = np.loadtxt(data_file_path, skiprows=2)
+
+	if binary_file_path is not None:
+		write_file(binary_file_path, lambda binary_file: np.save(binary_file, data_from_file))  # Read-only install: text table every time
+
+	return data_from_file
+
+
+class StandardAtmosphereTable(object):
+
+	# Lookup table and its interpolating functions (SI units). Built once per process; see atmosphere_table().
+	def __init__(self, data_file_path=data_file_path, binary_file_path=binary_file_path):
+
+		self.data = load_table(data_file_path, binary_file_path)
+		self.h    = np.asarray(self.data[:,0])
+
+		self.interp_fcns = {}
+		for i, key in enumerate(table_columns[1:], 1):
+			self.interp_fcns[key] = interp.interp1d(self.h, np.asarray(self.data[:,i]), kind='cubic')
+
+		self.ppoly_coefficients = None  # Piecewise-polynomial form, built on first call to evaluate()
+		self.ppolys             = {}    # Keyed by tuple of requested fields
+
+	def __call__(self, h):
+
+		#output is a dictionary
+		h_correctUnits = h.to(table_units["h"]).magnitude
+		output = {}
+		for key in table_columns[1:]:
+			output[key] = self.interp_fcns[key](h_correctUnits)*table_units[key]
+
+		return output
+
+	def evaluate(self, h_m, fields=("rho", "a")):
+
+		if self.ppoly_coefficients is None:
+			#same not-a-knot cubic splines as interp1d, in piecewise-polynomial form (one column per field)
+			spline = interp.make_interp_spline(self.h, np.asarray(self.data[:,1:]), k=3)
+			ppolys = [interp.PPoly.from_spline(interp.BSpline(spline.t, spline.c[:,i], 3)) for i in range(len(fast_fields))]
+
+			self.ppoly_breakpoints  = ppolys[0].x
+			self.ppoly_coefficients = np.stack([ppoly.c for ppoly in ppolys], axis=-1)
+
+		fields = tuple(fields)
+		if fields not in self.ppolys:
+			for field in fields:
+				if field not in fast_fields:
+					error_string = "Atmospheric field " + field + " not recognized."
+					raise ValueError(error_string)
+			columns = [fast_fields.index(field) for field in fields]
+			self.ppolys[fields] = interp.PPoly(self.ppoly_coefficients[:,:,columns], self.ppoly_breakpoints)
+
+		h_m = np.asarray(h_m, dtype=np.float64)
+		if h_m.size and (h_m.min() < self.h[0] or h_m.max() > self.h[-1]):
+			error_string = "Altitude outside the range of the standard-atmosphere table (%0.0f to %0.0f m)." % (self.h[0], self.h[-1])
+			raise ValueError(error_string)
+
+		values = self.ppolys[fields](h_m)
+
+		output = np.empty(h_m.shape, dtype=[(field, np.float64) for field in fields])
+		for i, field in enumerate(fields):
+			output[field] = values[...,i]
+
+		return output
 
-	data_file_path = os.path.abspath(os.path.dirname(__file__)) + "/stdatmo_table.txt"
-	data_from_file = np.loadtxt(data_file_path,skiprows=2)
-
-	#units set manually to those in the lookup table
-	data_from_file = {"h":data_from_file[:,0]*ureg.m,#altitude
-		"\rho":data_from_file[:,1]*ureg.kg/ureg.m**3,#air density
-		"a":data_from_file[:,2]*ureg.m/ureg.s,#speed of sound
-		"T":data_from_file[:,3]*ureg.K,#temperature
-		"P":data_from_file[:,4]*ureg.Pa,#pressure
-		"kvisc":data_from_file[:,5]*ureg.m**2/ureg.s}#kinematic viscosity
-
-	#these functions all use SI units
-	interp_fcns = {"\rho":interp.interp1d(data_from_file["h"].magnitude,data_from_file["\rho"].magnitude,kind='cubic'),
-		"a":interp.interp1d(data_from_file["h"].magnitude,data_from_file["a"].magnitude,kind='cubic'),
-		"T":interp.interp1d(data_from_file["h"].magnitude,data_from_file["T"].magnitude,kind='cubic'),
-		"P":interp.interp1d(data_from_file["h"].magnitude,data_from_file["P"].magnitude,kind='cubic'),
-		"kvisc":interp.interp1d(data_from_file["h"].magnitude,data_from_file["kvisc"].magnitude,kind='cubic')}
-
-	#output is a dictionary
-	h_correctUnits = h.to(data_from_file["h"].units).magnitude
-	output = {"\rho":interp_fcns["\rho"](h_correctUnits)*data_from_file["\rho"].units,
-		"a":interp_fcns["a"](h_correctUnits)*data_from_file["a"].units,
-		"T":interp_fcns["T"](h_correctUnits)*data_from_file["T"].units,
-		"P":interp_fcns["P"](h_correctUnits)*data_from_file["P"].units,
-		"kvisc":interp_fcns["kvisc"](h_correctUnits)*data_from_file["kvisc"].units}
+
+#Analytic International Standard Atmosphere (geopotential altitude, as in the lookup table)
+isa_constants = {"R":287.05287,#gas constant for air (J/(kg*K))
+	"gamma":1.4,#ratio of specific heats
+	"g0":9.80665,#standard gravitational acceleration (m/s^2)
+	"T0":288.15,#sea-level temperature (K)
+	"P0":101325.,#sea-level pressure (Pa)
+	"mu_ref":1.458e-6,#Sutherland's-law constant (kg/(m*s*K^0.5))
+	"S":110.4}#Sutherland temperature (K)
+
+isa_layers = {"h":np.array([0., 11000., 20000., 32000., 47000., 51000., 71000., 84852.]),#layer base altitude (m)
+	"L":np.array([-6.5e-3, 0., 1.0e-3, 2.8e-3, 0., -2.8e-3, -2.0e-3, 0.])}#temperature lapse rate (K/m)
+
+#temperature and pressure at the base of each layer
+isa_layers["T"] = np.zeros(np.size(isa_layers["h"]))
+isa_layers["P"] = np.zeros(np.size(isa_layers["h"]))
+isa_layers["T"][0] = isa_constants["T0"]
+isa_layers["P"][0] = isa_constants["P0"]
+
+for i in range(1, np.size(isa_layers["h"])):
+	dh = isa_layers["h"][i] - isa_layers["h"][i-1]
+	L  = isa_layers["L"][i-1]
+
+	isa_layers["T"][i] = isa_layers["T"][i-1] + L*dh
+	if L == 0:
+		isa_layers["P"][i] = isa_layers["P"][i-1]*np.exp(-isa_constants["g0"]*dh/(isa_constants["R"]*isa_layers["T"][i-1]))
+	else:
+		isa_layers["P"][i] = isa_layers["P"][i-1]*(isa_layers["T"][i]/isa_layers["T"][i-1])**(-isa_constants["g0"]/(isa_constants["R"]*L))
+
+
+def isa_atmosphere_fast(h_m, fields=("rho", "a"), delta_T=0.):
+
+	# Unit-stripped analytic ISA. Altitude in m (float or array), temperature offset in K (e.g. hot day); same output format as stdatmo_fast.
+	# Standard pressure is retained for non-zero temperature offsets. The top (isothermal) layer is extrapolated above 84852 m.
+	for field in fields:
+		if field not in fast_fields:
+			error_string = "Atmospheric field " + field + " not recognized."
+			raise ValueError(error_string)
+
+	h_m = np.asarray(h_m, dtype=np.float64)
+
+	i  = np.clip(np.searchsorted(isa_layers["h"], h_m, side="right") - 1, 0, np.size(isa_layers["h"]) - 1)
+	dh = h_m - isa_layers["h"][i]
+	L  = isa_layers["L"][i]
+
+	T_std      = isa_layers["T"][i] + L*dh
+	isothermal = (L == 0)
+	L_safe     = np.where(isothermal, 1., L)
+
+	P = np.where(isothermal,
+		isa_layers["P"][i]*np.exp(-isa_constants["g0"]*dh/(isa_constants["R"]*isa_layers["T"][i])),
+		isa_layers["P"][i]*(T_std/isa_layers["T"][i])**(-isa_constants["g0"]/(isa_constants["R"]*L_safe)))
+
+	T   = T_std + delta_T
+	rho = P/(isa_constants["R"]*T)
+
+	values = {"rho":rho,
+		"a":np.sqrt(isa_constants["gamma"]*isa_constants["R"]*T),
+		"T":T,
+		"P":P,
+		"kvisc":isa_constants["mu_ref"]*T**1.5/(T + isa_constants["S"])/rho}
+
+	output = np.empty(h_m.shape, dtype=[(field, np.float64) for field in fields])
+	for field in fields:
+		output[field] = values[field]
 
 	return output
 
 
+def isa_atmosphere(h, delta_T=0*ureg.K):
+
+	# Analytic counterpart of stdatmo (same output dictionary)
+	fast_data = isa_atmosphere_fast(h.to(table_units["h"]).magnitude, fields=fast_fields, delta_T=delta_T.to(ureg.K).magnitude)
+
+	output = {}
+	for key, field in zip(table_columns[1:], fast_fields):
+		output[key] = fast_data[field]*table_units[key]
+
+	return output
+
+
+_atmosphere_table = None
+
+def atmosphere_table():
+
+	# Process-wide cached table, lazy-loaded on first use
+	global _atmosphere_table
+	if _atmosphere_table is None:
+		_atmosphere_table = StandardAtmosphereTable()
+	return _atmosphere_table
+
+
+def stdatmo(h):
+	return atmosphere_table()(h)
+
+
+def stdatmo_fast(h_m, fields=("rho", "a")):
+
+	# Unit-stripped version of stdatmo. Altitude in m (float or array); returns a structured array of the requested fields (SI units).
+	return atmosphere_table().evaluate(h_m, fields)
+
+
 if __name__=="__main__":
 	#Small test case
 	h = np.linspace(0,40000,2)*ureg.ft
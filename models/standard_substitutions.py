@@ -24,6 +24,46 @@ configs["Compound heli"] = {}
 configs["Tilt wing"]     = {}
 configs["Tilt rotor"]    = {}
 
+# Configuration-specific aircraft inputs: one row per configuration (config_table_names), one array per aircraft attribute
+config_table_names = ["Multirotor", "Autogyro", "Helicopter", "Tilt duct", "Coaxial heli", "Lift + cruise", "Tilt wing", "Compound heli", "Tilt rotor"]
+
+config_table = OrderedDict([
+	("empty_mass_fraction",                  np.array([0.43,  0.5,   0.43,  0.55,  0.43,  0.53,  0.55,  0.5,   0.55 ])),
+	("v_cruise",                             np.array([50.,   100.,  100.,  150.,  150.,  150.,  150.,  150.,  150. ]) * ureg.mph),
+	("L_D_cruise",                           np.array([1.5,   3.5,   4.25,  10.,   5.5,   10.,   12.,   9.,    14.  ])),
+	("tailRotor_power_fraction_hover",       np.array([0.001, 0.001, 0.15,  0.001, 0.001, 0.001, 0.001, 0.15,  0.001])),
+	("tailRotor_power_fraction_levelFlight", np.array([0.001, 0.001, 0.15,  0.001, 0.001, 0.001, 0.001, 0.10,  0.001])),
+	("rotors.N",                             np.array([8.,    1.,    1.,    36.,   2.,    8.,    8.,    1.,    12.  ])),
+	("rotors.T_A_max",                       np.array([3.75,  3.75,  4.5,   40.,   7.,    15.,   15.,   4.5,   15.  ]) * ureg.lbf / ureg.ft**2),
+	("rotors.Cl_mean_max",                   np.array([0.6,   0.8,   0.6,   1.0,   0.6,   1.0,   1.0,   0.8,   1.0  ])),
+])
+
+def config_rows(config):
+
+	# Row index of a configuration name, or an array of indices for a list of names
+	if not isinstance(config, str):
+		return np.array([config_rows(name) for name in config], dtype=int)
+
+	if config not in config_table_names:
+		error_string = "Configuration " + config + " not recognized."
+		raise ValueError(error_string)
+	return config_table_names.index(config)
+
+def config_substitutions(aircraft, config="Lift + cruise"):
+
+	# Configuration-specific substitutions, from config_table. For a list of configurations (aircraft built under Vectorize(len(config))),
+	# each value is an array with one entry per configuration.
+	idx = config_rows(config)
+
+	substitutions = {}
+	for path, values in config_table.items():
+		variable = aircraft
+		for attribute in path.split("."):
+			variable = getattr(variable, attribute)
+		substitutions[variable] = values[idx]
+
+	return substitutions
+
 def on_demand_aircraft_substitutions(aircraft, config="Lift + cruise", autonomousEnabled=True):
 
 	aircraft.substitutions.update({
@@ -62,136 +102,7 @@ def on_demand_aircraft_substitutions(aircraft, config="Lift + cruise", autonomou
 			aircraft.avionics.purchase_price: 1.,  # Negligibly small
 		})
 
-	if config == "Multirotor":
-		aircraft.substitutions.update({
-			aircraft.empty_mass_fraction: 0.43,
-			aircraft.v_cruise:            50. * ureg.mph,
-			aircraft.L_D_cruise:          1.5,
-
-			aircraft.tailRotor_power_fraction_hover:       0.001,
-			aircraft.tailRotor_power_fraction_levelFlight: 0.001,
-
-			aircraft.rotors.N:           8.,
-			aircraft.rotors.T_A_max:     3.75 * ureg.lbf / ureg.ft**2,
-			aircraft.rotors.Cl_mean_max: 0.6,
-		})
-
-	elif config == "Autogyro":
-		aircraft.substitutions.update({
-			aircraft.empty_mass_fraction: 0.5,
-			aircraft.v_cruise:            100. * ureg.mph,
-			aircraft.L_D_cruise:          3.5,
-
-			aircraft.tailRotor_power_fraction_hover:       0.001,
-			aircraft.tailRotor_power_fraction_levelFlight: 0.001,
-
-			aircraft.rotors.N:           1,
-			aircraft.rotors.T_A_max:     3.75 * ureg.lbf / ureg.ft**2,
-			aircraft.rotors.Cl_mean_max: 0.8,
-		})
-
-	elif config == "Helicopter":
-		aircraft.substitutions.update({
-			aircraft.empty_mass_fraction: 0.43,
-			aircraft.v_cruise:            100. * ureg.mph,
-			aircraft.L_D_cruise:          4.25,
-
-			aircraft.tailRotor_power_fraction_hover:       0.15,
-			aircraft.tailRotor_power_fraction_levelFlight: 0.15,
-
-			aircraft.rotors.N:           1.,
-			aircraft.rotors.T_A_max:     4.5 * ureg.lbf / ureg.ft**2,
-			aircraft.rotors.Cl_mean_max: 0.6,
-		})
-
-	elif config == "Tilt duct":
-		aircraft.substitutions.update({
-			aircraft.empty_mass_fraction: 0.55,
-			aircraft.v_cruise:            150. * ureg.mph,
-			aircraft.L_D_cruise:          10.,
-
-			aircraft.tailRotor_power_fraction_hover:       0.001,
-			aircraft.tailRotor_power_fraction_levelFlight: 0.001,
-
-			aircraft.rotors.N:           36.,
-			aircraft.rotors.T_A_max:     40. * ureg.lbf / ureg.ft**2,
-			aircraft.rotors.Cl_mean_max: 1.0,
-		})
-
-	elif config == "Coaxial heli":
-		aircraft.substitutions.update({
-			aircraft.empty_mass_fraction: 0.43,
-			aircraft.v_cruise:            150. * ureg.mph,
-			aircraft.L_D_cruise:          5.5,
-
-			aircraft.tailRotor_power_fraction_hover:       0.001,
-			aircraft.tailRotor_power_fraction_levelFlight: 0.001,
-
-			aircraft.rotors.N:           2.0,
-			aircraft.rotors.T_A_max:     7. * ureg.lbf / ureg.ft**2,
-			aircraft.rotors.Cl_mean_max: 0.6,
-		})
-
-	elif config == "Lift + cruise":
-		aircraft.substitutions.update({
-			aircraft.empty_mass_fraction: 0.53,
-			aircraft.v_cruise:            150. * ureg.mph,
-			aircraft.L_D_cruise:          10.,
-
-			aircraft.tailRotor_power_fraction_hover:       0.001,
-			aircraft.tailRotor_power_fraction_levelFlight: 0.001,
-
-			aircraft.rotors.N:           8.,
-			aircraft.rotors.T_A_max:     15. * ureg.lbf / ureg.ft**2,
-			aircraft.rotors.Cl_mean_max: 1.0,
-		})
-
-	elif config == "Tilt wing":
-		aircraft.substitutions.update({
-			aircraft.empty_mass_fraction: 0.55,
-			aircraft.v_cruise:            150. * ureg.mph,
-			aircraft.L_D_cruise:          12.,
-
-			aircraft.tailRotor_power_fraction_hover:       0.001,
-			aircraft.tailRotor_power_fraction_levelFlight: 0.001,
-
-			aircraft.rotors.N:           8.,
-			aircraft.rotors.T_A_max:     15. * ureg.lbf / ureg.ft**2,
-			aircraft.rotors.Cl_mean_max: 1.0,
-		})
-
-	elif config == "Compound heli":
-		aircraft.substitutions.update({
-			aircraft.empty_mass_fraction: 0.5,
-			aircraft.v_cruise:            150. * ureg.mph,
-			aircraft.L_D_cruise:          9.,
-
-			aircraft.tailRotor_power_fraction_hover:       0.15,
-			aircraft.tailRotor_power_fraction_levelFlight: 0.10,
-
-			aircraft.rotors.N:           1.,
-			aircraft.rotors.T_A_max:     4.5 * ureg.lbf / ureg.ft**2,
-			aircraft.rotors.Cl_mean_max: 0.8,
-		})
-
-	elif config == "Tilt rotor":
-		aircraft.substitutions.update({
-			aircraft.empty_mass_fraction: 0.55,
-			aircraft.v_cruise:            150. * ureg.mph,
-			aircraft.L_D_cruise:          14.,
-
-			aircraft.tailRotor_power_fraction_hover:       0.001,
-			aircraft.tailRotor_power_fraction_levelFlight: 0.001,
-
-			aircraft.rotors.N:           12.,
-			aircraft.rotors.T_A_max:     15. * ureg.lbf / ureg.ft**2,
-			aircraft.rotors.Cl_mean_max: 1.0,
-		})
-	
-	else:
-		error_string = "Configuration " + config + " not recognized."
-		raise ValueError(error_string)
-
+	aircraft.substitutions.update(config_substitutions(aircraft, config))
 
 	return aircraft
 
@@ -0,0 +1,83 @@
+# Parallel executor for trade studies: independent (configuration x case) solves are fanned out over a process pool.
+# Each worker builds one problem per configuration (see problem_factory), then re-solves it for every case it is sent.
+# Substitution payloads are keyed by attribute path on the problem (e.g. {"aircraft.battery.e": 450*ureg.Wh/ureg.kg}) or by unique
+# variable name (e.g. {"(L/D)_{cruise}": 12.}), so that they pickle cleanly. Solve arguments (e.g. {"solver": PresolveSolver()}) travel
+# with each case, and must pickle as well.
+# On platforms that spawn rather than fork worker processes (Windows, macOS), calling scripts need an if __name__=="__main__" guard.
+
+import multiprocessing
+import time
+import problem_factory
+from concurrent.futures import ProcessPoolExecutor
+from problem_factory    import on_demand_problem, problem_variable
+
+
+class StudyCase(object):
+
+	def __init__(self, config, substitutions=None, options=None, label=None, solveargs=None):
+
+		self.config        = config
+		self.substitutions = substitutions if substitutions is not None else {}
+		self.options       = options if options is not None else {}      # Passed to on_demand_problem(), e.g. {"reserve": "20-minute loiter"}
+		self.solveargs     = solveargs if solveargs is not None else {}  # Passed to the solve, e.g. {"solver": PresolveSolver()}
+		self.label         = label if label is not None else config
+
+
+def solve_case(case, verbosity=0, cache=None):
+
+	# Runs in the worker process; the problem is built on first use and cached for the rest of the study
+	problem = on_demand_problem(case.config, **case.options)
+
+	substitutions = {}
+	for key, value in case.substitutions.items():
+		substitutions[substitution_key(problem, key)] = value
+
+	return problem.solve(substitutions, verbosity=verbosity, cache=cache, **case.solveargs)
+
+
+def substitution_key(problem, key):
+
+	# "aircraft.battery.e" -> problem.aircraft.battery.e; other keys (variable names) are passed through
+	path = key.split(".")
+	if len(path) == 1 or not hasattr(problem, path[0]):
+		return key
+	return problem_variable(problem, key)
+
+
+def run_study(cases, processes=None, verbosity=0, cache=None):
+
+	# Returns the solutions, in the same order as the cases. processes=1 solves serially in this process.
+	# cache: optional SolutionCache (see solution_cache); cached cases are not solved again.
+	cases = list(cases)
+	if processes is None:
+		processes = min(multiprocessing.cpu_count(), len(cases))
+
+	if processes <= 1:
+		return [solve_case(case, verbosity, cache) for case in cases]
+
+	with ProcessPoolExecutor(max_workers=processes) as executor:
+		return list(executor.map(solve_case, cases, [verbosity]*len(cases), [cache]*len(cases)))
+
+
+def config_cases(configs, substitutions=None, options=None, solveargs=None):
+
+	# One case per configuration, in configs order
+	return [StudyCase(config, substitutions=substitutions, options=options, solveargs=solveargs) for config in configs]
+
+
+def time_study(cases, processes=None, verbosity=0):
+
+	# Wall-clock times (s) for serial and parallel execution of the same study (problem builds included), and the resulting speedup
+	cases = list(cases)
+
+	problem_factory._problems.clear()
+	start_time = time.time()
+	run_study(cases, processes=1, verbosity=verbosity)
+	serial_time = time.time() - start_time
+
+	problem_factory._problems.clear()  # Otherwise forked workers would inherit the problems built by the serial run
+	start_time = time.time()
+	run_study(cases, processes=processes, verbosity=verbosity)
+	parallel_time = time.time() - start_time
+
+	return {"serial":serial_time, "parallel":parallel_time, "speedup":serial_time/parallel_time}
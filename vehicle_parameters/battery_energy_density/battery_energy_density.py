@@ -12,7 +12,9 @@ from matplotlib             import pyplot as plt
 from aircraft_models        import OnDemandAircraft
 from mission_models         import OnDemandSizingMission, OnDemandRevenueMission, OnDemandDeadheadMission
 from cost_models            import OnDemandMissionCost
-from noise_models           import vortex_noise
+from noise_models           import solution_noise
+from presolve               import PresolveSolver
+from solution_store         import solution_table
 from standard_substitutions import generic_data, configs
 
 
@@ -21,7 +23,7 @@ num_pts = 8
 #Optimize
 for config in configs:
 
-	print "Solving configuration: " + config
+	print("Solving configuration: " + config)
 
 	#set up e arrays (different for each configuration)
 	if config == "Helicopter":
@@ -37,8 +39,7 @@ for config in configs:
 	elif config == "Tilt wing":
 		e = np.linspace(270, 700, num_pts) * ureg.Wh/ureg.kg
 
-	c                 = configs[config]
-	c["SPL_sizing_A"] = np.zeros(np.size(e))
+	c = configs[config]
 
 	aircraft = OnDemandAircraft()
 	aircraft = aircraft.standard_substitutions(config=config, autonomousEnabled=generic_data["autonomousEnabled"])
@@ -61,27 +62,14 @@ for config in configs:
 
 	objective_function = mission_cost.cpt
 	problem            = Model(objective_function, [aircraft, sizing_mission, revenue_mission, deadhead_mission, mission_cost])
-	solution           = problem.solve(verbosity=0)
+	solution           = problem.solve(verbosity=0, solver=PresolveSolver())
 	
-	c["solution"] = solution
-
-	for i in range(len(e)):
-
-		# Noise computations (sizing mission)
-		T_perRotor = solution("T_perRotor_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")[i]
-		T_A        = solution("T/A_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")[i]
-		V_tip      = solution("v_{tip}_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")[i]
-		s          = solution("s_OnDemandAircraft/Rotors")[i]
-		Cl_mean    = solution("Cl_{mean}_OnDemandSizingMission/HoverTakeoff/OnDemandAircraftHoverPerformance/RotorsPerformance")[i]
-		N          = solution("N_OnDemandAircraft/Rotors")[i]
-		c_avg      = solution("c_{avg}_OnDemandAircraft/Rotors")[i]
-		t_avg      = solution("t_{avg}_OnDemandAircraft/Rotors")[i]
-		rho        = solution("\\rho_OnDemandSizingMission/HoverTakeoff/HoverFlightState/FixedStandardAtmosphere")[i]
-		
-		delta_S = generic_data["delta_S"]
-		St      = generic_data["Strouhal_number"]
-
-		f_peak, c["SPL_sizing_A"][i], spectrum = vortex_noise(T_perRotor, T_A, V_tip, s, Cl_mean, N, c_avg, t_avg, rho, delta_S, St, weighting="A")
+	c["solution"] = solution_table(solution)
+
+	# Noise computations (sizing mission), for all sweep points at once
+	noise = solution_noise(c["solution"], delta_S=generic_data["delta_S"], St=generic_data["Strouhal_number"])
+
+	c["SPL_sizing_A"] = noise["vortex"]["SPL_A"]
 
 
 # Plotting commands